@@ -6,18 +6,19 @@ Este archivo inicializa la aplicación y gestiona la navegación entre páginas.
 import streamlit as st
 import pandas as pd
 import os
+import time
 
-# Importar módulos de páginas
-from utils.load_data import load_data
-from pages.home import show_home_page
-from pages.basic_info import show_basic_info
-from pages.infrastructure import show_infrastructure
-from pages.history import show_history_participation
-from pages.technology import show_technology
-from pages.financing import show_financing
-from pages.population import show_population
-from pages.activities import show_activities
-from pages.development import show_development_potential
+from utils.load_data import load_data, get_cache_stats, get_load_report, get_filter_index
+from utils.filters import FILTER_COLUMNS, apply_filters
+from utils.refresher import start_refresher
+from utils.sheets_client import get_sheets_client_stats
+from utils.page_loader import load_page, get_import_stats, PAGES
+from utils.styles import PAGE_STYLE
+
+# 'fragment': el selector de secciones y la página se ejecutan en un fragmento,
+# de modo que cambiar de sección solo vuelve a ejecutar la página elegida.
+# 'sidebar': selector clásico en la barra lateral, que vuelve a ejecutar todo el script.
+NAVIGATION_MODE = os.environ.get('CEDECO_NAVIGATION', 'fragment')
 
 # Configuración de la página
 st.set_page_config(
@@ -27,40 +28,137 @@ st.set_page_config(
 )
 
 # Estilos personalizados
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        color: #1E3A8A;
-        text-align: center;
-        margin-bottom: 1rem;
-    }
-    .section-header {
-        font-size: 1.8rem;
-        color: #2563EB;
-        margin-top: 2rem;
-        margin-bottom: 1rem;
-    }
-    .subsection-header {
-        font-size: 1.4rem;
-        color: #3B82F6;
-        margin-top: 1.5rem;
-        margin-bottom: 0.8rem;
-    }
-    .highlight {
-        background-color: #DBEAFE;
-        padding: 1rem;
-        border-radius: 0.5rem;
-    }
-    .conclusion {
-        background-color: #E0F2FE;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 0.3rem solid #0284C7;
-        margin: 1rem 0;
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(f"<style>{PAGE_STYLE}</style>", unsafe_allow_html=True)
+
+def show_data_status(refresher, module_name=None):
+    """
+    Muestra en la barra lateral cuándo se actualizaron los datos por última vez.
+    
+    Args:
+        refresher (DataRefresher): Hilo de refresco en segundo plano.
+        module_name (str, optional): Módulo de la página mostrada, para indicar
+            cuánto tardó su primera carga.
+    """
+    cache_stats = get_cache_stats()
+    st.sidebar.markdown("---")
+    
+    if cache_stats['fetched_at'] is not None:
+        minutos = int(cache_stats['age_seconds'] // 60)
+        verificado = time.strftime('%H:%M:%S', time.localtime(cache_stats['checked_at']))
+        st.sidebar.caption(
+            f"Datos: {cache_stats['source']} · descargados hace {minutos} min "
+            f"· última verificación {verificado} "
+            f"· caché {cache_stats['hits']} aciertos / {cache_stats['misses']} descargas"
+        )
+    else:
+        st.sidebar.caption("Datos aún no disponibles; cargando en segundo plano.")
+    
+    sheets_stats = get_sheets_client_stats()
+    if sheets_stats['auth_seconds'] is not None and sheets_stats['transfer_seconds'] is not None:
+        st.sidebar.caption(
+            f"Google Sheets: autenticación {sheets_stats['auth_seconds'] * 1000:.0f} ms "
+            f"({sheets_stats['auth_count']} tokens) · transferencia {sheets_stats['transfer_seconds'] * 1000:.0f} ms"
+        )
+    
+    import_seconds = get_import_stats().get(module_name)
+    if import_seconds is not None:
+        st.sidebar.caption(f"Primera carga de esta sección: {import_seconds * 1000:.0f} ms")
+    
+    if refresher.last_status == 'failed':
+        st.sidebar.caption(f"Último refresco fallido: {refresher.last_error or 'ninguna fuente respondió'}")
+    
+    report = get_load_report()
+    if report is not None:
+        with st.sidebar.expander("Detalle de la última carga"):
+            st.caption(f"Resultado: {report['status']} · {report['seconds']:.2f} s")
+            st.table(pd.DataFrame([
+                {
+                    'Fuente': attempt['source'],
+                    'Etapa': attempt['stage'],
+                    'Estado': attempt['status'],
+                    'Segundos': round(attempt['seconds'], 2),
+                    'Detalle': attempt['error'] or '',
+                }
+                for attempt in report['attempts']
+            ]))
+    
+    if st.sidebar.button("Actualizar datos"):
+        refresher.request_refresh()
+        st.sidebar.caption("Actualización solicitada; los nuevos datos aparecerán en la próxima recarga.")
+
+def show_filter_bar(df):
+    """
+    Muestra los filtros globales en la barra lateral y aplica los elegidos.
+    
+    Los filtros se resuelven con el índice de mapas de bits construido al
+    cargar los datos (ver utils.filters) y se aplican a todas las secciones.
+    
+    Args:
+        df (pandas.DataFrame): Datos entregados por load_data().
+    
+    Returns:
+        pandas.DataFrame: Datos filtrados.
+    """
+    index = get_filter_index(df)
+    
+    st.sidebar.markdown("### Filtros")
+    selections = {}
+    for column, label in FILTER_COLUMNS.items():
+        values = index.values(column)
+        if values:
+            selections[column] = st.sidebar.multiselect(label, values, key=f"filtro_{column}")
+    
+    filtered = apply_filters(df, index, selections)
+    if len(filtered) != len(df):
+        st.sidebar.caption(f"Mostrando {len(filtered)} de {len(df)} visitas")
+    return filtered
+
+
+def show_page(section, df):
+    """
+    Muestra la página de una sección, importando su módulo si hace falta.
+    
+    Args:
+        section (str): Sección elegida en el menú.
+        df (pandas.DataFrame): Datos a analizar.
+    
+    Returns:
+        str: Módulo de la página mostrada.
+    """
+    module_name, function_name = PAGES[section]
+    page = load_page(module_name, function_name)
+    if section == "Inicio":
+        page()
+    else:
+        page(df)
+    return module_name
+
+
+@st.fragment
+def show_section_fragment(df):
+    """
+    Muestra el selector de secciones y la página elegida dentro de un fragmento.
+    
+    Al cambiar de sección solo se vuelve a ejecutar este fragmento, con los
+    datos ya cargados en la última ejecución completa del script; el
+    encabezado, la carga de datos y la barra lateral no se repiten.
+    
+    Args:
+        df (pandas.DataFrame): Datos a analizar.
+    """
+    section = st.segmented_control(
+        "Selecciona una sección para analizar:",
+        list(PAGES),
+        default="Inicio",
+        key="section",
+    )
+    # Si se deselecciona el botón activo, volver al inicio
+    module_name = show_page(section or "Inicio", df)
+    
+    import_seconds = get_import_stats().get(module_name)
+    if import_seconds is not None:
+        st.caption(f"Primera carga de esta sección: {import_seconds * 1000:.0f} ms")
+
 
 def main():
     """Función principal que controla el flujo de la aplicación"""
@@ -69,43 +167,27 @@ def main():
     st.markdown('<div class="main-header">CEDECO - Centro de Desarrollo Comunitario</div>', unsafe_allow_html=True)
     st.markdown('Dashboard para análisis de comedores comunitarios y su potencial como centros de desarrollo')
     
-    # Cargar datos directamente del libro/archivo
+    # Los datos se refrescan en segundo plano; aquí solo se leen de la caché
+    refresher = start_refresher()
     with st.spinner("Cargando datos..."):
         df = load_data()
     
-    # Menú lateral
-    section = st.sidebar.radio(
-        "Selecciona una sección para analizar:",
-        ["Inicio", 
-         "Información Básica", 
-         "Infraestructura y Funcionamiento", 
-         "Historia y Participación",
-         "Uso de Tecnología y Comunicación",
-         "Financiación y Dificultades",
-         "Población Atendida",
-         "Actividades Realizadas",
-         "Potencial como Centro de Desarrollo"]
-    )
+    # Filtros globales, aplicados a todas las secciones
+    df = show_filter_bar(df)
     
-    # Navegación a la página seleccionada
-    if section == "Inicio":
-        show_home_page()
-    elif section == "Información Básica":
-        show_basic_info(df)
-    elif section == "Infraestructura y Funcionamiento":
-        show_infrastructure(df)
-    elif section == "Historia y Participación":
-        show_history_participation(df)
-    elif section == "Uso de Tecnología y Comunicación":
-        show_technology(df)
-    elif section == "Financiación y Dificultades":
-        show_financing(df)
-    elif section == "Población Atendida":
-        show_population(df)
-    elif section == "Actividades Realizadas":
-        show_activities(df)
-    elif section == "Potencial como Centro de Desarrollo":
-        show_development_potential(df)
+    if NAVIGATION_MODE == 'sidebar':
+        # Menú lateral
+        section = st.sidebar.radio(
+            "Selecciona una sección para analizar:",
+            list(PAGES)
+        )
+        module_name = show_page(section, df)
+    else:
+        show_section_fragment(df)
+        module_name = None
+    
+    # Estado de la actualización de datos
+    show_data_status(refresher, module_name)
     
     # Pie de página
     st.sidebar.markdown("---")
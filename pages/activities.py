@@ -7,6 +7,7 @@ import pandas as pd
 import plotly.express as px
 import numpy as np
 import re
+from utils.load_data import get_counts
 
 def show_activities(df):
     """
@@ -100,9 +101,8 @@ def show_activities(df):
             actividad = col.split('_FRECUENCIA')[0].replace('_', ' ').title()
             
             # Contar frecuencias
-            frecuencias = df[col].value_counts().reset_index()
+            frecuencias = get_counts(df, col, 'Frecuencia')
             if not frecuencias.empty:
-                frecuencias.columns = ['Frecuencia', 'Cantidad']
                 
                 # Añadir información de actividad
                 frecuencias['Actividad'] = actividad
@@ -119,7 +119,8 @@ def show_activities(df):
                 index='Actividad', 
                 columns='Frecuencia', 
                 aggfunc='sum',
-                fill_value=0
+                fill_value=0,
+                observed=True
             )
             
             # Orden personalizado para las frecuencias
@@ -166,8 +167,7 @@ def show_activities(df):
             st.markdown('<div class="subsection-header">Vinculación con Otros Actores</div>', unsafe_allow_html=True)
             
             # Contar tipos de vinculación
-            vinculacion_counts = df[vinculacion_col].value_counts().reset_index()
-            vinculacion_counts.columns = ['Vinculación', 'Cantidad']
+            vinculacion_counts = get_counts(df, vinculacion_col, 'Vinculación')
             
             # Crear gráfico de pastel
             fig_vinc = px.pie(
@@ -193,8 +193,7 @@ def show_activities(df):
             st.markdown('<div class="subsection-header">Seguimiento y Evaluación</div>', unsafe_allow_html=True)
             
             # Contar realización de seguimiento
-            seguimiento_counts = df[seguimiento_col].value_counts().reset_index()
-            seguimiento_counts.columns = ['Realiza Seguimiento', 'Cantidad']
+            seguimiento_counts = get_counts(df, seguimiento_col, 'Realiza Seguimiento')
             
             # Crear gráfico de pastel
             fig_seg = px.pie(
@@ -224,8 +223,7 @@ def show_activities(df):
         st.markdown('<div class="subsection-header">Iniciativas de Huertas Comunitarias</div>', unsafe_allow_html=True)
         
         # Contar comedores con huertas
-        huertas_counts = df['INICIATIVA_HUERTAS'].value_counts().reset_index()
-        huertas_counts.columns = ['Tiene Huerta', 'Cantidad']
+        huertas_counts = get_counts(df, 'INICIATIVA_HUERTAS', 'Tiene Huerta')
         
         # Crear gráfico de barras
         fig_huertas = px.bar(
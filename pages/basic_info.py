@@ -6,6 +6,7 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from utils.load_data import get_counts
 
 def show_basic_info(df):
     """
@@ -42,8 +43,7 @@ def show_basic_info(df):
         st.markdown('<div class="subsection-header">Distribución por Comuna</div>', unsafe_allow_html=True)
         
         # Contar comedores por comuna
-        comuna_counts = df['COMUNA'].value_counts().reset_index()
-        comuna_counts.columns = ['Comuna', 'Cantidad']
+        comuna_counts = get_counts(df, 'COMUNA', 'Comuna')
         
         # Crear gráfico de barras horizontal
         fig_comuna = px.bar(comuna_counts, y='Comuna', x='Cantidad', 
@@ -63,7 +63,7 @@ def show_basic_info(df):
         st.markdown('<div class="subsection-header">Visitas por Profesional</div>', unsafe_allow_html=True)
         
         # Contar visitas por profesional
-        prof_counts = df['PREFESIONAL_REALIZA_VISITA'].value_counts().reset_index()
+        prof_counts = get_counts(df, 'PREFESIONAL_REALIZA_VISITA', 'Profesional')
         prof_counts.columns = ['Profesional', 'Visitas']
         
         # Crear gráfico de pastel
@@ -8,6 +8,7 @@ import pandas as pd
 import plotly.express as px
 import numpy as np
 import re
+from utils.metrics import interest_summary, needs_ranking
 
 def show_interest_section(df):
     """
@@ -16,14 +17,12 @@ def show_interest_section(df):
     Args:
         df (pandas.DataFrame): Dataframe con los datos a analizar.
     """
-    # Verificar columnas relevantes
-    interesado_col = 'INTERESADO_COMO_CENTRO_DESARROLLO' if 'INTERESADO_COMO_CENTRO_DESARROLLO' in df.columns else None
-    
     # Métricas generales
-    if interesado_col:
-        total_comedores = len(df)
-        interesados = df[interesado_col].apply(lambda x: x == 'SI').sum()
-        porcentaje_interesados = round((interesados / total_comedores) * 100) if total_comedores > 0 else 0
+    interes = interest_summary(df)
+    if interes:
+        total_comedores = interes['total']
+        interesados = interes['interesados']
+        porcentaje_interesados = interes['porcentaje']
         
         # Mostrar métricas de interés
         st.metric(
@@ -33,8 +32,7 @@ def show_interest_section(df):
         )
         
         # Gráfico de interés
-        interes_counts = df[interesado_col].value_counts().reset_index()
-        interes_counts.columns = ['Interesado', 'Cantidad']
+        interes_counts = interes['conteos']
         
         # Crear gráfico de pastel
         fig_interes = px.pie(
@@ -70,32 +68,10 @@ def show_needs_section(df):
     if necesidades_col:
         st.markdown('<div class="subsection-header">Necesidades para la Transformación</div>', unsafe_allow_html=True)
         
-        # Procesar los datos para el análisis
-        necesidades = []
-        for necesidad in df[necesidades_col].dropna():
-            if isinstance(necesidad, str):
-                for n in re.split(r',|\s+', necesidad):
-                    n = n.strip()
-                    if n:
-                        # Categorizar necesidades
-                        if "ALIANZAS" in n.upper() or "ARTICULACION" in n.upper():
-                            necesidades.append("Gestión de alianzas estratégicas")
-                        elif "FINANCIAMIENTO" in n.upper() or "AREA DE" in n.upper() or "ÁREA DE" in n.upper():
-                            necesidades.append("Área de financiamiento")
-                        elif "CAPACITACION" in n.upper() or "CAPACITACIÓN" in n.upper() or "FORMACION" in n.upper() or "FORMACIÓN" in n.upper():
-                            necesidades.append("Capacitación y formación integral")
-                        elif "VISIBILIZACION" in n.upper() or "VISIBILIZACIÓN" in n.upper() or "RECONOCIMIENTO" in n.upper():
-                            necesidades.append("Visibilización y reconocimiento")
-                        elif "PLANIFICACION" in n.upper() or "PLANIFICACIÓN" in n.upper() or "EVALUACION" in n.upper() or "EVALUACIÓN" in n.upper() or "SEGUIMIENTO" in n.upper():
-                            necesidades.append("Procesos de planificación y evaluación")
-                        elif "OTRA" in n.upper():
-                            necesidades.append("Otras necesidades")
-        
-        if necesidades:
-            # Contar frecuencia de cada necesidad
-            necesidades_counts = pd.Series(necesidades).value_counts().reset_index()
-            necesidades_counts.columns = ['Necesidad', 'Cantidad']
-            
+        # Ranking de necesidades a partir de la tabla separada al cargar
+        necesidades_counts = needs_ranking(df)
+        
+        if not necesidades_counts.empty:
             # Crear gráfico de barras
             fig_necesidades = px.bar(
                 necesidades_counts, 
@@ -319,7 +295,7 @@ Contiene las secciones de planificación y recursos humanos.
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import re
+from utils.load_data import get_counts
 
 def show_planning_tab(df):
     """
@@ -361,28 +337,10 @@ def show_human_resources_tab(df):
     if 'RECURSO_HUMANO_CON_EL_QUE_CUENTA' in df.columns:
         st.markdown("#### Recurso Humano Disponible")
         
-        # Procesar los datos para el análisis
-        recursos = []
-        for recurso in df['RECURSO_HUMANO_CON_EL_QUE_CUENTA'].dropna():
-            if isinstance(recurso, str):
-                for r in re.split(r',|\s+', recurso):
-                    r = r.strip()
-                    if r:
-                        # Categorizar recursos
-                        if "VOLUNTARIADO" in r.upper():
-                            recursos.append("Voluntariado")
-                        elif "SOCIAL" in r.upper() or "AMIGOS" in r.upper() or "VECINOS" in r.upper():
-                            recursos.append("Red social (amigos, vecinos)")
-                        elif "FAMILIAR" in r.upper():
-                            recursos.append("Red familiar")
-                        elif "COLABORADORES" in r.upper() or "COMEDOR" in r.upper() or "FUNDACIÓN" in r.upper() or "FUNDACION" in r.upper():
-                            recursos.append("Colaboradores propios")
-        
-        if recursos:
-            # Contar frecuencia de cada recurso
-            recursos_counts = pd.Series(recursos).value_counts().reset_index()
-            recursos_counts.columns = ['Tipo de Recurso', 'Cantidad']
-            
+        # Recursos agrupados en categorías al cargar (tabla RECURSOS_HUMANOS)
+        recursos_counts = get_counts(df, 'RECURSOS_HUMANOS', 'Tipo de Recurso')
+        
+        if not recursos_counts.empty:
             # Crear gráfico de barras
             fig_recursos = px.bar(
                 recursos_counts, 
@@ -447,47 +405,7 @@ Contiene la matriz de evaluación de potencial y conclusiones generales.
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-
-def create_evaluation_matrix(df):
-    """
-    Crea una matriz de evaluación del potencial de los comedores para ser CEDECO.
-    
-    Args:
-        df (pandas.DataFrame): Dataframe con los datos a analizar.
-    
-    Returns:
-        pandas.DataFrame: Dataframe con la evaluación de potencial.
-    """
-    # Crear un sistema simple de puntuación
-    if len(df) > 0:
-        # Crear columnas para evaluar cada dimensión
-        df_eval = df.copy()
-        
-        # Dimensión 1: Infraestructura
-        df_eval['score_infra'] = df_eval['ESPACIO_TALLERES'].apply(lambda x: 1 if x == 'SI' else 0) if 'ESPACIO_TALLERES' in df_eval.columns else 0
-        
-        # Dimensión 2: Articulación
-        df_eval['score_artic'] = df_eval['ARTICULACION_CON_ORGANIZACIONES'].apply(lambda x: 1 if x == 'SI' else 0) if 'ARTICULACION_CON_ORGANIZACIONES' in df_eval.columns else 0
-        
-        # Dimensión 3: Participación
-        df_eval['score_partic'] = df_eval['PARTICIPACION_ACTIVIDADES'].apply(lambda x: 1 if x == 'SI' else 0) if 'PARTICIPACION_ACTIVIDADES' in df_eval.columns else 0
-        
-        # Dimensión 4: Tecnología
-        df_eval['score_tech'] = df_eval['USO_DE_TIC'].apply(lambda x: 1 if pd.notna(x) and x != '' else 0) if 'USO_DE_TIC' in df_eval.columns else 0
-        
-        # Dimensión 5: Interés en CEDECO
-        df_eval['score_interes'] = df_eval['INTERESADO_COMO_CENTRO_DESARROLLO'].apply(lambda x: 1 if x == 'SI' else 0) if 'INTERESADO_COMO_CENTRO_DESARROLLO' in df_eval.columns else 0
-        
-        # Calcular puntuación total
-        score_cols = [col for col in df_eval.columns if col.startswith('score_')]
-        df_eval['score_total'] = df_eval[score_cols].sum(axis=1)
-        df_eval['potencial'] = df_eval['score_total'].apply(
-            lambda x: 'Alto' if x >= 4 else ('Medio' if x >= 2 else 'Bajo')
-        )
-        
-        return df_eval
-    
-    return None
+from utils.metrics import create_evaluation_matrix, potential_counts
 
 def show_evaluation_matrix(df):
     """
@@ -503,8 +421,7 @@ def show_evaluation_matrix(df):
     
     if df_eval is not None:
         # Graficar resultados
-        potencial_counts = df_eval['potencial'].value_counts().reset_index()
-        potencial_counts.columns = ['Nivel de Potencial', 'Cantidad']
+        potencial_counts = potential_counts(df_eval)
         
         # Asignar colores por nivel
         color_map = {'Alto': '#1E40AF', 'Medio': '#3B82F6', 'Bajo': '#93C5FD'}
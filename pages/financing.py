@@ -6,6 +6,7 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import numpy as np
+from utils.metrics import funding_sources
 
 def show_financing(df):
     """
@@ -31,18 +32,10 @@ def show_financing(df):
             # Análisis de fuentes de financiación
             st.markdown('<div class="subsection-header">Fuentes de Financiación</div>', unsafe_allow_html=True)
             
-            # Procesar los datos para el análisis
-            fuentes = []
-            for financiacion in df[financiacion_col].dropna():
-                if isinstance(financiacion, str):
-                    for fuente in financiacion.split(','):
-                        fuente = fuente.strip()
-                        if fuente:
-                            fuentes.append(fuente)
+            # Contar las opciones a partir de la tabla separada al cargar
+            fuentes_counts = funding_sources(df)
             
-            if fuentes:
-                fuentes_counts = pd.Series(fuentes).value_counts().reset_index()
-                fuentes_counts.columns = ['Fuente', 'Cantidad']
+            if not fuentes_counts.empty:
                 
                 # Crear gráfico de barras
                 fig_fuentes = px.bar(
@@ -69,9 +62,10 @@ def show_financing(df):
             st.markdown('<div class="subsection-header">Presencia de Dificultades</div>', unsafe_allow_html=True)
             
             # Contar comedores que han tenido dificultades
-            tiene_dificultades = df[dificultades_col].apply(
-                lambda x: 'Sí' if x == 'SI' else ('No' if x == 'NO' else 'Sin datos')
-            ).value_counts().reset_index()
+            respuestas = df[dificultades_col]
+            tiene_dificultades = pd.Series(np.select(
+                [respuestas == 'SI', respuestas == 'NO'], ['Sí', 'No'], 'Sin datos'
+            )).value_counts().reset_index()
             
             tiene_dificultades.columns = ['Ha tenido dificultades', 'Cantidad']
             
@@ -5,59 +5,72 @@ Módulo que muestra la página de historia y participación de comedores.
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import re
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
+import plotly.graph_objects as go
 import numpy as np
+from utils.load_data import get_text_index, get_year_table
+from utils.years import year_mentions, founding_years, cohort_timeline
+from utils.wordclouds import request_wordcloud, mark_shown
 
-def extract_years_from_text(text):
+def show_wordcloud(future):
     """
-    Extrae años desde un texto para análisis histórico.
+    Muestra una nube de palabras pedida con request_wordcloud().
+    
+    Mientras la imagen se genera se muestra un aviso en su lugar.
     
     Args:
-        text (str): Texto a analizar.
+        future (concurrent.futures.Future): Futuro con la imagen PNG.
     
     Returns:
-        list: Lista de años encontrados.
+        bytes: Imagen PNG mostrada.
     """
-    if not isinstance(text, str):
-        return []
-    
-    # Buscar años entre 1990 y 2025
-    pattern = r'\b(19[9][0-9]|20[0-2][0-9])\b'
-    return re.findall(pattern, text)
+    placeholder = st.empty()
+    if not future.done():
+        placeholder.info("Generando la nube de palabras...")
+    try:
+        png = future.result()
+    except Exception:
+        placeholder.empty()
+        raise
+    placeholder.image(png, use_container_width=True, output_format='PNG')
+    mark_shown(png)
+    return png
 
-def generate_wordcloud(texts):
+def show_founding_cohorts(years):
     """
-    Genera una nube de palabras a partir de textos.
+    Muestra los comedores por año de fundación estimado (el año más antiguo de su historia).
     
     Args:
-        texts (list): Lista de textos para generar la nube.
-    
-    Returns:
-        matplotlib.figure.Figure: Figura con la nube de palabras.
+        years (pandas.DataFrame): Tabla (COMEDOR, AÑO) de los años mencionados.
     """
-    # Unir todos los textos
-    text = " ".join(t for t in texts if isinstance(t, str))
-    
-    # Lista de palabras a excluir (stopwords)
-    stopwords = set(['de', 'la', 'el', 'y', 'en', 'a', 'que', 'los', 'del', 'se', 'las', 'por', 'un', 'con', 
-                     'una', 'para', 'es', 'al', 'lo', 'como', 'más', 'o', 'pero', 'sus', 'le', 'ha', 'me', 
-                     'si', 'sin', 'sobre', 'este', 'ya', 'entre', 'cuando', 'todo', 'esta', 'ser', 'son',
-                     'mi', 'hay', 'porque', 'muy', 'estos', 'estas', 'fue', 'así', 'también', 'desde', 'he'])
-    
-    # Generar nube de palabras
-    wordcloud = WordCloud(width=800, height=400, 
-                          background_color='white', 
-                          stopwords=stopwords,
-                          min_font_size=10).generate(text)
-    
-    # Crear figura
-    fig, ax = plt.subplots(figsize=(10, 5))
-    ax.imshow(wordcloud, interpolation='bilinear')
-    ax.axis('off')
-    
-    return fig
+    st.markdown("### Cohortes por año de fundación")
+    
+    founded = founding_years(years)
+    cohorts = cohort_timeline(founded)
+    
+    fig = go.Figure()
+    fig.add_trace(go.Bar(x=cohorts['Año'], y=cohorts['Comedores'], name='Fundados en el año', marker_color='#1E40AF'))
+    fig.add_trace(go.Scatter(x=cohorts['Año'], y=cohorts['Acumulado'], name='Acumulado', yaxis='y2',
+                             mode='lines', line=dict(color='#93C5FD', width=3)))
+    fig.update_layout(
+        title='Comedores por Año de Fundación Estimado',
+        xaxis_title='Año',
+        yaxis=dict(title='Comedores fundados'),
+        yaxis2=dict(title='Acumulado', overlaying='y', side='right', showgrid=False),
+        legend=dict(orientation='h', y=-0.2)
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Comedores de un rango de cohortes
+    first, last = int(cohorts['Año'].min()), int(cohorts['Año'].max())
+    if first < last:
+        rango = st.slider("Año de fundación", first, last, (first, last), key='cohorte_rango')
+    else:
+        rango = (first, last)
+    en_rango = founded[founded['Año de fundación'].between(*rango)]
+    st.dataframe(en_rango, use_container_width=True, hide_index=True)
+    
+    mediana = int(founded['Año de fundación'].median())
+    st.markdown(f'<div class="conclusion">El año de fundación se estima con el año más antiguo que menciona la historia de cada comedor. La mitad de los {len(founded)} comedores con años en su historia se fundó en {mediana} o antes, por lo que conviven comedores consolidados con iniciativas recientes.</div>', unsafe_allow_html=True)
 
 def show_history_participation(df):
     """
@@ -75,13 +88,21 @@ def show_history_participation(df):
     participacion_col = 'PARTICIPACION_ACTIVIDADES' if 'PARTICIPACION_ACTIVIDADES' in df.columns else None
     observaciones_part_col = 'Observaciones2' if 'Observaciones2' in df.columns else None
     
+    # Pedir las nubes de palabras al inicio para que se generen mientras se muestra la página;
+    # las frecuencias salen del conteo de palabras hecho al cargar los datos
+    text_index = get_text_index(df)
+    historia_words = text_index.frequencies(observaciones_col, df) if observaciones_col else {}
+    participacion_words = text_index.frequencies(observaciones_part_col, df) if observaciones_part_col else {}
+    historia_wordcloud = request_wordcloud(historia_words) if historia_words else None
+    participacion_wordcloud = request_wordcloud(participacion_words) if participacion_words else None
+    
     # Mostrar estadísticas generales
     col1, col2 = st.columns(2)
     
     with col1:
         if historia_col:
             # Contar comedores con historia documentada
-            tiene_historia = df[historia_col].apply(lambda x: 'Sí' if x == 'SI' else 'No').value_counts()
+            tiene_historia = pd.Series(np.where(df[historia_col] == 'SI', 'Sí', 'No')).value_counts()
             
             fig = px.pie(
                 values=tiene_historia.values,
@@ -100,7 +121,7 @@ def show_history_participation(df):
     with col2:
         if participacion_col:
             # Contar comedores con participación en actividades
-            participa = df[participacion_col].apply(lambda x: 'Sí' if x == 'SI' else 'No').value_counts()
+            participa = pd.Series(np.where(df[participacion_col] == 'SI', 'Sí', 'No')).value_counts()
             
             fig = px.pie(
                 values=participa.values,
@@ -120,17 +141,12 @@ def show_history_participation(df):
     st.markdown('<div class="subsection-header">Análisis Histórico</div>', unsafe_allow_html=True)
     
     if observaciones_col and any(df[observaciones_col].notna()):
-        # Extraer años mencionados en las historias
-        all_years = []
-        for text in df[observaciones_col].dropna():
-            years = extract_years_from_text(text)
-            all_years.extend(years)
+        # Años mencionados en las historias, extraídos al cargar los datos
+        years = get_year_table(df)
         
-        if all_years:
+        if not years.empty:
             # Contar frecuencia de años
-            years_count = pd.Series(all_years).value_counts().reset_index()
-            years_count.columns = ['Año', 'Frecuencia']
-            years_count = years_count.sort_values('Año')
+            years_count = year_mentions(years)
             
             # Crear gráfico de línea temporal
             fig = px.bar(
@@ -148,15 +164,14 @@ def show_history_participation(df):
             year_min = min(years_count['Año']) if not years_count.empty else 'N/A'
             year_max = max(years_count['Año']) if not years_count.empty else 'N/A'
             st.markdown(f'<div class="conclusion">Las historias de los comedores abarcan desde {year_min} hasta {year_max}, reflejando una trayectoria de compromiso comunitario. Los años mencionados muestran momentos clave en su desarrollo, principalmente alrededor de su fundación.</div>', unsafe_allow_html=True)
+            
+            show_founding_cohorts(years)
         
         # Generar nube de palabras de las historias
         st.markdown("### Temas principales en las historias")
-        historia_texts = df[observaciones_col].dropna().tolist()
-        
-        if historia_texts:
+        if historia_wordcloud is not None:
             try:
-                wordcloud_fig = generate_wordcloud(historia_texts)
-                st.pyplot(wordcloud_fig)
+                show_wordcloud(historia_wordcloud)
                 st.markdown('<div class="conclusion">Las palabras más frecuentes en las historias de los comedores revelan un enfoque en la comunidad, apoyo, actividades y participación. Se destaca la importancia de las gestoras, la iglesia, la fundación y los espacios de formación.</div>', unsafe_allow_html=True)
             except Exception as e:
                 st.warning(f"No se pudo generar la nube de palabras: {str(e)}")
@@ -176,12 +191,9 @@ def show_history_participation(df):
         
         # Generar nube de palabras de la participación
         st.markdown("### Temas principales en la participación")
-        participacion_texts = df[observaciones_part_col].dropna().tolist()
-        
-        if participacion_texts:
+        if participacion_wordcloud is not None:
             try:
-                wordcloud_fig = generate_wordcloud(participacion_texts)
-                st.pyplot(wordcloud_fig)
+                show_wordcloud(participacion_wordcloud)
                 st.markdown('<div class="conclusion">Las palabras más frecuentes en la participación muestran un enfoque en talleres, capacitaciones, comunidad y actividades. Se destaca la importancia de las reuniones, jornadas y formación.</div>', unsafe_allow_html=True)
             except Exception as e:
                 st.warning(f"No se pudo generar la nube de palabras: {str(e)}")
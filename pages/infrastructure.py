@@ -6,6 +6,94 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from utils.load_data import get_counts, get_spatial_index
+from utils.geo import coordinates, bin_points, MAP_POINT_LIMIT, COVERAGE_RADIUS_KM, DISTANCE_COLUMN, COUNT_COLUMN
+from utils.ingest import LAT_COLUMN, LON_COLUMN
+from utils.metrics import create_evaluation_matrix
+
+# Comedores a partir de los cuales el selector de proximidad pasa a búsqueda por nombre
+MAX_SELECT_OPTIONS = 2000
+
+# Comedores más cercanos que se muestran
+NEAREST_COUNT = 5
+
+def show_proximity_section(df, df_mapa):
+    """
+    Muestra los comedores cercanos a un comedor elegido y las zonas sin candidatos a CEDECO.
+    
+    Args:
+        df (pandas.DataFrame): Dataframe con los datos a analizar.
+        df_mapa (pandas.DataFrame): Filas de `df` con coordenadas.
+    """
+    st.markdown('<div class="subsection-header">Proximidad entre Comedores</div>', unsafe_allow_html=True)
+    
+    # Un punto por comedor (su primera visita con coordenadas)
+    df_comedores = df_mapa.drop_duplicates(subset=['NOMBRE_COMEDOR'])
+    index = get_spatial_index(df)
+    subset = index.subset_mask(df_comedores.index)
+    
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        nombres = sorted(df_comedores['NOMBRE_COMEDOR'].dropna().astype(str))
+        if len(nombres) <= MAX_SELECT_OPTIONS:
+            comedor = st.selectbox("Comedor", nombres, key='proximidad_comedor')
+        else:
+            comedor = st.text_input("Nombre del comedor", key='proximidad_comedor')
+    with col2:
+        radio = st.slider("Radio (km)", 0.5, 5.0, 1.0, 0.5, key='proximidad_radio')
+    
+    elegido = df_comedores[df_comedores['NOMBRE_COMEDOR'].astype(str) == comedor]
+    if elegido.empty:
+        st.info("Elige un comedor con coordenadas para ver los comedores cercanos.")
+    else:
+        lat, lon = elegido[LAT_COLUMN].iloc[0], elegido[LON_COLUMN].iloc[0]
+        # Excluir el propio comedor de los resultados
+        otros = subset & ~index.subset_mask(elegido.index)
+        
+        cercanos = index.within(lat, lon, radio, otros)
+        mas_cercanos = index.nearest(lat, lon, NEAREST_COUNT, otros)
+        
+        columnas = [col for col in ['NOMBRE_COMEDOR', 'COMUNA', 'BARRIO'] if col in df.columns]
+        st.metric(f"Comedores a menos de {radio:g} km", len(cercanos))
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown(f"#### Comedores a menos de {radio:g} km")
+            st.dataframe(df.loc[cercanos.index[:50], columnas].assign(**{DISTANCE_COLUMN: cercanos.values[:50].round(2)}))
+        with col2:
+            st.markdown(f"#### {NEAREST_COUNT} comedores más cercanos")
+            st.dataframe(df.loc[mas_cercanos.index, columnas].assign(**{DISTANCE_COLUMN: mas_cercanos.values.round(2)}))
+    
+    # Zonas sin candidatos a CEDECO cerca
+    st.markdown('<div class="subsection-header">Zonas sin Candidatos a CEDECO</div>', unsafe_allow_html=True)
+    
+    df_eval = create_evaluation_matrix(df_comedores)
+    candidatos = index.subset_mask(df_eval.index[df_eval['potencial'] == 'Alto'])
+    zonas = index.coverage_gaps(candidatos, COVERAGE_RADIUS_KM, subset)
+    
+    st.metric(
+        f"Zonas con comedores y sin candidatos a menos de {COVERAGE_RADIUS_KM:g} km",
+        len(zonas),
+        f"{int(zonas[COUNT_COLUMN].sum())} comedores",
+        delta_color="off"
+    )
+    
+    if not zonas.empty:
+        fig_zonas = px.scatter_mapbox(
+            zonas.head(MAP_POINT_LIMIT),
+            lat=LAT_COLUMN,
+            lon=LON_COLUMN,
+            size=COUNT_COLUMN,
+            hover_data={COUNT_COLUMN: True, LAT_COLUMN: False, LON_COLUMN: False},
+            zoom=11,
+            title='Zonas sin Comedores de Potencial Alto Cerca',
+            color_discrete_sequence=['#DC2626']
+        )
+        fig_zonas.update_layout(mapbox_style="open-street-map", height=500)
+        st.plotly_chart(fig_zonas, use_container_width=True)
+    
+    st.markdown(f'<div class="conclusion">Se consideran candidatos los comedores con potencial alto en la matriz de evaluación. Las zonas señaladas tienen comedores pero ningún candidato a menos de {COVERAGE_RADIUS_KM:g} km, por lo que son prioritarias para fortalecer nuevos centros de desarrollo.</div>', unsafe_allow_html=True)
+
 
 def show_infrastructure(df):
     """
@@ -25,8 +113,8 @@ def show_infrastructure(df):
         st.markdown('<div class="subsection-header">Tipo de Espacio</div>', unsafe_allow_html=True)
         
         # Procesar los datos para el gráfico
-        df['TIPO_ESPACIO'] = df['LUGAR_DONDE_FUNCIONA_COMEDOR'].apply(
-            lambda x: x.split('.')[0].strip() if isinstance(x, str) else ""
+        df['TIPO_ESPACIO'] = (
+            df['LUGAR_DONDE_FUNCIONA_COMEDOR'].astype('string').str.split('.').str[0].str.strip().fillna('')
         )
         
         # Mapeo para nombres más legibles
@@ -64,8 +152,7 @@ def show_infrastructure(df):
         st.markdown('<div class="subsection-header">Espacio para Talleres</div>', unsafe_allow_html=True)
         
         # Contar disponibilidad de espacios para talleres
-        espacio_counts = df['ESPACIO_TALLERES'].value_counts().reset_index()
-        espacio_counts.columns = ['Disponibilidad', 'Cantidad']
+        espacio_counts = get_counts(df, 'ESPACIO_TALLERES', 'Disponibilidad')
         
         # Crear gráfico de pastel
         fig_espacio = px.pie(espacio_counts, values='Cantidad', names='Disponibilidad',
@@ -89,42 +176,44 @@ def show_infrastructure(df):
     # Mapa de ubicación de comedores (si hay coordenadas disponibles)
     st.markdown('<div class="subsection-header">Distribución Geográfica</div>', unsafe_allow_html=True)
     
-    # Procesar coordenadas si están disponibles
-    df_con_coords = df.copy()
-    df_con_coords['lat'] = None
-    df_con_coords['lon'] = None
-    
-    for idx, row in df.iterrows():
-        if pd.notna(row['UBICACION']) and row['UBICACION']:
-            try:
-                coords = row['UBICACION'].split(',')
-                if len(coords) == 2:
-                    df_con_coords.at[idx, 'lat'] = float(coords[0].strip())
-                    df_con_coords.at[idx, 'lon'] = float(coords[1].strip())
-            except:
-                pass
-    
-    # Filtrar filas con coordenadas válidas
-    df_mapa = df_con_coords[pd.notna(df_con_coords['lat']) & pd.notna(df_con_coords['lon'])].copy()
+    # Coordenadas extraídas de UBICACION al cargar los datos
+    df_mapa = coordinates(df)
     
     if not df_mapa.empty:
-        # Crear mapa con plotly
-        fig_mapa = px.scatter_mapbox(
-            df_mapa, 
-            lat='lat', 
-            lon='lon', 
-            hover_name='NOMBRE_COMEDOR',
-            hover_data={
-                'COMUNA': True,
-                'BARRIO': True,
-                'NOMBER_GESTORA': True,
-                'lat': False,
-                'lon': False
-            },
-            zoom=11,
-            title='Distribución Geográfica de Comedores',
-            color_discrete_sequence=['#1E40AF']
-        )
+        if len(df_mapa) > MAP_POINT_LIMIT:
+            # Con muchos puntos, agruparlos por zonas para no enviarlos todos al navegador
+            df_zonas = bin_points(df_mapa[LAT_COLUMN], df_mapa[LON_COLUMN])
+            fig_mapa = px.scatter_mapbox(
+                df_zonas,
+                lat=LAT_COLUMN,
+                lon=LON_COLUMN,
+                size=COUNT_COLUMN,
+                color=COUNT_COLUMN,
+                hover_data={COUNT_COLUMN: True, LAT_COLUMN: False, LON_COLUMN: False},
+                zoom=11,
+                title='Distribución Geográfica de Comedores (agrupados por zona)',
+                color_continuous_scale='Blues'
+            )
+            nota_mapa = f"{len(df_mapa)} comedores agrupados en {len(df_zonas)} zonas."
+        else:
+            # Crear mapa con plotly
+            fig_mapa = px.scatter_mapbox(
+                df_mapa, 
+                lat=LAT_COLUMN, 
+                lon=LON_COLUMN, 
+                hover_name='NOMBRE_COMEDOR',
+                hover_data={
+                    'COMUNA': True,
+                    'BARRIO': True,
+                    'NOMBER_GESTORA': True,
+                    LAT_COLUMN: False,
+                    LON_COLUMN: False
+                },
+                zoom=11,
+                title='Distribución Geográfica de Comedores',
+                color_discrete_sequence=['#1E40AF']
+            )
+            nota_mapa = None
         
         fig_mapa.update_layout(
             mapbox_style="open-street-map",
@@ -132,9 +221,14 @@ def show_infrastructure(df):
         )
         
         st.plotly_chart(fig_mapa, use_container_width=True)
+        if nota_mapa:
+            st.caption(nota_mapa)
         
         # Conclusión del mapa
         st.markdown('<div class="conclusion">La distribución geográfica muestra una cobertura en diferentes zonas de la ciudad, lo que permite atender diversas comunidades y necesidades. La disposición espacial sugiere una buena distribución territorial para la fase inicial del proyecto.</div>', unsafe_allow_html=True)
+        
+        # Proximidad y cobertura, con el índice espacial construido al cargar los datos
+        show_proximity_section(df, df_mapa)
     else:
         st.warning("No hay datos de coordenadas disponibles para mostrar el mapa.")
     
@@ -143,8 +237,7 @@ def show_infrastructure(df):
     
     # Verificar si todos tienen articulación con organizaciones
     if 'ARTICULACION_CON_ORGANIZACIONES' in df.columns:
-        articulacion_counts = df['ARTICULACION_CON_ORGANIZACIONES'].value_counts().reset_index()
-        articulacion_counts.columns = ['Tiene Articulación', 'Cantidad']
+        articulacion_counts = get_counts(df, 'ARTICULACION_CON_ORGANIZACIONES', 'Tiene Articulación')
         
         # Mostrar porcentaje 
         total = articulacion_counts['Cantidad'].sum()
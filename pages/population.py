@@ -6,7 +6,7 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import numpy as np
-import re
+from utils.load_data import get_counts
 
 def show_population(df):
     """
@@ -31,28 +31,10 @@ def show_population(df):
             # Análisis de población por grupo étnico
             st.markdown('<div class="subsection-header">Población por Grupo Étnico</div>', unsafe_allow_html=True)
             
-            # Procesar los datos para el análisis
-            etnias = []
-            for pob in df[poblacion_col].dropna():
-                if isinstance(pob, str):
-                    # Manejar diferentes variantes en los grupos étnicos
-                    if "AFRO" in pob.upper() or "NEGRO" in pob.upper() or "MULATO" in pob.upper():
-                        etnias.append("Afrodescendiente")
-                    elif "MESTIZA" in pob.upper():
-                        etnias.append("Mestizo")
-                    elif "INDÍGENA" in pob.upper():
-                        etnias.append("Indígena")
-                    elif "NINGÚN" in pob.upper():
-                        etnias.append("Sin grupo étnico específico")
-                    elif "OTRO" in pob.upper():
-                        etnias.append("Otro grupo étnico")
-                    else:
-                        etnias.append("No especificado")
+            # Grupos étnicos según las reglas de utils.answers (tabla GRUPOS_ETNICOS)
+            etnias_counts = get_counts(df, 'GRUPOS_ETNICOS', 'Grupo Étnico')
             
-            if etnias:
-                etnias_counts = pd.Series(etnias).value_counts().reset_index()
-                etnias_counts.columns = ['Grupo Étnico', 'Cantidad']
-                
+            if not etnias_counts.empty:
                 # Crear gráfico de barras
                 fig_etnias = px.bar(
                     etnias_counts, 
@@ -79,26 +61,10 @@ def show_population(df):
             # Análisis por etapa vital
             st.markdown('<div class="subsection-header">Población por Etapa Vital</div>', unsafe_allow_html=True)
             
-            # Procesar los datos para el análisis
-            etapas = []
-            for etapa in df[etapa_col].dropna():
-                if isinstance(etapa, str):
-                    # Extraer etapas específicas
-                    if "INFANCIA" in etapa.upper():
-                        etapas.append("Infancia (6-11 años)")
-                    if "ADOLESCENTES" in etapa.upper():
-                        etapas.append("Adolescentes (12-18 años)")
-                    if "JÓVENES" in etapa.upper() or "JOVENES" in etapa.upper():
-                        etapas.append("Jóvenes (19-28 años)")
-                    if "ADULTOS/AS (" in etapa.upper():
-                        etapas.append("Adultos (29-59 años)")
-                    if "MAYORES" in etapa.upper():
-                        etapas.append("Personas mayores (60+ años)")
+            # Etapas vitales según las reglas de utils.answers (tabla ETAPAS_VITALES)
+            etapas_counts = get_counts(df, 'ETAPAS_VITALES', 'Etapa Vital')
             
-            if etapas:
-                etapas_counts = pd.Series(etapas).value_counts().reset_index()
-                etapas_counts.columns = ['Etapa Vital', 'Cantidad']
-                
+            if not etapas_counts.empty:
                 # Ordenar las etapas en orden cronológico
                 etapa_order = [
                     "Infancia (6-11 años)",
@@ -139,41 +105,10 @@ def show_population(df):
     if grupos_col:
         st.markdown('<div class="subsection-header">Grupos en Situación de Vulnerabilidad</div>', unsafe_allow_html=True)
         
-        # Procesar los datos para el análisis
-        grupos = []
-        for grupo in df[grupos_col].dropna():
-            if isinstance(grupo, str):
-                for g in re.split(r',|\s+', grupo):
-                    g = g.strip()
-                    if g:
-                        # Simplificar y categorizar
-                        if "SPA" in g.upper():
-                            grupos.append("Consumidores SPA")
-                        elif "MIGRANTES" in g.upper():
-                            grupos.append("Migrantes")
-                        elif "INFORMAL" in g.upper():
-                            grupos.append("Trabajadores informales")
-                        elif "CALLE" in g.upper():
-                            grupos.append("Habitantes de calle")
-                        elif "FORMAL" in g.upper():
-                            grupos.append("Trabajadores formales")
-                        elif "LIDERAZGO" in g.upper() or "JAC" in g.upper() or "JAL" in g.upper():
-                            grupos.append("Liderazgo social")
-                        elif "RECICLADORES" in g.upper() or "RECUPERADORES" in g.upper():
-                            grupos.append("Recicladores")
-                        elif "HOGAR" in g.upper() or "JEFE" in g.upper():
-                            grupos.append("Jefes de hogar")
-                        elif "VÍCTIMAS" in g.upper() or "VICTIMAS" in g.upper() or "CONFLICTO" in g.upper():
-                            grupos.append("Víctimas del conflicto")
-                        elif "DISCAPACIDAD" in g.upper():
-                            grupos.append("Personas con discapacidad")
-                        elif "OTRO" in g.upper():
-                            grupos.append("Otros grupos vulnerables")
+        # Opciones agrupadas en categorías al cargar (tabla GRUPOS_VULNERABLES)
+        grupos_counts = get_counts(df, 'GRUPOS_VULNERABLES', 'Grupo Vulnerable')
         
-        if grupos:
-            grupos_counts = pd.Series(grupos).value_counts().reset_index()
-            grupos_counts.columns = ['Grupo Vulnerable', 'Cantidad']
-            
+        if not grupos_counts.empty:
             # Crear gráfico de barras
             fig_grupos = px.bar(
                 grupos_counts, 
@@ -197,9 +132,10 @@ def show_population(df):
         st.markdown('<div class="subsection-header">Participación de Beneficiarios en Labor Social</div>', unsafe_allow_html=True)
         
         # Contar respuestas
-        beneficiarios_labor = df['BENEFICIARIOS_SON_MISMOS_QUE_REALIZA_LABORA_SOCIAL'].apply(
-            lambda x: 'Sí' if x == 'SI' else ('No' if x == 'NO' else 'Sin datos')
-        ).value_counts().reset_index()
+        respuestas = df['BENEFICIARIOS_SON_MISMOS_QUE_REALIZA_LABORA_SOCIAL']
+        beneficiarios_labor = pd.Series(np.select(
+            [respuestas == 'SI', respuestas == 'NO'], ['Sí', 'No'], 'Sin datos'
+        )).value_counts().reset_index()
         
         beneficiarios_labor.columns = ['Beneficiarios realizan labor social', 'Cantidad']
         
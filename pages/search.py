@@ -0,0 +1,74 @@
+"""
+Módulo que muestra la página de búsqueda en los textos libres de las visitas.
+"""
+
+import streamlit as st
+import pandas as pd
+from utils.load_data import get_text_index
+from utils.text_index import snippet, SCORE_COLUMN, MATCH_COLUMN
+
+# Resultados que se muestran con su fragmento de texto
+MAX_SNIPPETS = 20
+
+def show_search(df):
+    """
+    Muestra la página de búsqueda de palabras y frases en los textos libres.
+
+    Args:
+        df (pandas.DataFrame): Dataframe con los datos a analizar.
+    """
+    st.markdown('<div class="section-header">Búsqueda en Textos</div>', unsafe_allow_html=True)
+    st.markdown("Búsqueda de palabras y frases en las historias, observaciones y demás respuestas abiertas de las visitas")
+
+    text_index = get_text_index(df)
+
+    query = st.text_input(
+        "Buscar",
+        placeholder='huerta iglesia  o  "olla comunitaria"',
+        key='busqueda_texto',
+        help="No distingue mayúsculas ni tildes. Las frases entre comillas deben aparecer completas y en ese orden. Aparecen primero las visitas que contienen más partes de la búsqueda."
+    )
+    columnas = st.multiselect(
+        "Buscar en",
+        list(text_index.columns),
+        key='busqueda_columnas',
+        placeholder="Todas las columnas de texto"
+    )
+
+    if not query.strip():
+        st.info("Escribe una o varias palabras para buscar en los textos de las visitas.")
+        return
+
+    resultados = text_index.search(query, df, columnas or None)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Visitas encontradas", f"{len(resultados)} de {len(df)}")
+    with col2:
+        comedores = df.loc[resultados.index, 'NOMBRE_COMEDOR'].nunique() if 'NOMBRE_COMEDOR' in df.columns else 0
+        st.metric("Comedores", comedores)
+
+    if resultados.empty:
+        st.warning("Ningún texto coincide con la búsqueda.")
+        return
+
+    # Fragmentos de los mejores resultados
+    st.markdown('<div class="subsection-header">Resultados más relevantes</div>', unsafe_allow_html=True)
+    for idx, resultado in resultados.head(MAX_SNIPPETS).iterrows():
+        row = df.loc[idx]
+        columna = resultado[MATCH_COLUMN]
+        nombre = row['NOMBRE_COMEDOR'] if 'NOMBRE_COMEDOR' in df.columns else idx
+        comuna = f" · Comuna {row['COMUNA']}" if 'COMUNA' in df.columns and pd.notna(row['COMUNA']) else ""
+        st.markdown(
+            f"**{nombre}**{comuna} · <small>{columna}</small><br>{snippet(row[columna], query)}",
+            unsafe_allow_html=True
+        )
+
+    # Tabla con todos los resultados
+    st.markdown('<div class="subsection-header">Todas las visitas encontradas</div>', unsafe_allow_html=True)
+    columnas_tabla = [col for col in ['NOMBRE_COMEDOR', 'COMUNA', 'BARRIO'] if col in df.columns]
+    tabla = df.loc[resultados.index, columnas_tabla].assign(**{
+        MATCH_COLUMN: resultados[MATCH_COLUMN],
+        SCORE_COLUMN: resultados[SCORE_COLUMN],
+    })
+    st.dataframe(tabla, use_container_width=True)
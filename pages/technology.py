@@ -7,6 +7,7 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
+from utils.load_data import get_counts
 
 def show_technology(df):
     """
@@ -55,18 +56,10 @@ def show_technology(df):
             # Analizar tipos de TIC utilizadas
             st.markdown('<div class="subsection-header">Tipos de TIC Utilizadas</div>', unsafe_allow_html=True)
             
-            # Procesar los datos para el análisis
-            tipos_tic = []
-            for tic in df[uso_tic_col].dropna():
-                if isinstance(tic, str):
-                    for tipo in tic.split(';'):
-                        tipo = tipo.strip()
-                        if tipo:
-                            tipos_tic.append(tipo)
+            # Contar las opciones a partir de la tabla separada al cargar
+            tic_counts = get_counts(df, uso_tic_col, 'Tipo de TIC')
             
-            if tipos_tic:
-                tic_counts = pd.Series(tipos_tic).value_counts().reset_index()
-                tic_counts.columns = ['Tipo de TIC', 'Cantidad']
+            if not tic_counts.empty:
                 
                 # Crear gráfico de barras
                 fig_tic = px.bar(
@@ -92,18 +85,10 @@ def show_technology(df):
             # Analizar redes sociales utilizadas
             st.markdown('<div class="subsection-header">Redes Sociales Utilizadas</div>', unsafe_allow_html=True)
             
-            # Procesar los datos para el análisis
-            redes = []
-            for red in df[redes_col].dropna():
-                if isinstance(red, str):
-                    for r in red.split(','):
-                        r = r.strip()
-                        if r:
-                            redes.append(r)
+            # Contar las opciones a partir de la tabla separada al cargar
+            redes_counts = get_counts(df, redes_col, 'Red Social')
             
-            if redes:
-                redes_counts = pd.Series(redes).value_counts().reset_index()
-                redes_counts.columns = ['Red Social', 'Cantidad']
+            if not redes_counts.empty:
                 
                 # Crear gráfico de pastel
                 fig_redes = px.pie(
@@ -127,18 +112,10 @@ def show_technology(df):
     if office_col:
         st.markdown('<div class="subsection-header">Conocimiento de Herramientas Ofimáticas</div>', unsafe_allow_html=True)
         
-        # Procesar los datos para el análisis
-        office_tools = []
-        for tools in df[office_col].dropna():
-            if isinstance(tools, str):
-                for tool in tools.split(','):
-                    tool = tool.strip()
-                    if tool:
-                        office_tools.append(tool)
+        # Contar las opciones a partir de la tabla separada al cargar
+        office_counts = get_counts(df, office_col, 'Herramienta')
         
-        if office_tools:
-            office_counts = pd.Series(office_tools).value_counts().reset_index()
-            office_counts.columns = ['Herramienta', 'Cantidad']
+        if not office_counts.empty:
             
             # Crear gráfico de barras
             fig_office = px.bar(
@@ -161,18 +138,10 @@ def show_technology(df):
     if estrategias_col:
         st.markdown('<div class="subsection-header">Estrategias de Comunicación</div>', unsafe_allow_html=True)
         
-        # Procesar los datos para el análisis
-        estrategias = []
-        for est in df[estrategias_col].dropna():
-            if isinstance(est, str):
-                for e in est.split(';'):
-                    e = e.strip()
-                    if e:
-                        estrategias.append(e)
+        # Contar las opciones a partir de la tabla separada al cargar
+        estrategias_counts = get_counts(df, estrategias_col, 'Estrategia')
         
-        if estrategias:
-            estrategias_counts = pd.Series(estrategias).value_counts().reset_index()
-            estrategias_counts.columns = ['Estrategia', 'Cantidad']
+        if not estrategias_counts.empty:
             
             # Crear gráfico de barras
             fig_estrategias = px.bar(
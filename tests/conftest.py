@@ -0,0 +1,33 @@
+"""
+Datos compartidos por las pruebas: visitas sintéticas con los mismos tipos que
+entrega load_data() (ver utils.synthetic).
+"""
+
+import os
+import sys
+
+import pytest
+
+# Permitir `pytest` desde la raíz del repositorio sin instalar el paquete
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.cube import REVISION_ATTR
+from utils.ingest import coerce_types
+from utils.schema import apply_schema
+from utils.synthetic import generate_visits
+
+VISITS = 500
+
+
+@pytest.fixture(scope='session')
+def raw_visits():
+    """Visitas sintéticas tal como se leen de la hoja, antes de convertir tipos."""
+    return generate_visits(VISITS, seed=1)
+
+
+@pytest.fixture
+def visits(raw_visits):
+    """Visitas con tipos y esquema aplicados, como las entrega load_data()."""
+    df = apply_schema(coerce_types(raw_visits.copy()))
+    df.attrs[REVISION_ATTR] = 'prueba:1'
+    return df
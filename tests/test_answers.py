@@ -0,0 +1,134 @@
+"""Pruebas de las tablas largas de selección múltiple (utils.answers)."""
+
+import re
+
+import pandas as pd
+import pytest
+
+from utils.answers import (
+    ANSWER_RULES, FOLD_TABLE, ID_COLUMN, VALUE_COLUMN, AnswerRule, build_answer_tables, explode_answers,
+)
+
+
+def _direct_options(df, rule):
+    """Opciones de referencia: separar, limpiar y renombrar fila por fila."""
+    aliases = {key.upper().translate(FOLD_TABLE): value for key, value in rule.aliases.items()}
+    rows = []
+    for label, row_id, text in zip(df.index, df[ID_COLUMN], df[rule.column]):
+        if pd.isna(text):
+            continue
+        for option in re.split(rule.separator, str(text)) if rule.separator else [str(text)]:
+            option = option.strip() if rule.strip else option
+            if option:
+                rows.append((label, row_id, aliases.get(option.upper().translate(FOLD_TABLE), option)))
+    return rows
+
+
+def _as_rows(table):
+    return list(zip(table.index, table[ID_COLUMN], table[VALUE_COLUMN]))
+
+
+def test_plain_rules_equal_row_by_row(visits):
+    plain = {name: rule for name, rule in ANSWER_RULES.items() if not rule.categories}
+    assert plain
+    for name, rule in plain.items():
+        assert _as_rows(explode_answers(visits, name)) == _direct_options(visits, rule), name
+
+
+def test_subset_equals_filtered_table(visits):
+    # get_answer_table() filtra la tabla completa por las filas del subconjunto
+    subset = visits.iloc[::4]
+    for name, table in build_answer_tables(visits).items():
+        pd.testing.assert_frame_equal(explode_answers(subset, name), table[table.index.isin(subset.index)],
+                                      check_index_type=False)
+
+
+def test_categories_first_all_and_default():
+    df = pd.DataFrame({
+        ID_COLUMN: [10, 11, 12, 13, 14],
+        'RESPUESTA': ['Huerta y Cocina', 'cocina', 'Jardín', None, 'HUERTA, jardin'],
+    })
+    categories = [('Huerta', ['HUERTA']), ('Cocina', ['COCINA']), ('Jardín', ['JARDIN'])]
+
+    first = explode_answers(df, 'prueba', AnswerRule('RESPUESTA', categories=categories))
+    assert _as_rows(first) == [(0, 10, 'Huerta'), (1, 11, 'Cocina'), (2, 12, 'Jardín'), (4, 14, 'Huerta')]
+
+    every = explode_answers(df, 'prueba', AnswerRule('RESPUESTA', categories=categories, match='all'))
+    assert _as_rows(every) == [
+        (0, 10, 'Huerta'), (0, 10, 'Cocina'), (1, 11, 'Cocina'), (2, 12, 'Jardín'), (4, 14, 'Huerta'), (4, 14, 'Jardín'),
+    ]
+
+    # Las opciones sin categoría se descartan, salvo que haya categoría por
+    # defecto, que también reúne las respuestas vacías
+    only = [('Cocina', ['COCINA'])]
+    assert _as_rows(explode_answers(df, 'prueba', AnswerRule('RESPUESTA', ',', categories=only))) == [
+        (0, 10, 'Cocina'), (1, 11, 'Cocina'),
+    ]
+    for match in ['first', 'all']:
+        rule = AnswerRule('RESPUESTA', ',', categories=only, match=match, default='Otro')
+        assert _as_rows(explode_answers(df, 'prueba', rule)) == [
+            (0, 10, 'Cocina'), (1, 11, 'Cocina'), (2, 12, 'Otro'), (3, 13, 'Otro'), (4, 14, 'Otro'), (4, 14, 'Otro'),
+        ]
+
+
+def test_fold_and_aliases():
+    df = pd.DataFrame({ID_COLUMN: [1, 2], 'RESPUESTA': ['Alcaldía; ALCALDIA ;', 'face;Wsp']})
+    folded = explode_answers(df, 'prueba', AnswerRule('RESPUESTA', ';', fold=True))
+    assert list(folded[VALUE_COLUMN]) == ['ALCALDIA', 'ALCALDIA', 'FACE', 'WSP']
+    renamed = explode_answers(df, 'prueba', AnswerRule('RESPUESTA', ';', aliases={'FACE': 'Facebook', 'wsp': 'WhatsApp'}))
+    assert list(renamed[VALUE_COLUMN]) == ['Alcaldía', 'ALCALDIA', 'Facebook', 'WhatsApp']
+
+
+def _baseline_ethnic_groups(df):
+    """Conteo de grupos étnicos de la versión anterior de pages/population.py."""
+    etnias = []
+    for pob in df['POBLACION_PRINCIPAL_COMEDOR'].dropna():
+        if isinstance(pob, str):
+            if "AFRO" in pob.upper() or "NEGRO" in pob.upper() or "MULATO" in pob.upper():
+                etnias.append("Afrodescendiente")
+            elif "MESTIZA" in pob.upper():
+                etnias.append("Mestizo")
+            elif "INDÍGENA" in pob.upper():
+                etnias.append("Indígena")
+            elif "NINGÚN" in pob.upper():
+                etnias.append("Sin grupo étnico específico")
+            elif "OTRO" in pob.upper():
+                etnias.append("Otro grupo étnico")
+            else:
+                etnias.append("No especificado")
+    return pd.Series(etnias).value_counts().to_dict()
+
+
+def test_ethnic_groups_count_blank_answers_as_default(raw_visits, visits):
+    column = 'POBLACION_PRINCIPAL_COMEDOR'
+    raw = raw_visits.copy()
+    raw.loc[raw.index[:3], column] = ['   ', 'indígena', 'Sin dato']
+    assert (raw[column] == '').any()
+    table = explode_answers(raw, 'GRUPOS_ETNICOS')
+    assert table[VALUE_COLUMN].value_counts().to_dict() == _baseline_ethnic_groups(raw)
+    # Los tipos de load_data() (categorías) dan los mismos conteos
+    assert explode_answers(visits, 'GRUPOS_ETNICOS')[VALUE_COLUMN].value_counts().to_dict() == \
+        _baseline_ethnic_groups(raw_visits)
+
+    # Las celdas vacías también cuentan como 'No especificado', una vez por visita
+    df = pd.DataFrame({ID_COLUMN: [1, 2, 3], column: ['OTRO', None, '']})
+    assert _as_rows(explode_answers(df, 'GRUPOS_ETNICOS')) == [
+        (0, 1, 'Otro grupo étnico'), (1, 2, 'No especificado'), (2, 3, 'No especificado'),
+    ]
+
+
+def test_invalid_match():
+    with pytest.raises(ValueError):
+        AnswerRule('RESPUESTA', match='any')
+
+
+def test_build_answer_tables_follows_rules(visits):
+    tables = build_answer_tables(visits)
+    assert set(tables) == {name for name, rule in ANSWER_RULES.items() if rule.column in visits.columns}
+
+    # Sin la columna de origen no hay tabla, y explode_answers devuelve una tabla vacía
+    column = ANSWER_RULES['NECESIDADES'].column
+    tables = build_answer_tables(visits.drop(columns=[column]))
+    assert not {name for name, rule in ANSWER_RULES.items() if rule.column == column} & set(tables)
+    empty = explode_answers(visits.drop(columns=[column]), 'NECESIDADES')
+    assert empty.empty and list(empty.columns) == [ID_COLUMN, VALUE_COLUMN]
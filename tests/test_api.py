@@ -0,0 +1,141 @@
+"""Pruebas de la API JSON de solo lectura (utils.api)."""
+
+import http.client
+import json
+import threading
+from http.server import ThreadingHTTPServer
+from urllib.parse import quote
+
+import pytest
+
+import utils.api
+from utils.api import ApiError, ApiHandler, ResponseCache, _compute, _filter
+from utils.cube import REVISION_ATTR, question_columns
+from utils.answers import ANSWER_RULES
+
+
+@pytest.fixture
+def api(visits, monkeypatch):
+    """Servidor de la API en un puerto libre que sirve `visits` como datos cargados."""
+    data = {'df': visits}
+    monkeypatch.setattr(utils.api, 'load_data', lambda: data['df'])
+    monkeypatch.setattr(utils.api, '_response_cache', ResponseCache())
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ApiHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    def get(path, etag=None):
+        connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=30)
+        connection.request('GET', path, headers={'If-None-Match': etag} if etag else {})
+        response = connection.getresponse()
+        body = response.read()
+        connection.close()
+        return response.status, response.getheader('ETag'), json.loads(body) if body else None
+
+    yield get, data
+    server.shutdown()
+    server.server_close()
+
+
+def test_filter_params(visits):
+    comunas = visits['COMUNA'].dropna().unique()[:2]
+    one = _filter(visits, {'comuna': [str(comunas[0])]})
+    assert len(one) == (visits['COMUNA'] == comunas[0]).sum()
+    both = _filter(visits, {'comuna': [str(value) for value in comunas]})
+    assert len(both) == visits['COMUNA'].isin(comunas).sum()
+
+    # Los valores desconocidos se ignoran; si ninguno existe, no hay visitas
+    assert len(_filter(visits, {'comuna': [str(comunas[0]), 'NO EXISTE']})) == len(one)
+    assert _filter(visits, {'comuna': ['NO EXISTE']}).empty
+    assert _compute(visits, 'estado', {'comuna': ['NO EXISTE']})['visitas'] == 0
+    # Los parámetros que no son filtros no filtran
+    assert len(_filter(visits, {'desconocido': ['1']})) == len(visits)
+
+
+def test_conteos_only_publishes_questions(visits):
+    column = question_columns(visits)[0]
+    counts = _compute(visits, f'conteos/{column}', {})
+    assert sum(row['Cantidad'] for row in counts) == visits[column].notna().sum()
+    # Las tablas de selección múltiple también se publican
+    for name in ANSWER_RULES:
+        assert _compute(visits, f'conteos/{name}', {})
+
+    for private in ['TELEFONO1', 'DIRECCION', 'NOMBER_GESTORA', 'NO_EXISTE']:
+        with pytest.raises(ApiError) as error:
+            _compute(visits, f'conteos/{private}', {})
+        assert error.value.status == 404
+
+
+def test_evaluacion_pages(visits):
+    full = _compute(visits, 'evaluacion', {})
+    page = _compute(visits, 'evaluacion', {'desde': ['3'], 'limite': ['5']})
+    assert page['total'] == full['total'] and page['desde'] == 3
+    assert page['comedores'] == full['comedores'][3:8]
+    empty = _compute(visits, 'evaluacion', {'comuna': ['NO EXISTE'], 'desde': ['2']})
+    assert empty['total'] == 0 and empty['desde'] == 2 and empty['comedores'] == []
+    for value in ['-1', 'x']:
+        with pytest.raises(ApiError) as error:
+            _compute(visits, 'evaluacion', {'limite': [value]})
+        assert error.value.status == 400
+
+
+def test_response_cache_revisions():
+    cache = ResponseCache(max_size=2)
+    cache.put('r1', 'a', b'1')
+    assert cache.get('r1', 'a') == b'1'
+    assert cache.get('r2', 'a') is None
+
+    # Una respuesta de otra revisión descarta las anteriores
+    cache.put('r2', 'b', b'2')
+    assert cache.get('r1', 'a') is None
+    assert cache.get('r2', 'b') == b'2'
+
+    # Dentro de una revisión se descarta la menos usada
+    cache.put('r2', 'c', b'3')
+    cache.get('r2', 'b')
+    cache.put('r2', 'd', b'4')
+    assert cache.get('r2', 'c') is None
+    assert cache.get('r2', 'b') == b'2' and cache.get('r2', 'd') == b'4'
+
+
+def test_etag_and_not_modified(api, visits):
+    get, data = api
+    status, etag, body = get('/api/estado')
+    assert status == 200 and etag and body['visitas'] == len(visits)
+
+    # Misma revisión: 304 sin cuerpo
+    status, same, body = get('/api/estado', etag)
+    assert status == 304 and same == etag and body is None
+    # Otra consulta tiene otro ETag
+    assert get('/api/estado?comuna=NO%20EXISTE')[1] != etag
+
+    # Nueva revisión de los datos: el ETag anterior ya no sirve y la respuesta se recalcula
+    changed = visits.iloc[:100].copy()
+    changed.attrs[REVISION_ATTR] = 'prueba:2'
+    data['df'] = changed
+    status, new_etag, body = get('/api/estado', etag)
+    assert status == 200 and new_etag != etag and body['visitas'] == 100
+    assert body['revision'] == 'prueba:2'
+
+
+def test_cached_responses(api):
+    get, _ = api
+    first = get('/api/necesidades')
+    assert first[0] == 200
+    assert get('/api/necesidades') == first
+    assert utils.api._response_cache.hits == 1
+
+
+def test_http_errors_and_encoded_paths(api, visits):
+    get, _ = api
+    assert get('/api/conteos/TELEFONO1')[0] == 404
+    assert get('/api/desconocida')[0] == 404
+    assert get('/otra')[0] == 404
+    assert get('/api/evaluacion?limite=-1')[0] == 400
+
+    # Las rutas llegan codificadas y se comparan ya decodificadas
+    status, _, body = get('/api/conteos/' + quote('¿Cuáles?2'))
+    assert status == 404 and '¿Cuáles?2' in body['error']
+    column = question_columns(visits)[0]
+    assert get('/api/conteos/' + ''.join(f'%{byte:02X}' for byte in column.encode()))[0] == 200
@@ -0,0 +1,67 @@
+"""Pruebas del cubo de conteos precalculados (utils.cube)."""
+
+import numpy as np
+
+from utils.answers import VALUE_COLUMN, build_answer_tables, explode_answers
+from utils.cube import REVISION_ATTR, AggregateCube, question_columns
+from utils.filters import FilterIndex, apply_filters
+
+
+def _as_dict(counts):
+    return {value: int(count) for value, count in counts.items() if count > 0}
+
+
+def _direct_counts(df, column, answers):
+    """Conteo de referencia recorriendo las filas de `df`."""
+    if column in answers:
+        return _as_dict(explode_answers(df, column)[VALUE_COLUMN].value_counts())
+    return _as_dict(df[column].value_counts())
+
+
+def _filter_cases(index):
+    """Filtros de prueba: sin filtros, una columna, varias columnas y sin resultados."""
+    comunas = index.values('COMUNA')
+    profesionales = index.values('PREFESIONAL_REALIZA_VISITA')
+    return [
+        {},
+        {'COMUNA': comunas[:1]},
+        {'COMUNA': comunas[:3], 'PREFESIONAL_REALIZA_VISITA': profesionales[:2]},
+        {'BARRIO': index.values('BARRIO')[-2:], 'NODO': index.values('NODO')[:1]},
+        {'COMUNA': comunas[:1], 'BARRIO': ['NO EXISTE']},
+    ]
+
+
+def test_counts_equal_direct_counts_under_filters(visits):
+    revision = visits.attrs[REVISION_ATTR]
+    answers = build_answer_tables(visits)
+    cube = AggregateCube(visits, answers, revision)
+    index = FilterIndex(visits, revision)
+    columns = question_columns(visits) + list(answers)
+
+    for selections in _filter_cases(index):
+        filtered = apply_filters(visits, index, selections)
+        assert cube.total(selections) == len(filtered)
+        for column in columns:
+            assert _as_dict(cube.counts(column, selections)) == _direct_counts(filtered, column, answers), (column, selections)
+
+
+def test_counts_are_sorted_from_most_to_least_frequent(visits):
+    cube = AggregateCube(visits, build_answer_tables(visits), visits.attrs[REVISION_ATTR])
+    for column in question_columns(visits):
+        counts = cube.counts(column).to_numpy()
+        assert np.all(counts[:-1] >= counts[1:])
+
+
+def test_matches_only_same_revision_and_filter_subsets(visits):
+    revision = visits.attrs[REVISION_ATTR]
+    cube = AggregateCube(visits, build_answer_tables(visits), revision)
+    index = FilterIndex(visits, revision)
+
+    assert cube.matches(visits)
+    assert cube.matches(apply_filters(visits, index, {'COMUNA': index.values('COMUNA')[:2]}))
+    # Un subconjunto que no viene de los filtros globales no se puede contar en el cubo
+    assert not cube.matches(visits.iloc[:10])
+
+    other = visits.copy()
+    other.attrs[REVISION_ATTR] = 'prueba:2'
+    assert not cube.matches(other)
@@ -0,0 +1,69 @@
+"""Pruebas del índice de mapas de bits de los filtros globales (utils.filters)."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.cube import FILTERS_ATTR, REVISION_ATTR
+from utils.filters import FILTER_COLUMNS, FilterIndex, apply_filters
+
+
+def _expected_mask(df, selections):
+    """Máscara de referencia calculada con indexación booleana de pandas."""
+    mask = np.ones(len(df), dtype=bool)
+    for column, values in selections.items():
+        if values:
+            mask &= df[column].isin(values).to_numpy()
+    return mask
+
+
+def _selections(index, rng):
+    """Elige al azar algunos valores de algunas columnas de filtro."""
+    selections = {}
+    for column in FILTER_COLUMNS:
+        values = index.values(column)
+        if values and rng.random() < 0.6:
+            size = rng.integers(1, min(4, len(values)) + 1)
+            selections[column] = list(rng.choice(np.array(values, dtype=object), size=size, replace=False))
+    return selections
+
+
+def test_mask_matches_boolean_indexing(visits):
+    index = FilterIndex(visits, visits.attrs[REVISION_ATTR])
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        selections = _selections(index, rng)
+        mask = index.mask(selections)
+        expected = _expected_mask(visits, selections)
+        if mask is None:
+            assert expected.all()
+        else:
+            np.testing.assert_array_equal(mask, expected)
+
+
+def test_apply_filters_keeps_selected_rows_and_records_filters(visits):
+    index = FilterIndex(visits, visits.attrs[REVISION_ATTR])
+    comunas = index.values('COMUNA')[:2]
+
+    filtered = apply_filters(visits, index, {'COMUNA': comunas})
+
+    assert filtered.index.equals(visits.index[visits['COMUNA'].isin(comunas)])
+    assert filtered.attrs[FILTERS_ATTR] == {'COMUNA': list(comunas)}
+    assert set(filtered['COMUNA'].cat.categories) == set(comunas)
+
+
+def test_apply_filters_rejects_index_of_another_revision(visits):
+    index = FilterIndex(visits, 'prueba:0')
+    with pytest.raises(ValueError):
+        apply_filters(visits, index, {'COMUNA': index.values('COMUNA')[:1]})
+
+
+def test_values_sort_numbers_naturally(visits):
+    # Comunas como números (Int64), igual que al convertir los tipos de la hoja
+    df = visits.assign(COMUNA=pd.array(np.arange(len(visits)) % 12 + 1, dtype='Int64'))
+    index = FilterIndex(df, visits.attrs[REVISION_ATTR])
+
+    values = index.values('COMUNA')
+
+    assert values == list(range(1, 13))
+    assert all(isinstance(value, (int, np.integer)) for value in values)
@@ -0,0 +1,96 @@
+"""Pruebas del índice espacial de cuadrícula (utils.geo)."""
+
+import numpy as np
+
+from utils.geo import COUNT_COLUMN, INDEX_CELL_KM, SpatialIndex
+
+
+def _brute_force(index, lat, lon, subset=None):
+    """Distancias de referencia a todos los puntos del índice, de menor a mayor."""
+    x, y = index._project(lat, lon)
+    distances = np.hypot(index.x - x, index.y - y)
+    positions = np.arange(len(index)) if subset is None else np.flatnonzero(subset)
+    order = positions[np.argsort(distances[positions], kind='stable')]
+    return index.labels[order], distances[order]
+
+
+def _queries(index):
+    """Consultas de prueba: sobre puntos del índice, entre puntos y fuera del área."""
+    rng = np.random.default_rng(3)
+    picks = rng.choice(len(index), 5, replace=False)
+    queries = [(index.lat[i], index.lon[i]) for i in picks]
+    queries.append((index.lat.mean(), index.lon.mean()))
+    queries.append((index.lat.max() + 0.05, index.lon.min() - 0.05))
+    # Lejos de la cuadrícula: los primeros anillos de celdas están vacíos
+    queries.append((4.5, -75.0))
+    queries.append((index.lat.min() - 2.0, index.lon.mean()))
+    return queries
+
+
+def test_within_equals_brute_force(visits):
+    index = SpatialIndex(visits)
+    subset = index.subset_mask(visits.index[::3])
+    for lat, lon in _queries(index):
+        for radius in [0.3, 1.0, 2.5]:
+            for mask in [None, subset]:
+                labels, distances = _brute_force(index, lat, lon, mask)
+                inside = distances <= radius
+                result = index.within(lat, lon, radius, subset=mask)
+                assert set(result.index) == set(labels[inside])
+                assert np.allclose(np.sort(result.to_numpy()), distances[inside])
+                assert result.is_monotonic_increasing
+
+
+def test_nearest_equals_brute_force(visits):
+    index = SpatialIndex(visits)
+    subset = index.subset_mask(visits.index[::4])
+    for lat, lon in _queries(index):
+        for k in [1, 5, 20]:
+            for mask in [None, subset]:
+                _, distances = _brute_force(index, lat, lon, mask)
+                result = index.nearest(lat, lon, k=k, subset=mask)
+                assert len(result) == k
+                assert np.allclose(result.to_numpy(), distances[:k])
+                if mask is not None:
+                    assert mask[np.isin(index.labels, result.index)].all()
+
+
+def test_nearest_returns_k_points_far_from_grid(visits):
+    index = SpatialIndex(visits)
+    for lat, lon in [(4.5, -75.0), (-30.0, 100.0)]:
+        assert len(index.nearest(lat, lon, k=3)) == 3
+        assert len(index.nearest(lat, lon, k=len(index))) == len(index)
+
+
+def test_subset_mask_selects_labels(visits):
+    index = SpatialIndex(visits)
+    labels = visits.index[10:40]
+    mask = index.subset_mask(labels)
+    assert set(index.labels[mask]) == set(labels) & set(index.labels)
+
+
+def test_coverage_gaps_bounds(visits):
+    index = SpatialIndex(visits)
+    everything = np.ones(len(index), dtype=bool)
+    nothing = np.zeros(len(index), dtype=bool)
+
+    # Todo punto es candidato de sí mismo: no hay zonas sin cobertura
+    assert index.coverage_gaps(everything).empty
+    # Sin candidatos, todos los puntos quedan en alguna zona sin cobertura
+    gaps = index.coverage_gaps(nothing)
+    assert gaps[COUNT_COLUMN].sum() == len(index)
+    assert gaps[COUNT_COLUMN].is_monotonic_decreasing
+
+    # Un punto sin cobertura no tiene ningún candidato a menos del radio
+    rng = np.random.default_rng(5)
+    candidates = rng.random(len(index)) < 0.05
+    radius = 1.0
+    gaps = index.coverage_gaps(candidates, radius_km=radius)
+    covered_points = len(index) - gaps[COUNT_COLUMN].sum()
+    near = np.hypot(index.x[:, None] - index.x[candidates][None, :],
+                    index.y[:, None] - index.y[candidates][None, :]).min(axis=1)
+    # Las celdas se comparan por su centro: la distancia entre puntos difiere
+    # a lo sumo en una diagonal de celda
+    diagonal = np.sqrt(2) * INDEX_CELL_KM
+    assert (near <= radius + diagonal).sum() >= covered_points
+    assert (near <= radius - diagonal).sum() <= covered_points
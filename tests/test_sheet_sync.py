@@ -0,0 +1,171 @@
+"""Pruebas de la sincronización incremental de la hoja (utils.sheet_sync)."""
+
+import re
+
+import pandas as pd
+import pytest
+from gspread.utils import a1_to_rowcol
+
+import utils.load_data as load_data
+import utils.sheet_sync as sheet_sync
+from utils.schema import apply_schema
+from utils.sheet_sync import ID_COLUMN, full_sync, sync_worksheet
+
+
+class FakeSheet:
+    """Hoja en memoria con la misma interfaz que SheetValues."""
+
+    def __init__(self, values):
+        self.values = values
+        self.requests = []
+
+    def _bound(self, ref, default_row):
+        column, row = re.fullmatch(r'([A-Z]*)(\d*)', ref).groups()
+        col = a1_to_rowcol(f'{column}1')[1] if column else None
+        return (int(row) if row else default_row), col
+
+    def get_values(self, range_name=None):
+        self.requests.append(range_name)
+        if range_name is None:
+            return [list(row) for row in self.values]
+        start, end = range_name.split(':')
+        first_row, first_col = self._bound(start, 1)
+        last_row, last_col = self._bound(end, len(self.values))
+        first_col = first_col or 1
+        return [list(row[first_col - 1:last_col]) for row in self.values[first_row - 1:last_row]]
+
+    def batch_get(self, ranges):
+        return [self.get_values(range_name) for range_name in ranges]
+
+
+def _grid(raw_visits, rows):
+    """Cuadrícula de valores (encabezado + filas) como la devuelve la API de Sheets."""
+    text = raw_visits.iloc[:rows].astype(object)
+    text = text.where(text.notna(), '').astype(str)
+    return [list(text.columns)] + text.to_numpy().tolist()
+
+
+def _comparable(df):
+    """DataFrame con el esquema aplicado y los valores como texto, para comparar."""
+    return apply_schema(df).astype(str).reset_index(drop=True)
+
+
+def _edit(values, row, column):
+    """Modifica una celda de la cuadrícula (fila 1 = primera visita)."""
+    col = values[0].index(column)
+    values[row][col] = 'EDITADO'
+
+
+def test_full_sync_reports_one_changed_row_per_edit(raw_visits):
+    sheet = FakeSheet(_grid(raw_visits, 300))
+    previous, _ = full_sync(sheet)
+    previous = apply_schema(previous)
+
+    _edit(sheet.values, 10, 'BARRIO')
+    _, report = full_sync(sheet, previous)
+
+    assert report == {'mode': 'full', 'new_rows': 0, 'changed_rows': 1}
+
+
+def test_edit_in_checked_rows_and_append_equals_full_sync(raw_visits):
+    values = _grid(raw_visits, 300)
+    sheet = FakeSheet(values[:251])
+    previous = apply_schema(full_sync(sheet)[0])
+
+    # Una fila editada (dentro de la ventana verificada) y filas nuevas entre dos refrescos
+    _edit(sheet.values, 5, 'Observaciones1')
+    sheet.values.extend(values[251:])
+
+    synced, report = sync_worksheet(sheet, previous, last_full_sync=float('inf'))
+    assert report == {'mode': 'full', 'new_rows': 50, 'changed_rows': 1}
+    pd.testing.assert_frame_equal(_comparable(synced), _comparable(full_sync(sheet)[0]))
+
+
+def test_edit_outside_checked_rows_is_found_by_the_window(raw_visits, monkeypatch):
+    monkeypatch.setattr(sheet_sync, 'CHECK_ROWS', 50)
+    sheet = FakeSheet(_grid(raw_visits, 500))
+    previous = apply_schema(full_sync(sheet)[0])
+    # Fila que no está al final ni en la primera ventana: la quinta ventana la incluye
+    _edit(sheet.values, 211, 'BARRIO')
+
+    check_from, modes = 0, []
+    while 'full' not in modes:
+        df, report = sync_worksheet(sheet, previous, last_full_sync=float('inf'), check_from=check_from)
+        modes.append(report['mode'])
+        previous, check_from = apply_schema(df), report.get('next_check', 0)
+
+    # La ventana recorre la hoja: la edición aparece sin descargar la hoja en cada refresco
+    assert modes == ['delta'] * 4 + ['full']
+    assert report['changed_rows'] == 1
+    pd.testing.assert_frame_equal(_comparable(previous), _comparable(apply_schema(full_sync(sheet)[0])))
+
+
+def test_delta_sync_matches_full_sync_when_only_rows_are_appended(raw_visits):
+    values = _grid(raw_visits, 300)
+    sheet = FakeSheet(values[:201])
+    previous = apply_schema(full_sync(sheet)[0])
+    sheet.values.extend(values[201:])
+
+    delta, report = sync_worksheet(sheet, previous, last_full_sync=float('inf'))
+
+    assert report['mode'] == 'delta'
+    # Con pocas filas sincronizadas se verifican todas
+    assert (report['new_rows'], report['changed_rows'], report['checked_rows']) == (100, 0, 200)
+    pd.testing.assert_frame_equal(_comparable(delta), _comparable(full_sync(sheet)[0]))
+
+
+def test_padded_id_header_does_not_break_delta_sync(raw_visits):
+    values = _grid(raw_visits, 120)
+    sheet = FakeSheet(values[:101])
+    previous = apply_schema(full_sync(sheet)[0])
+    sheet.values[0] = [f' {name} ' if name == ID_COLUMN else name for name in sheet.values[0]]
+    sheet.values.extend(values[101:])
+
+    _, report = sync_worksheet(sheet, previous, last_full_sync=float('inf'))
+
+    assert report['mode'] == 'delta'
+
+
+def test_fetch_sheet_stays_incremental_across_refreshes(raw_visits, monkeypatch):
+    monkeypatch.setattr(sheet_sync, 'CHECK_ROWS', 50)
+    values = _grid(raw_visits, 500)
+    sheet = FakeSheet(values[:201])
+    monkeypatch.setattr(load_data, 'SheetValues', lambda client, spreadsheet_id, title: sheet)
+    monkeypatch.setattr(load_data, 'SYNC_MODE', 'incremental')
+    cache = load_data.DatasetCache()
+
+    def refresh(revision):
+        sheet.requests.clear()
+        df = apply_schema(load_data._fetch_sheet(None, 'libro', cache, revision))
+        cache.store(df, revision, 'Google Sheets')
+        return cache.last_sync['mode']
+
+    assert refresh('sheets:libro:1') == 'full'
+
+    # Filas nuevas en cada refresco: nunca se vuelve a descargar la hoja completa
+    for step, end in enumerate(range(251, 502, 50), start=2):
+        sheet.values.extend(values[end - 50:end])
+        assert refresh(f'sheets:libro:{step}') == 'delta'
+        assert cache.is_synced()
+        assert None not in sheet.requests
+    pd.testing.assert_frame_equal(_comparable(cache.df), _comparable(full_sync(sheet)[0]))
+
+    # Una edición en las últimas filas se detecta en el refresco siguiente
+    _edit(sheet.values, 495, 'Observaciones1')
+    assert refresh('sheets:libro:20') == 'full'
+    assert cache.last_sync['changed_rows'] == 1
+    pd.testing.assert_frame_equal(_comparable(cache.df), _comparable(full_sync(sheet)[0]))
+
+
+def test_snapshot_data_is_compared_with_the_full_sheet(raw_visits, monkeypatch):
+    sheet = FakeSheet(_grid(raw_visits, 200))
+    monkeypatch.setattr(load_data, 'SheetValues', lambda client, spreadsheet_id, title: sheet)
+    monkeypatch.setattr(load_data, 'SYNC_MODE', 'incremental')
+    cache = load_data.DatasetCache()
+    cache.store(apply_schema(full_sync(sheet)[0]), 'sheets:libro:1', 'Google Sheets (instantánea)')
+
+    # Sin sincronización desde el arranque, aunque la revisión coincida
+    assert not cache.is_synced()
+    load_data._fetch_sheet(None, 'libro', cache, 'sheets:libro:1')
+    assert cache.last_sync['mode'] == 'full'
+    assert cache.is_synced()
@@ -0,0 +1,85 @@
+"""Pruebas del índice de palabras de los textos libres (utils.text_index)."""
+
+from collections import Counter
+
+import pandas as pd
+
+from utils.text_index import STOPWORDS, TOKEN_PATTERN, TextIndex, fold_word
+
+COLUMN = 'Observaciones1'
+QUERIES = ['gestora', 'Parroquia', 'huerta "adultos mayores"', '"mayores adultos"', 'niños 2000', 'inexistente']
+
+
+def _direct_frequencies(df, column):
+    """Conteo de referencia: separar cada texto y sumar por palabra normalizada."""
+    stopwords = {fold_word(word) for word in STOPWORDS}
+    counts = Counter()
+    for text in df[column].dropna():
+        for word in TOKEN_PATTERN.findall(str(text).lower()):
+            token = fold_word(word)
+            if token not in stopwords and not word.isdigit() and len(word) >= 2:
+                counts[token] += 1
+    return dict(counts)
+
+
+def _by_token(frequencies):
+    return {fold_word(word): count for word, count in frequencies.items()}
+
+
+def _next_version(df):
+    """Versión siguiente de los datos: textos editados, una fila borrada y filas agregadas."""
+    df = df.copy()
+    df[COLUMN] = df[COLUMN].astype(object)
+    df.loc[df.index[:5], COLUMN] = 'La huerta de la Gestora abastece a los adultos mayores desde 2019.'
+    df.loc[df.index[5], COLUMN] = 'Formación y formacion en nutrición: 3 talleres.'
+    df.loc[df.index[7], COLUMN] = 'FORMACION formación'
+    added = df.iloc[:20].copy()
+    added.index = range(df.index.max() + 1, df.index.max() + 21)
+    added[COLUMN] = 'Nueva sede con huerta comunitaria y comedor escolar.'
+    return pd.concat([df.drop(df.index[6]), added])
+
+
+def test_frequencies_equal_direct_counts(visits):
+    index = TextIndex(visits, 'prueba:1')
+    subset = visits.iloc[::7]
+    for df in [None, subset]:
+        expected = _direct_frequencies(visits if df is None else subset, COLUMN)
+        result = index.frequencies(COLUMN, df, max_words=len(expected) + 1)
+        assert _by_token(result) == expected
+        assert list(result.values()) == sorted(result.values(), reverse=True)
+
+
+def test_frequencies_hide_numbers_and_single_letters(visits):
+    words = TextIndex(visits).frequencies(COLUMN)
+    assert words
+    assert not [word for word in words if word.isdigit() or len(word) < 2]
+
+
+def test_incremental_rebuild_equals_fresh_index(visits):
+    previous = TextIndex(visits, 'prueba:1')
+    df = _next_version(visits)
+    incremental = TextIndex(df, 'prueba:2', previous=previous)
+    fresh = TextIndex(df, 'prueba:2')
+    assert incremental.reused > 0
+
+    subset = df.iloc[::3]
+    for rows in [None, subset]:
+        # Mismas palabras, mismas formas mostradas y mismo orden (incluidos los empates)
+        assert list(incremental.frequencies(COLUMN, rows).items()) == list(fresh.frequencies(COLUMN, rows).items())
+        for query in QUERIES:
+            pd.testing.assert_frame_equal(incremental.search(query, rows), fresh.search(query, rows))
+
+
+def test_search_finds_words_and_phrases(visits):
+    df = _next_version(visits)
+    index = TextIndex(df)
+    added = df.index[-20:]
+
+    # Sin distinguir mayúsculas ni tildes
+    assert set(added) <= set(index.search('COMUNITARIA').index)
+    assert set(df.index[:5]) <= set(index.search('gestora').index)
+    # Las frases deben aparecer en ese orden, aunque tengan palabras vacías
+    assert set(df.index[:5]) <= set(index.search('"huerta de la gestora"').index)
+    assert not set(df.index[:5]) & set(index.search('"gestora de la huerta"').index)
+    # Las visitas filtradas no aparecen en el resultado
+    assert set(index.search('huerta', df.iloc[:3]).index) <= set(df.index[:3])
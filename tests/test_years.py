@@ -0,0 +1,75 @@
+"""Pruebas de los años mencionados en las historias (utils.years)."""
+
+import pandas as pd
+
+from utils.years import (
+    COMEDOR_COLUMN, HISTORY_COLUMN, NAME_COLUMN, YEAR_COLUMN, YEAR_PATTERN,
+    cohort_timeline, extract_years, founding_years,
+)
+
+
+def _direct_years(df):
+    """Años de referencia: la expresión regular fila por fila."""
+    rows = []
+    for label, name, text in zip(df.index, df[NAME_COLUMN], df[HISTORY_COLUMN]):
+        if pd.notna(text):
+            rows += [(label, name, int(year)) for year in YEAR_PATTERN.findall(str(text))]
+    return rows
+
+
+def _as_rows(years):
+    return list(zip(years.index, years[COMEDOR_COLUMN], years[YEAR_COLUMN]))
+
+
+def _with_edge_cases(df):
+    """Agrega textos con años fuera de rango, varios años y valores vacíos."""
+    df = df.copy()
+    df[HISTORY_COLUMN] = df[HISTORY_COLUMN].astype(object)
+    df.loc[df.index[0], HISTORY_COLUMN] = 'Fundado en 1989, reabierto en 1990 y ampliado en 2029 y 2030.'
+    df.loc[df.index[1], HISTORY_COLUMN] = 'Código 20001 y teléfono 2015-2020.'
+    df.loc[df.index[2], HISTORY_COLUMN] = None
+    df.loc[df.index[3], HISTORY_COLUMN] = 'Sin fechas.'
+    return df
+
+
+def test_extract_years_equals_row_by_row(visits):
+    df = _with_edge_cases(visits)
+    years = extract_years(df)
+    assert sorted(_as_rows(years)) == sorted(_direct_years(df))
+    assert [year for _, _, year in _as_rows(years.loc[[df.index[0]]])] == [1990, 2029]
+    assert [year for _, _, year in _as_rows(years.loc[[df.index[1]]])] == [2015, 2020]
+    assert not years.index.isin(df.index[2:4]).any()
+
+
+def test_extract_years_of_subset_equals_filtered_table(visits):
+    # get_year_table() filtra la tabla completa por las filas del subconjunto
+    years = extract_years(visits)
+    subset = visits.iloc[::5]
+    expected = years[years.index.isin(subset.index)]
+    pd.testing.assert_frame_equal(extract_years(subset), expected)
+
+
+def test_extract_years_without_column(visits):
+    years = extract_years(visits.drop(columns=[HISTORY_COLUMN]))
+    assert years.empty
+    assert list(years.columns) == [COMEDOR_COLUMN, YEAR_COLUMN]
+
+
+def test_founding_years_and_cohorts(visits):
+    years = extract_years(visits)
+    founded = founding_years(years)
+
+    expected = {}
+    for _, name, year in _direct_years(visits):
+        expected[name] = min(year, expected.get(name, year))
+    assert dict(zip(founded['Comedor'], founded['Año de fundación'])) == expected
+    assert founded['Año de fundación'].is_monotonic_increasing
+
+    cohorts = cohort_timeline(founded)
+    # Todos los años entre el primero y el último, y el acumulado llega al total
+    assert list(cohorts['Año']) == list(range(min(expected.values()), max(expected.values()) + 1))
+    assert cohorts['Comedores'].sum() == len(founded)
+    assert cohorts['Acumulado'].iloc[-1] == len(founded)
+    assert (cohorts['Acumulado'].diff().fillna(cohorts['Comedores']) == cohorts['Comedores']).all()
+
+    assert cohort_timeline(founding_years(years.iloc[:0])).empty
@@ -0,0 +1,271 @@
+"""
+Módulo con las tablas largas de las preguntas de selección múltiple.
+
+Las respuestas de selección múltiple llegan como un texto con las opciones
+separadas por ';', ',' o espacios. Al cargar los datos se separan una sola vez,
+por columnas, en tablas (ID, VALOR) con una fila por opción elegida, de modo que
+las páginas cuentan opciones directamente sin volver a separar los textos.
+
+Cada tabla se describe con una regla (AnswerRule) en ANSWER_RULES: la columna
+de origen, el separador, si se quitan espacios, si se normalizan mayúsculas y
+tildes, los alias de las opciones y, opcionalmente, las categorías por
+palabras clave en las que se agrupan las opciones. Las reglas se aplican a los
+textos distintos de la columna (no a cada visita) y el resultado se reparte a
+las filas. Las tablas se cuentan en el cubo de conteos (ver utils.cube), por lo
+que las páginas obtienen sus conteos con get_counts(df, tabla).
+"""
+
+import re
+import numpy as np
+import pandas as pd
+
+ID_COLUMN = 'ID'
+VALUE_COLUMN = 'VALOR'
+
+# Vocales con tilde, diéresis o acento grave -> vocal sin marca (la Ñ se conserva)
+FOLD_TABLE = str.maketrans('ÁÉÍÓÚÀÈÌÒÙÄËÏÖÜÂÊÎÔÛ', 'AEIOUAEIOUAEIOUAEIOU')
+
+
+def fold_answer(series):
+    """
+    Normaliza opciones para compararlas: mayúsculas y sin tildes.
+
+    Args:
+        series (pandas.Series): Opciones (texto).
+
+    Returns:
+        pandas.Series: Opciones normalizadas.
+    """
+    return series.astype('string').str.upper().str.translate(FOLD_TABLE)
+
+
+class AnswerRule:
+    """
+    Regla para separar y normalizar las respuestas de una columna.
+
+    Args:
+        column (str): Columna de origen en los datos de visitas.
+        separator (str, optional): Expresión regular del separador de opciones;
+            sin separador cada respuesta es una sola opción.
+        strip (bool): Quitar los espacios alrededor de cada opción.
+        fold (bool): Guardar las opciones en mayúsculas y sin tildes, de modo
+            que 'Alcaldía' y 'ALCALDIA' cuenten como la misma.
+        aliases (dict, optional): Opción -> nombre con el que se cuenta. Las
+            opciones se comparan en mayúsculas y sin tildes.
+        categories (list, optional): Pares (categoría, palabras clave) en orden
+            de prioridad. Cada opción se reemplaza por la categoría cuya
+            palabra clave contenga (sin distinguir mayúsculas ni tildes); las
+            opciones sin categoría se descartan, salvo que haya `default`.
+        match (str): 'first' para quedarse con la primera categoría que
+            coincide o 'all' para contar todas las que coinciden.
+        default (str, optional): Categoría de las opciones que no coinciden
+            con ninguna palabra clave y de las respuestas en blanco o vacías.
+    """
+
+    def __init__(self, column, separator=None, strip=True, fold=False, aliases=None,
+                 categories=None, match='first', default=None):
+        if match not in ('first', 'all'):
+            raise ValueError(f"match debe ser 'first' o 'all', no {match!r}")
+        self.column = column
+        self.separator = separator
+        self.strip = strip
+        self.fold = fold
+        self.aliases = aliases or {}
+        self.categories = categories or []
+        self.match = match
+        self.default = default
+
+    def parse(self, values):
+        """
+        Aplica la regla a una serie de respuestas distintas.
+
+        Args:
+            values (pandas.Series): Respuestas (texto), una por posición.
+
+        Returns:
+            pandas.Series: Opciones resultantes; el índice es la posición de la
+                respuesta de la que salen, en orden.
+        """
+        values = values.astype('string')
+        # Las respuestas en blanco cuentan en la categoría por defecto, si la hay
+        blank = None
+        if self.categories and self.default is not None:
+            blank = pd.Series(self.default, index=values.index[values.fillna('').str.strip() == ''], dtype=object)
+        if self.separator is not None:
+            values = values.str.split(self.separator, regex=True).explode()
+        if self.strip:
+            values = values.str.strip()
+        values = values[values.notna() & (values != '')]
+        if values.empty:
+            return values if blank is None else blank
+
+        folded = fold_answer(values)
+        if self.fold:
+            values = folded
+        if self.aliases:
+            aliases = {key.upper().translate(FOLD_TABLE): value for key, value in self.aliases.items()}
+            values = folded.map(aliases).fillna(values)
+        if not self.categories:
+            return values
+
+        conditions = [
+            folded.str.contains('|'.join(re.escape(word.upper().translate(FOLD_TABLE)) for word in keywords),
+                                regex=True).fillna(False).to_numpy(dtype=bool)
+            for _, keywords in self.categories
+        ]
+        labels = [label for label, _ in self.categories]
+        if self.match == 'first':
+            categorized = pd.Series(np.select(conditions, labels, default=self.default or ''), index=values.index)
+        else:
+            # Una fila por cada categoría que coincide, en el orden de las respuestas
+            matched = np.column_stack(conditions)
+            if self.default is not None:
+                matched = np.column_stack([matched, ~matched.any(axis=1)])
+                labels = labels + [self.default]
+            answer, category = np.nonzero(matched)
+            categorized = pd.Series(np.asarray(labels, dtype=object)[category], index=values.index[answer])
+        categorized = categorized[categorized != '']
+        if blank is None or blank.empty:
+            return categorized
+        return pd.concat([categorized, blank]).sort_index(kind='stable')
+
+
+# Opciones de las respuestas abiertas sobre redes sociales
+SOCIAL_NETWORK_ALIASES = {
+    'FACEBOOK': 'Facebook',
+    'FACE': 'Facebook',
+    'WHATSAPP': 'WhatsApp',
+    'WHATSAP': 'WhatsApp',
+    'WSP': 'WhatsApp',
+    'INSTAGRAM': 'Instagram',
+    'TIKTOK': 'TikTok',
+    'TIK TOK': 'TikTok',
+    'YOUTUBE': 'YouTube',
+}
+
+# Categorías de las necesidades para la transformación: (nombre, palabras clave)
+NEEDS_CATEGORIES = [
+    ("Gestión de alianzas estratégicas", ["ALIANZAS", "ARTICULACION"]),
+    ("Área de financiamiento", ["FINANCIAMIENTO", "AREA DE"]),
+    ("Capacitación y formación integral", ["CAPACITACION", "FORMACION"]),
+    ("Visibilización y reconocimiento", ["VISIBILIZACION", "RECONOCIMIENTO"]),
+    ("Procesos de planificación y evaluación", ["PLANIFICACION", "EVALUACION", "SEGUIMIENTO"]),
+    ("Otras necesidades", ["OTRA"]),
+]
+
+# Tablas largas que se construyen al cargar los datos: nombre -> regla. Las
+# tablas con el nombre de una columna guardan sus opciones tal como vienen; las
+# demás agrupan las opciones en categorías
+ANSWER_RULES = {
+    'USO_DE_TIC': AnswerRule('USO_DE_TIC', ';'),
+    'QUE_REDES': AnswerRule('QUE_REDES', ',', aliases=SOCIAL_NETWORK_ALIASES),
+    'PAQUETES_OFFICE': AnswerRule('PAQUETES_OFFICE', ','),
+    'QUE_ESTRATEGIAS_USA': AnswerRule('QUE_ESTRATEGIAS_USA', ';'),
+    'FINANCIACION_ACTIVIDADES': AnswerRule('FINANCIACION_ACTIVIDADES', ','),
+    'GRUPOS_EN_SITUACION_DE_VULNERABILIDAD': AnswerRule('GRUPOS_EN_SITUACION_DE_VULNERABILIDAD', r',|\s+'),
+    'NECESIDADES_QUE_SE_APOYARAN': AnswerRule('NECESIDADES_QUE_SE_APOYARAN', r',|\s+'),
+    'RECURSO_HUMANO_CON_EL_QUE_CUENTA': AnswerRule('RECURSO_HUMANO_CON_EL_QUE_CUENTA', r',|\s+'),
+    'NECESIDADES': AnswerRule('NECESIDADES_QUE_SE_APOYARAN', r',|\s+', categories=NEEDS_CATEGORIES),
+    'GRUPOS_VULNERABLES': AnswerRule('GRUPOS_EN_SITUACION_DE_VULNERABILIDAD', r',|\s+', categories=[
+        ("Consumidores SPA", ["SPA"]),
+        ("Migrantes", ["MIGRANTES"]),
+        ("Trabajadores informales", ["INFORMAL"]),
+        ("Habitantes de calle", ["CALLE"]),
+        ("Trabajadores formales", ["FORMAL"]),
+        ("Liderazgo social", ["LIDERAZGO", "JAC", "JAL"]),
+        ("Recicladores", ["RECICLADORES", "RECUPERADORES"]),
+        ("Jefes de hogar", ["HOGAR", "JEFE"]),
+        ("Víctimas del conflicto", ["VICTIMAS", "CONFLICTO"]),
+        ("Personas con discapacidad", ["DISCAPACIDAD"]),
+        ("Otros grupos vulnerables", ["OTRO"]),
+    ]),
+    'RECURSOS_HUMANOS': AnswerRule('RECURSO_HUMANO_CON_EL_QUE_CUENTA', r',|\s+', categories=[
+        ("Voluntariado", ["VOLUNTARIADO"]),
+        ("Red social (amigos, vecinos)", ["SOCIAL", "AMIGOS", "VECINOS"]),
+        ("Red familiar", ["FAMILIAR"]),
+        ("Colaboradores propios", ["COLABORADORES", "COMEDOR", "FUNDACION"]),
+    ]),
+    'GRUPOS_ETNICOS': AnswerRule('POBLACION_PRINCIPAL_COMEDOR', categories=[
+        ("Afrodescendiente", ["AFRO", "NEGRO", "MULATO"]),
+        ("Mestizo", ["MESTIZA"]),
+        ("Indígena", ["INDIGENA"]),
+        ("Sin grupo étnico específico", ["NINGUN"]),
+        ("Otro grupo étnico", ["OTRO"]),
+    ], default="No especificado"),
+    'ETAPAS_VITALES': AnswerRule('ETAPA_VITAL', categories=[
+        ("Infancia (6-11 años)", ["INFANCIA"]),
+        ("Adolescentes (12-18 años)", ["ADOLESCENTES"]),
+        ("Jóvenes (19-28 años)", ["JOVENES"]),
+        ("Adultos (29-59 años)", ["ADULTOS/AS ("]),
+        ("Personas mayores (60+ años)", ["MAYORES"]),
+    ], match='all'),
+}
+
+
+def _empty_table():
+    return pd.DataFrame({ID_COLUMN: pd.Series(dtype=object), VALUE_COLUMN: pd.Series(dtype=object)})
+
+
+def explode_answers(df, name, rule=None):
+    """
+    Separa las respuestas de una columna en una tabla larga.
+
+    La regla se aplica una sola vez a cada respuesta distinta y las opciones
+    resultantes se reparten a las filas que tienen esa respuesta.
+
+    Args:
+        df (pandas.DataFrame): Datos de visitas.
+        name (str): Nombre de la tabla en ANSWER_RULES.
+        rule (AnswerRule, optional): Regla a aplicar. Por defecto se usa la de
+            ANSWER_RULES.
+
+    Returns:
+        pandas.DataFrame: Columnas ID y VALOR, una fila por opción elegida. El
+            índice es el de la fila de origen en df.
+    """
+    if rule is None:
+        rule = ANSWER_RULES[name]
+    if rule.column not in df.columns:
+        return _empty_table()
+
+    series = df[rule.column]
+    # Solo se separan respuestas de texto, igual que en las páginas
+    if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
+            or isinstance(series.dtype, pd.CategoricalDtype)):
+        return _empty_table()
+
+    # Con categoría por defecto también se cuentan las celdas vacías (NaN)
+    codes, answers = pd.factorize(series, use_na_sentinel=rule.default is None or not rule.categories)
+    options = rule.parse(pd.Series(np.asarray(answers, dtype=object)))
+    if options.empty:
+        return _empty_table()
+
+    # Opciones de cada respuesta distinta, en orden
+    option_answers = options.index.to_numpy()
+    counts = np.bincount(option_answers, minlength=len(answers))
+    starts = np.cumsum(counts) - counts
+
+    # Repartir las opciones de cada respuesta a sus filas
+    rows = np.flatnonzero(codes >= 0)
+    row_counts = counts[codes[rows]]
+    positions = np.repeat(starts[codes[rows]] - np.cumsum(row_counts) + row_counts, row_counts) + np.arange(row_counts.sum())
+    rows = np.repeat(rows, row_counts)
+
+    ids = df[ID_COLUMN] if ID_COLUMN in df.columns else pd.Series(df.index, index=df.index)
+    return pd.DataFrame({
+        ID_COLUMN: ids.to_numpy()[rows],
+        VALUE_COLUMN: options.astype(object).to_numpy()[positions],
+    }, index=df.index[rows])
+
+
+def build_answer_tables(df):
+    """
+    Construye las tablas largas de todas las reglas de ANSWER_RULES.
+
+    Args:
+        df (pandas.DataFrame): Datos de visitas.
+
+    Returns:
+        dict: Tabla (ver explode_answers) por cada regla cuya columna está en df.
+    """
+    return {name: explode_answers(df, name, rule) for name, rule in ANSWER_RULES.items() if rule.column in df.columns}
@@ -0,0 +1,363 @@
+"""
+Módulo con la API JSON de solo lectura sobre las métricas del dashboard.
+
+Publica por HTTP las mismas cifras que muestran las páginas (ver utils.metrics),
+calculadas con la misma caché de datos y el mismo cubo de conteos que usa
+Streamlit, para que otros sistemas no tengan que leer la interfaz.
+
+Cada respuesta lleva un ETag que depende de la revisión de los datos y de la
+consulta; si el cliente lo envía en If-None-Match y los datos no cambiaron, se
+responde 304 sin calcular nada. Las respuestas calculadas se guardan en memoria
+hasta que cambia la revisión de los datos.
+
+Rutas (todas aceptan los filtros globales como parámetros, por ejemplo
+`?comuna=15&comuna=16&profesional=ANA`):
+
+    /api/estado                 Revisión, fuente y número de visitas
+    /api/interes                Interés en convertirse en CEDECO
+    /api/necesidades            Ranking de necesidades para la transformación
+    /api/evaluacion             Matriz de evaluación (`desde` y `limite` paginan los comedores)
+    /api/financiacion           Fuentes de financiación
+    /api/conteos/<COLUMNA>      Conteo de respuestas de una pregunta del cubo de
+                                conteos o de una tabla de utils.answers.ANSWER_RULES
+
+Uso desde la línea de comandos:
+
+    python -m utils.api --puerto 8502
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+import numpy as np
+import pandas as pd
+from utils.load_data import load_data, get_filter_index, get_cache_stats, get_counts
+from utils.filters import FILTER_COLUMNS, apply_filters
+from utils.cube import REVISION_ATTR, question_columns
+from utils.answers import ANSWER_RULES
+from utils.refresher import start_refresher
+from utils.metrics import interest_summary, needs_ranking, funding_sources, create_evaluation_matrix, potential_counts
+
+API_PREFIX = '/api'
+DEFAULT_HOST = os.environ.get('CEDECO_API_HOST', '127.0.0.1')
+DEFAULT_PORT = int(os.environ.get('CEDECO_API_PORT', '8502'))
+
+# Número máximo de respuestas guardadas en memoria
+RESPONSE_CACHE_SIZE = 512
+
+# Comedores por página en /api/evaluacion
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Parámetros de filtro: nombre en minúsculas de la barra de filtros -> columna
+FILTER_PARAMS = {label.lower(): column for column, label in FILTER_COLUMNS.items()}
+
+logger = logging.getLogger(__name__)
+
+
+class ApiError(Exception):
+    """Error de la consulta que se devuelve al cliente con su código HTTP."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ResponseCache:
+    """
+    Respuestas JSON ya calculadas, de la revisión actual de los datos.
+
+    Al llegar una consulta de otra revisión se descartan todas las respuestas
+    guardadas; dentro de una revisión se descartan las menos usadas cuando se
+    supera `max_size`.
+
+    Args:
+        max_size (int): Número máximo de respuestas guardadas.
+    """
+
+    def __init__(self, max_size=RESPONSE_CACHE_SIZE):
+        self.lock = threading.Lock()
+        self.max_size = max_size
+        self.revision = None
+        self.responses = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, revision, key):
+        """Devuelve el cuerpo guardado para la consulta o None."""
+        with self.lock:
+            if revision != self.revision or key not in self.responses:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.responses.move_to_end(key)
+            return self.responses[key]
+
+    def put(self, revision, key, body):
+        """Guarda el cuerpo de una consulta."""
+        with self.lock:
+            if revision != self.revision:
+                self.revision = revision
+                self.responses.clear()
+            self.responses[key] = body
+            self.responses.move_to_end(key)
+            while len(self.responses) > self.max_size:
+                self.responses.popitem(last=False)
+
+
+_response_cache = ResponseCache()
+
+
+def _records(frame):
+    """Convierte un DataFrame en una lista de diccionarios serializable a JSON."""
+    if frame is None:
+        return None
+    return frame.astype(object).where(frame.notna(), None).to_dict('records')
+
+
+def _json_default(value):
+    """Convierte los tipos de numpy y pandas que json no conoce."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (pd.Timestamp, pd.Timedelta)):
+        return value.isoformat()
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+
+def _int_param(params, name, default, maximum=None):
+    """Lee un parámetro entero no negativo de la consulta."""
+    values = params.get(name)
+    if not values:
+        return default
+    try:
+        value = int(values[-1])
+    except ValueError:
+        raise ApiError(400, f"El parámetro '{name}' debe ser un número entero")
+    if value < 0:
+        raise ApiError(400, f"El parámetro '{name}' no puede ser negativo")
+    return min(value, maximum) if maximum is not None else value
+
+
+def _filter(df, params):
+    """Aplica los filtros globales pedidos en la consulta."""
+    index = get_filter_index(df)
+    selections = {}
+    for param, column in FILTER_PARAMS.items():
+        requested = params.get(param)
+        if not requested:
+            continue
+        # Los valores llegan como texto; se comparan con los valores del índice
+        available = {str(value): value for value in index.values(column)}
+        selections[column] = [available[value] for value in requested if value in available]
+        if not selections[column]:
+            # Ningún valor pedido existe: el resultado es vacío
+            return df.iloc[0:0]
+    return apply_filters(df, index, selections)
+
+
+def _estado(df, params):
+    stats = get_cache_stats()
+    return {
+        'revision': df.attrs.get(REVISION_ATTR),
+        'fuente': stats['source'],
+        'actualizado': stats['fetched_at'],
+        'visitas': len(df),
+        'respuestas_en_cache': {'aciertos': _response_cache.hits, 'fallos': _response_cache.misses},
+    }
+
+
+def _interes(df, params):
+    summary = interest_summary(df)
+    if summary is None:
+        return None
+    return {
+        'total': summary['total'],
+        'interesados': summary['interesados'],
+        'porcentaje': summary['porcentaje'],
+        'conteos': _records(summary['conteos']),
+    }
+
+
+def _necesidades(df, params):
+    return _records(needs_ranking(df))
+
+
+def _financiacion(df, params):
+    return _records(funding_sources(df))
+
+
+def _evaluacion(df, params):
+    start = _int_param(params, 'desde', 0)
+    limit = _int_param(params, 'limite', DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+    df_eval = create_evaluation_matrix(df)
+    if df_eval is None:
+        return {'niveles': [], 'total': 0, 'desde': start, 'comedores': []}
+    return {
+        'niveles': _records(potential_counts(df_eval)),
+        'total': len(df_eval),
+        'desde': start,
+        'comedores': _records(df_eval.iloc[start:start + limit]),
+    }
+
+
+def _countable_columns(df):
+    """Preguntas que se pueden contar: las del cubo y las tablas de ANSWER_RULES."""
+    columns = set(question_columns(df))
+    columns.update(name for name, rule in ANSWER_RULES.items() if rule.column in df.columns)
+    return columns
+
+
+def _conteos(df, params, column):
+    # Solo preguntas del formulario: las demás columnas (teléfonos, direcciones,
+    # nombres) no se publican
+    if column not in _countable_columns(df):
+        raise ApiError(404, f"No existe la pregunta '{column}'")
+    return _records(get_counts(df, column))
+
+
+ROUTES = {
+    'estado': _estado,
+    'interes': _interes,
+    'necesidades': _necesidades,
+    'evaluacion': _evaluacion,
+    'financiacion': _financiacion,
+}
+
+
+def _compute(df, path, params):
+    """
+    Calcula la respuesta de una ruta.
+
+    Args:
+        df (pandas.DataFrame): Datos entregados por load_data().
+        path (str): Ruta sin el prefijo /api, por ejemplo 'interes'.
+        params (dict): Parámetros de la consulta (listas de valores).
+
+    Returns:
+        object: Datos de la respuesta, serializables a JSON.
+    """
+    df = _filter(df, params)
+    if path.startswith('conteos/'):
+        return _conteos(df, params, path[len('conteos/'):])
+    if path not in ROUTES:
+        raise ApiError(404, f"Ruta desconocida: {API_PREFIX}/{path}")
+    result = ROUTES[path](df, params)
+    if result is None:
+        raise ApiError(404, "Los datos no tienen las columnas de esta métrica")
+    return result
+
+
+def _etag(revision, key):
+    """ETag de una consulta: cambia cuando cambia la revisión de los datos."""
+    digest = hashlib.sha1(f"{revision}|{key}".encode('utf-8')).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """Atiende las peticiones GET de la API."""
+
+    server_version = 'CEDECO-API'
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        # Las columnas con tildes o signos llegan codificadas (%C3%A1...)
+        url_path = unquote(url.path)
+        if not url_path.startswith(API_PREFIX + '/'):
+            self._send_json(404, {'error': 'Ruta desconocida'})
+            return
+
+        path = url_path[len(API_PREFIX) + 1:].strip('/')
+        params = parse_qs(url.query)
+        key = f"{path}?{sorted((name, sorted(values)) for name, values in params.items())}"
+        # La revisión se toma del mismo DataFrame con el que se calcula la respuesta
+        df = load_data()
+        revision = df.attrs.get(REVISION_ATTR)
+        etag = _etag(revision, key)
+
+        # El cliente ya tiene la respuesta de esta revisión
+        if revision is not None and etag in self.headers.get('If-None-Match', ''):
+            self._send(304, None, etag)
+            return
+
+        body = _response_cache.get(revision, key) if revision is not None else None
+        if body is None:
+            try:
+                data = _compute(df, path, params)
+            except ApiError as e:
+                self._send_json(e.status, {'error': str(e)})
+                return
+            except Exception as e:
+                logger.exception("Error en %s", self.path)
+                self._send_json(500, {'error': 'Error interno'})
+                return
+            body = json.dumps(data, ensure_ascii=False, default=_json_default).encode('utf-8')
+            if revision is not None:
+                _response_cache.put(revision, key, body)
+
+        self._send(200, body, etag)
+
+    def _send_json(self, status, data):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self._send(status, body)
+
+    def _send(self, status, body, etag=None):
+        self.send_response(status)
+        if etag:
+            self.send_header('ETag', etag)
+            # Los clientes pueden guardar la respuesta, pero deben revalidarla
+            self.send_header('Cache-Control', 'no-cache')
+        if body is not None:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body is not None:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.info("%s - %s", self.address_string(), format % args)
+
+
+def create_server(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """
+    Crea el servidor de la API e inicia el refresco de datos en segundo plano.
+
+    Args:
+        host (str): Dirección en la que escuchar.
+        port (int): Puerto en el que escuchar.
+
+    Returns:
+        ThreadingHTTPServer: Servidor listo para serve_forever().
+    """
+    # Cargar la instantánea antes de atender peticiones; luego refrescar en segundo plano
+    load_data()
+    start_refresher()
+    server = ThreadingHTTPServer((host, port), ApiHandler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API JSON de solo lectura del dashboard CEDECO.")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="Dirección en la que escuchar.")
+    parser.add_argument('--puerto', type=int, default=DEFAULT_PORT, help="Puerto en el que escuchar.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    server = create_server(args.host, args.puerto)
+    logger.info("API escuchando en http://%s:%s%s/", args.host, args.puerto, API_PREFIX)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+"""
+Módulo para medir el tiempo de cada página del dashboard con distintos volúmenes.
+
+Ejecuta main.py sin navegador mediante AppTest de Streamlit, con datos
+sintéticos (ver utils.synthetic) de tamaño creciente, y para cada sección del
+menú registra el tiempo de ejecución, la memoria máxima y la cantidad
+y el tamaño de los elementos emitidos. Los resultados se guardan en un archivo
+JSON para comparar versiones.
+
+Cada tamaño se mide en un proceso aparte, de modo que la caché de datos y la
+memoria de un tamaño no afectan al siguiente.
+
+Uso desde la línea de comandos:
+
+    python -m utils.benchmark --tamanos 100 1000 10000 --salida benchmark.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_SCRIPT = os.path.join(ROOT_DIR, 'main.py')
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+DEFAULT_OUTPUT = 'benchmark.json'
+
+# Tiempo máximo (segundos) de cada ejecución del script
+RUN_TIMEOUT = 600
+
+
+def _tree_size(node):
+    """Devuelve (cantidad de elementos, bytes serializados) de un nodo de AppTest y sus hijos."""
+    count = 0
+    size = 0
+    proto = getattr(node, 'proto', None)
+    if proto is not None and hasattr(proto, 'ByteSize'):
+        count += 1
+        size += proto.ByteSize()
+    for child in getattr(node, 'children', {}).values():
+        child_count, child_size = _tree_size(child)
+        count += child_count
+        size += child_size
+    return count, size
+
+
+def _sections(app):
+    """Devuelve las secciones del menú, tanto en modo fragmento como en la barra lateral."""
+    if len(app.sidebar.radio):
+        return list(app.sidebar.radio[0].options)
+    return [option.content for option in app.button_group[0].options]
+
+
+def _select_section(app, page):
+    """Elige una sección en el menú y ejecuta el script."""
+    if len(app.sidebar.radio):
+        app.sidebar.radio[0].set_value(page)
+    else:
+        app.button_group[0].set_value([page])
+    app.run(timeout=RUN_TIMEOUT)
+
+
+def _run_page(app, page):
+    """
+    Ejecuta una sección y mide tiempo, memoria y elementos emitidos.
+
+    La sección se ejecuta dos veces: la primera solo mide el tiempo y la
+    segunda mide la memoria con tracemalloc, que haría más lenta la primera.
+    """
+    start = time.perf_counter()
+    _select_section(app, page)
+    seconds = time.perf_counter() - start
+    elements, payload = _tree_size(app._tree)
+    errors = [str(exception.value) for exception in app.exception]
+
+    tracemalloc.start()
+    try:
+        _select_section(app, page)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'page': page,
+        'seconds': round(seconds, 4),
+        'peak_memory_mb': round(peak / 2 ** 20, 2),
+        'elements': elements,
+        'payload_bytes': payload,
+        'errors': errors,
+    }
+
+
+def run_size(size, seed=0):
+    """
+    Mide todas las secciones con un conjunto sintético de `size` visitas.
+
+    Debe ejecutarse en un proceso propio, con el directorio de trabajo vacío y
+    CEDECO_SNAPSHOT_DIR apuntando a un directorio temporal (ver benchmark()),
+    para que el dashboard lea los datos sintéticos de la instantánea y no
+    encuentre credenciales ni archivos Excel.
+
+    Args:
+        size (int): Número de visitas.
+        seed (int): Semilla del generador de datos.
+
+    Returns:
+        list: Un diccionario de resultados por sección.
+    """
+    from streamlit.testing.v1 import AppTest
+    from utils.synthetic import generate_visits
+    from utils.ingest import coerce_types
+    from utils.schema import apply_schema
+    from utils.snapshot import write_snapshot
+
+    df = apply_schema(coerce_types(generate_visits(size, seed=seed)))
+    write_snapshot(df, f'benchmark:{size}:{seed}', 'Datos sintéticos')
+    del df
+
+    app = AppTest.from_file(MAIN_SCRIPT, default_timeout=RUN_TIMEOUT)
+
+    # Primera ejecución: arranque en frío y página de inicio
+    start = time.perf_counter()
+    app.run()
+    cold_start = time.perf_counter() - start
+    elements, payload = _tree_size(app._tree)
+
+    results = [{
+        'page': 'Arranque en frío',
+        'seconds': round(cold_start, 4),
+        'peak_memory_mb': None,
+        'elements': elements,
+        'payload_bytes': payload,
+        'errors': [str(exception.value) for exception in app.exception],
+    }]
+    for page in _sections(app):
+        results.append(_run_page(app, page))
+
+    for result in results:
+        result['size'] = size
+    return results
+
+
+def _git_commit():
+    """Devuelve el commit actual del repositorio o None si no se puede obtener."""
+    try:
+        output = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        )
+        return output.stdout.strip()
+    except Exception as e:
+        return None
+
+
+def benchmark(sizes=DEFAULT_SIZES, seed=0):
+    """
+    Mide todas las secciones para cada tamaño, cada uno en un proceso aparte.
+
+    Args:
+        sizes (list): Números de visitas a medir.
+        seed (int): Semilla del generador de datos.
+
+    Returns:
+        dict: Metadatos de la ejecución y la lista de resultados.
+    """
+    import pandas as pd
+    import streamlit as st
+
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as workdir:
+            env = dict(os.environ)
+            env['CEDECO_SNAPSHOT_DIR'] = os.path.join(workdir, 'snapshot')
+            env['PYTHONPATH'] = os.pathsep.join(filter(None, [ROOT_DIR, env.get('PYTHONPATH')]))
+            output = subprocess.run(
+                [sys.executable, '-m', 'utils.benchmark', '--tamano-interno', str(size), '--semilla', str(seed)],
+                cwd=workdir, env=env, capture_output=True, text=True,
+            )
+            if output.returncode != 0:
+                raise RuntimeError(f"Falló la medición con {size} visitas:\n{output.stderr}")
+            size_results = json.loads(output.stdout.strip().splitlines()[-1])
+        results.extend(size_results)
+        for result in size_results:
+            print(f"{size:>8} visitas · {result['page']:<40} {result['seconds']:>8.2f} s", file=sys.stderr)
+
+    return {
+        'commit': _git_commit(),
+        'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'streamlit': st.__version__,
+        'seed': seed,
+        'navigation': os.environ.get('CEDECO_NAVIGATION', 'fragment'),
+        'results': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide el tiempo de cada página del dashboard CEDECO.")
+    parser.add_argument('--tamanos', type=int, nargs='+', default=DEFAULT_SIZES, help="Números de visitas a medir.")
+    parser.add_argument('--salida', default=DEFAULT_OUTPUT, help="Archivo JSON de resultados.")
+    parser.add_argument('--semilla', type=int, default=0, help="Semilla del generador de datos.")
+    parser.add_argument('--tamano-interno', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.tamano_interno is not None:
+        # Proceso hijo: medir un tamaño y devolver los resultados por la salida estándar
+        print(json.dumps(run_size(args.tamano_interno, seed=args.semilla)))
+        return
+
+    report = benchmark(args.tamanos, seed=args.semilla)
+    with open(args.salida, 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    print(f"Resultados escritos en {args.salida}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+"""
+Módulo con el cubo de conteos precalculados de las preguntas del formulario.
+
+Para cada pregunta categórica (SI/NO, categorías, frecuencias) y de selección
+múltiple se guardan los conteos agrupados por las dimensiones principales
+(comuna, nodo, barrio, profesional y mes de la visita). El cubo se calcula una
+vez por versión de los datos; las páginas consultan los conteos, con o sin
+filtros, sumando filas del cubo en lugar de recorrer todas las visitas, de
+modo que el tiempo de las páginas no crece con el número de visitas.
+"""
+
+import numpy as np
+import pandas as pd
+from utils.schema import YES_NO_COLUMNS, CATEGORY_COLUMNS, FREQUENCY_SUFFIX
+from utils.answers import VALUE_COLUMN
+
+DATE_COLUMN = 'FECHA'
+MONTH_DIMENSION = 'MES'
+
+# Dimensiones del cubo; incluyen las columnas de los filtros globales
+DIMENSIONS = ['COMUNA', 'NODO', 'BARRIO', 'PREFESIONAL_REALIZA_VISITA', MONTH_DIMENSION]
+
+COUNT_COLUMN = 'Cantidad'
+
+# Atributo del DataFrame con la revisión de los datos y con los filtros aplicados
+REVISION_ATTR = 'cedeco_revision'
+FILTERS_ATTR = 'cedeco_filters'
+
+
+def question_columns(df):
+    """Devuelve las columnas categóricas del DataFrame que se materializan en el cubo."""
+    return [
+        col for col in df.columns
+        if col in YES_NO_COLUMNS or col in CATEGORY_COLUMNS or FREQUENCY_SUFFIX in col
+    ]
+
+
+def _codes(series):
+    """Devuelve (códigos enteros, categorías) de una columna; los nulos tienen código -1."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy().astype(np.int64), series.cat.categories
+    codes, categories = pd.factorize(series, sort=True)
+    return codes.astype(np.int64), pd.Index(categories)
+
+
+def _month_codes(dates):
+    """Devuelve (códigos enteros, meses 'AAAA-MM') de una columna de fechas."""
+    months = (dates.dt.year * 12 + dates.dt.month - 1).to_numpy()
+    valid = ~np.isnan(months)
+    codes = np.full(len(months), -1, dtype=np.int64)
+    values, codes[valid] = np.unique(months[valid].astype(np.int64), return_inverse=True)
+    categories = pd.Index([f"{value // 12}-{value % 12 + 1:02d}" for value in values])
+    return codes, categories
+
+
+def _dimension_codes(df):
+    """Devuelve, por cada dimensión presente, los códigos de cada visita y sus categorías."""
+    dims = {}
+    for dim in DIMENSIONS:
+        if dim == MONTH_DIMENSION:
+            if DATE_COLUMN in df.columns and pd.api.types.is_datetime64_any_dtype(df[DATE_COLUMN]):
+                dims[dim] = _month_codes(df[DATE_COLUMN])
+        elif dim in df.columns:
+            dims[dim] = _codes(df[dim])
+    return dims
+
+
+class _QuestionCounts:
+    """Conteos dispersos (celda, respuesta, cantidad) de una pregunta."""
+
+    def __init__(self, cells, codes, categories):
+        valid = codes >= 0
+        cells = cells[valid]
+        codes = codes[valid]
+        width = max(len(categories), 1)
+        combined, counts = np.unique(cells * width + codes, return_counts=True)
+        self.cells = combined // width
+        self.codes = combined % width
+        self.counts = counts
+        self.categories = categories
+        # Conteos sin filtros
+        self.totals = np.bincount(codes, minlength=len(categories))
+
+
+class AggregateCube:
+    """
+    Conteos por pregunta y dimensiones de una versión de los datos.
+
+    Las visitas se agrupan en celdas, una por combinación de valores de las
+    dimensiones; el número de celdas depende de la cantidad de comunas,
+    barrios, profesionales y meses, no del número de visitas. Por cada pregunta
+    se guardan los conteos de cada respuesta en cada celda.
+
+    Args:
+        df (pandas.DataFrame): Datos de visitas con el esquema aplicado.
+        answers (dict): Tablas largas de selección múltiple (ver utils.answers).
+        revision (str): Revisión de los datos.
+    """
+
+    def __init__(self, df, answers, revision):
+        self.revision = revision
+        self.rows = len(df)
+
+        # Celda de cada visita, a partir de la combinación de códigos de las dimensiones
+        dims = _dimension_codes(df)
+        key = np.zeros(len(df), dtype=np.int64)
+        for codes, categories in dims.values():
+            key = key * (len(categories) + 1) + (codes + 1)
+        _, first_rows, row_cells = np.unique(key, return_index=True, return_inverse=True)
+        row_cells = row_cells.reshape(-1)
+
+        self.dimensions = {dim: categories for dim, (_, categories) in dims.items()}
+        self.cell_codes = {dim: codes[first_rows] for dim, (codes, _) in dims.items()}
+        self.cell_rows = np.bincount(row_cells, minlength=len(first_rows))
+
+        self.questions = {}
+        for column in question_columns(df):
+            codes, categories = _codes(df[column])
+            self.questions[column] = _QuestionCounts(row_cells, codes, categories)
+        for column, table in answers.items():
+            positions = df.index.get_indexer(table.index)
+            codes, categories = _codes(table[VALUE_COLUMN])
+            self.questions[column] = _QuestionCounts(row_cells[positions], codes, categories)
+
+    def _cell_mask(self, selections):
+        """Devuelve las celdas que cumplen los filtros, o None si no hay filtros."""
+        mask = None
+        for dim, values in (selections or {}).items():
+            if not values or dim not in self.dimensions:
+                continue
+            wanted = self.dimensions[dim].get_indexer(pd.Index(values))
+            dim_mask = np.isin(self.cell_codes[dim], wanted[wanted >= 0])
+            mask = dim_mask if mask is None else mask & dim_mask
+        return mask
+
+    def total(self, selections=None):
+        """Devuelve el número de visitas que cumplen los filtros."""
+        mask = self._cell_mask(selections)
+        if mask is None:
+            return self.rows
+        return int(self.cell_rows[mask].sum())
+
+    def counts(self, column, selections=None):
+        """
+        Cuenta las respuestas de una pregunta, con filtros opcionales.
+
+        Args:
+            column (str): Pregunta (columna categórica o de selección múltiple).
+            selections (dict, optional): Valores elegidos por dimensión.
+
+        Returns:
+            pandas.Series: Cantidad por respuesta, de mayor a menor, o None si la
+            pregunta no está en el cubo.
+        """
+        question = self.questions.get(column)
+        if question is None:
+            return None
+
+        mask = self._cell_mask(selections)
+        if mask is None:
+            totals = question.totals
+        else:
+            selected = mask[question.cells]
+            totals = np.bincount(
+                question.codes[selected], weights=question.counts[selected], minlength=len(question.categories)
+            ).astype(np.int64)
+
+        counts = pd.Series(totals, index=pd.Index(question.categories, dtype=object), name=COUNT_COLUMN)
+        return counts[counts > 0].sort_values(ascending=False, kind='stable')
+
+    def matches(self, df):
+        """
+        Indica si el DataFrame corresponde a esta versión de los datos.
+
+        Acepta el DataFrame entregado por load_data() y los subconjuntos de los
+        filtros globales; para cualquier otro subconjunto devuelve False.
+        """
+        if df.attrs.get(REVISION_ATTR) != self.revision:
+            return False
+        return len(df) == self.total(df.attrs.get(FILTERS_ATTR))
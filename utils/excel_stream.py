@@ -0,0 +1,87 @@
+"""
+Módulo para leer libros Excel grandes de forma incremental.
+
+Usa el modo de solo lectura de openpyxl, que recorre las filas del XML sin
+construir el modelo completo del libro, y arma el DataFrame por bloques
+conservando solo las columnas que se piden. Así la memoria máxima queda acotada
+por el tamaño del bloque y no por el del libro.
+"""
+
+from operator import itemgetter
+import openpyxl
+import pandas as pd
+
+CHUNK_SIZE = 5000
+
+
+def _header_indices(header, keep_column):
+    """Devuelve los índices y nombres de las columnas del encabezado a conservar."""
+    indices = []
+    names = []
+    for index, name in enumerate(header):
+        if name is None:
+            continue
+        name = str(name).strip()
+        if name and name not in names and (keep_column is None or keep_column(name)):
+            indices.append(index)
+            names.append(name)
+    return indices, names
+
+
+def read_excel_streaming(path, sheet_name=None, keep_column=None, chunk_size=CHUNK_SIZE):
+    """
+    Lee la hoja de un libro Excel por bloques de filas.
+
+    Args:
+        path (str): Ruta del archivo Excel.
+        sheet_name (str, optional): Hoja a leer. Si no existe o no se indica,
+            se usa la primera hoja del libro.
+        keep_column (callable, optional): Función que recibe el nombre de una
+            columna y devuelve True si debe conservarse. Por defecto se conservan todas.
+        chunk_size (int): Número de filas por bloque.
+
+    Returns:
+        pandas.DataFrame: Datos de la hoja con las columnas seleccionadas.
+    """
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        if sheet_name in workbook.sheetnames:
+            sheet = workbook[sheet_name]
+        else:
+            sheet = workbook.worksheets[0]
+
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+
+        indices, names = _header_indices(header, keep_column)
+        if not indices:
+            return pd.DataFrame()
+
+        width = len(header)
+        if len(indices) == 1:
+            project = lambda row: (row[indices[0]],)
+        else:
+            project = itemgetter(*indices)
+
+        chunks = []
+        buffer = []
+        for row in rows:
+            # Las filas cortas se completan y las totalmente vacías se descartan
+            if len(row) < width:
+                row = tuple(row) + (None,) * (width - len(row))
+            values = project(row)
+            if all(value is None for value in values):
+                continue
+            buffer.append(values)
+            if len(buffer) >= chunk_size:
+                chunks.append(pd.DataFrame(buffer, columns=names, dtype=object))
+                buffer = []
+
+        if buffer or not chunks:
+            chunks.append(pd.DataFrame(buffer, columns=names, dtype=object))
+    finally:
+        workbook.close()
+
+    return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
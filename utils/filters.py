@@ -0,0 +1,134 @@
+"""
+Módulo con los índices de mapas de bits para los filtros globales del dashboard.
+
+Para cada columna de filtro se guarda, por cada valor, un mapa de bits
+empaquetado (un bit por visita) con las filas que tienen ese valor. Los índices
+se construyen una vez por versión de los datos; combinar filtros es un OR de
+los valores elegidos en cada columna y un AND entre columnas, sobre arreglos
+ocho veces más pequeños que una máscara booleana.
+"""
+
+import numpy as np
+import pandas as pd
+from utils.cube import FILTERS_ATTR, REVISION_ATTR
+
+# Columnas por las que se puede filtrar y su nombre en la barra de filtros
+FILTER_COLUMNS = {
+    'COMUNA': 'Comuna',
+    'NODO': 'Nodo',
+    'BARRIO': 'Barrio',
+    'PREFESIONAL_REALIZA_VISITA': 'Profesional',
+}
+
+
+class FilterIndex:
+    """
+    Índice de mapas de bits de las columnas de filtro.
+
+    Args:
+        df (pandas.DataFrame): Datos de visitas.
+        revision (str): Revisión de los datos.
+    """
+
+    def __init__(self, df, revision):
+        self.revision = revision
+        self.rows = len(df)
+        self.bitmaps = {}
+        for column in FILTER_COLUMNS:
+            if column in df.columns:
+                self.bitmaps[column] = self._build_column(df[column])
+
+    @staticmethod
+    def _build_column(series):
+        """Construye un mapa de bits empaquetado por cada valor no nulo de la columna."""
+        if not isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.astype('category')
+        codes = series.cat.codes.to_numpy()
+        bitmaps = {}
+        for code, value in enumerate(series.cat.categories):
+            matches = codes == code
+            if matches.any():
+                bitmaps[value] = np.packbits(matches)
+        try:
+            # Orden natural de los valores (las comunas son números)
+            return dict(sorted(bitmaps.items()))
+        except TypeError:
+            # Valores de tipos mezclados: ordenar como texto
+            return dict(sorted(bitmaps.items(), key=lambda item: str(item[0])))
+
+    def matches(self, df):
+        """Indica si el DataFrame es la versión de los datos sobre la que se construyó el índice."""
+        return df.attrs.get(REVISION_ATTR) == self.revision and len(df) == self.rows
+
+    def values(self, column):
+        """Devuelve los valores disponibles de una columna de filtro, ordenados."""
+        return list(self.bitmaps.get(column, {}))
+
+    def mask(self, selections):
+        """
+        Calcula las filas que cumplen todos los filtros.
+
+        Args:
+            selections (dict): Valores elegidos por columna. Las columnas sin
+                valores elegidos no filtran.
+
+        Returns:
+            numpy.ndarray: Máscara booleana de las filas elegidas, o None si no
+            hay ningún filtro activo.
+        """
+        combined = None
+        for column, values in selections.items():
+            if not values or column not in self.bitmaps:
+                continue
+            bitmaps = self.bitmaps[column]
+            # OR de los valores elegidos en la columna
+            column_bits = np.zeros((self.rows + 7) // 8, dtype=np.uint8)
+            for value in values:
+                if value in bitmaps:
+                    column_bits |= bitmaps[value]
+            # AND entre columnas
+            combined = column_bits if combined is None else combined & column_bits
+
+        if combined is None:
+            return None
+        return np.unpackbits(combined, count=self.rows).astype(bool)
+
+
+def apply_filters(df, index, selections):
+    """
+    Devuelve las visitas que cumplen los filtros elegidos.
+
+    Args:
+        df (pandas.DataFrame): Datos sobre los que se construyó el índice.
+        index (FilterIndex): Índice de los datos (ver
+            utils.load_data.get_filter_index()).
+        selections (dict): Valores elegidos por columna.
+
+    Returns:
+        pandas.DataFrame: Filas filtradas. En las columnas categóricas se
+        descartan las categorías sin filas, para que los conteos de las páginas
+        no muestren valores en cero. Los filtros aplicados quedan en
+        `attrs`, para que los conteos se puedan consultar en el cubo (ver
+        utils.cube).
+
+    Raises:
+        ValueError: Si el índice es de otra versión de los datos.
+    """
+    if not index.matches(df):
+        raise ValueError("El índice de filtros no corresponde a la revisión de los datos")
+    mask = index.mask(selections)
+    if mask is None:
+        return df
+
+    filtered = df[mask]
+    categorical = {
+        column: filtered[column].cat.remove_unused_categories()
+        for column in filtered.columns
+        if isinstance(filtered[column].dtype, pd.CategoricalDtype)
+    }
+    filtered = filtered.assign(**categorical)
+    # Valores como tipos de Python, para que los attrs se puedan serializar
+    filtered.attrs[FILTERS_ATTR] = {
+        column: pd.Index(values).tolist() for column, values in selections.items() if values
+    }
+    return filtered
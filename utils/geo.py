@@ -0,0 +1,285 @@
+"""
+Módulo con las operaciones geográficas sobre las coordenadas de los comedores.
+
+Las coordenadas se extraen de UBICACION una sola vez al cargar los datos (ver
+utils.ingest.parse_coordinates). Cuando hay demasiados puntos para enviarlos
+todos al navegador, el mapa los agrupa en una cuadrícula y muestra un círculo
+por celda con la cantidad de comedores.
+"""
+
+import numpy as np
+import pandas as pd
+from utils.ingest import LOCATION_COLUMN, LAT_COLUMN, LON_COLUMN, parse_coordinates
+
+# Puntos a partir de los cuales el mapa se agrupa por celdas
+MAP_POINT_LIMIT = 3000
+
+# Celdas por lado de la cuadrícula del mapa agrupado
+MAP_GRID_SIZE = 80
+
+COUNT_COLUMN = 'Cantidad'
+
+
+def coordinates(df):
+    """
+    Devuelve las filas con coordenadas válidas y sus columnas LATITUD y LONGITUD.
+
+    Usa las columnas calculadas al cargar; si no existen (por ejemplo, en una
+    instantánea antigua) las extrae de UBICACION.
+
+    Args:
+        df (pandas.DataFrame): Datos de visitas.
+
+    Returns:
+        pandas.DataFrame: Filas de `df` con coordenadas, con LATITUD y LONGITUD.
+    """
+    if LAT_COLUMN not in df.columns or LON_COLUMN not in df.columns:
+        if LOCATION_COLUMN not in df.columns:
+            return df.iloc[0:0].assign(**{LAT_COLUMN: [], LON_COLUMN: []})
+        df = df.assign(**parse_coordinates(df[LOCATION_COLUMN]))
+    return df[df[LAT_COLUMN].notna() & df[LON_COLUMN].notna()]
+
+
+def bin_points(lat, lon, grid_size=MAP_GRID_SIZE):
+    """
+    Agrupa puntos en una cuadrícula regular sobre su extensión.
+
+    Las celdas son cuadradas (en grados) y el lado mayor de la extensión se
+    divide en `grid_size` celdas, de modo que el resultado nunca tiene más de
+    grid_size² filas sin importar cuántos puntos haya.
+
+    Args:
+        lat (array-like): Latitudes.
+        lon (array-like): Longitudes.
+        grid_size (int): Celdas por lado.
+
+    Returns:
+        pandas.DataFrame: Una fila por celda con puntos: LATITUD y LONGITUD del
+        centro de los puntos de la celda y 'Cantidad' de puntos, de mayor a menor.
+    """
+    lat = np.asarray(lat, dtype='float64')
+    lon = np.asarray(lon, dtype='float64')
+    if len(lat) == 0:
+        return pd.DataFrame({LAT_COLUMN: [], LON_COLUMN: [], COUNT_COLUMN: []})
+
+    lat_min, lon_min = lat.min(), lon.min()
+    extent = max(lat.max() - lat_min, lon.max() - lon_min)
+    cell = extent / grid_size if extent > 0 else 1.0
+
+    rows = np.minimum(((lat - lat_min) / cell).astype(np.int64), grid_size - 1)
+    cols = np.minimum(((lon - lon_min) / cell).astype(np.int64), grid_size - 1)
+    _, cells, counts = np.unique(rows * grid_size + cols, return_inverse=True, return_counts=True)
+    cells = cells.reshape(-1)
+
+    binned = pd.DataFrame({
+        LAT_COLUMN: np.bincount(cells, weights=lat) / counts,
+        LON_COLUMN: np.bincount(cells, weights=lon) / counts,
+        COUNT_COLUMN: counts,
+    })
+    return binned.sort_values(COUNT_COLUMN, ascending=False, ignore_index=True)
+
+
+# Kilómetros por grado de latitud
+KM_PER_DEGREE = 111.2
+
+# Lado (km) de las celdas del índice espacial
+INDEX_CELL_KM = 0.5
+
+# Distancia (km) a la que un candidato a CEDECO cubre una zona
+COVERAGE_RADIUS_KM = 1.0
+
+DISTANCE_COLUMN = 'Distancia (km)'
+
+
+class SpatialIndex:
+    """
+    Índice espacial de cuadrícula sobre las coordenadas de los comedores.
+
+    Las coordenadas se proyectan a un plano en kilómetros alrededor del centro
+    de los datos (suficientemente preciso a escala de una ciudad) y se agrupan
+    en celdas de INDEX_CELL_KM de lado. Los puntos quedan ordenados por celda,
+    de modo que una consulta solo mide distancias a los puntos de las celdas
+    vecinas.
+
+    Args:
+        df (pandas.DataFrame): Datos de visitas.
+        revision (str, optional): Revisión de los datos.
+    """
+
+    def __init__(self, df, revision=None):
+        self.revision = revision
+        points = coordinates(df)
+        self.labels = points.index.to_numpy()
+        self.lat = points[LAT_COLUMN].to_numpy(dtype='float64')
+        self.lon = points[LON_COLUMN].to_numpy(dtype='float64')
+
+        self.lat0 = float(self.lat.mean()) if len(self.lat) else 0.0
+        self.lon0 = float(self.lon.mean()) if len(self.lon) else 0.0
+        self.x, self.y = self._project(self.lat, self.lon)
+
+        # Celda de cada punto, con índices desde 0
+        cell_x = np.floor(self.x / INDEX_CELL_KM).astype(np.int64)
+        cell_y = np.floor(self.y / INDEX_CELL_KM).astype(np.int64)
+        self.min_x = int(cell_x.min()) if len(cell_x) else 0
+        self.min_y = int(cell_y.min()) if len(cell_y) else 0
+        self.cell_x = cell_x - self.min_x
+        self.cell_y = cell_y - self.min_y
+        self.size_x = int(self.cell_x.max()) + 1 if len(cell_x) else 1
+        self.size_y = int(self.cell_y.max()) + 1 if len(cell_y) else 1
+
+        # Puntos ordenados por celda y posición de cada celda en el orden
+        keys = self.cell_x * self.size_y + self.cell_y
+        self.order = np.argsort(keys, kind='stable')
+        self.cell_keys, self.cell_starts, self.cell_counts = np.unique(
+            keys[self.order], return_index=True, return_counts=True
+        )
+
+    def __len__(self):
+        return len(self.labels)
+
+    def _project(self, lat, lon):
+        """Proyecta coordenadas a kilómetros (x hacia el este, y hacia el norte)."""
+        lat = np.asarray(lat, dtype='float64')
+        lon = np.asarray(lon, dtype='float64')
+        x = (lon - self.lon0) * KM_PER_DEGREE * np.cos(np.radians(self.lat0))
+        y = (lat - self.lat0) * KM_PER_DEGREE
+        return x, y
+
+    def _points_near(self, x, y, rings):
+        """Devuelve las posiciones de los puntos en las celdas a `rings` celdas o menos de (x, y)."""
+        center_x = int(np.floor(x / INDEX_CELL_KM)) - self.min_x
+        center_y = int(np.floor(y / INDEX_CELL_KM)) - self.min_y
+        xs = np.arange(max(center_x - rings, 0), min(center_x + rings, self.size_x - 1) + 1)
+        ys = np.arange(max(center_y - rings, 0), min(center_y + rings, self.size_y - 1) + 1)
+        if len(xs) == 0 or len(ys) == 0:
+            return np.empty(0, dtype=np.int64)
+
+        keys = (xs[:, None] * self.size_y + ys[None, :]).ravel()
+        # Solo las celdas que tienen puntos
+        slots = np.searchsorted(self.cell_keys, keys)
+        found = slots < len(self.cell_keys)
+        found[found] = self.cell_keys[slots[found]] == keys[found]
+        slots = slots[found]
+        starts = self.cell_starts[slots]
+        counts = self.cell_counts[slots]
+
+        # Concatenar los rangos [start, start + count) de cada celda
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        return self.order[offsets]
+
+    def _result(self, positions, distances, subset):
+        """Convierte posiciones y distancias en una serie ordenada por distancia."""
+        if subset is not None:
+            keep = subset[positions]
+            positions = positions[keep]
+            distances = distances[keep]
+        order = np.argsort(distances, kind='stable')
+        return pd.Series(distances[order], index=self.labels[positions[order]], name=DISTANCE_COLUMN)
+
+    def within(self, lat, lon, radius_km, subset=None):
+        """
+        Busca los puntos a menos de `radius_km` de una coordenada.
+
+        Args:
+            lat (float): Latitud de consulta.
+            lon (float): Longitud de consulta.
+            radius_km (float): Radio de búsqueda en kilómetros.
+            subset (numpy.ndarray, optional): Máscara booleana de los puntos del
+                índice que se pueden devolver (ver subset_mask()).
+
+        Returns:
+            pandas.Series: Distancia en km por etiqueta de fila, de menor a mayor.
+        """
+        x, y = self._project(lat, lon)
+        positions = self._points_near(x, y, int(np.ceil(radius_km / INDEX_CELL_KM)))
+        distances = np.hypot(self.x[positions] - x, self.y[positions] - y)
+        inside = distances <= radius_km
+        return self._result(positions[inside], distances[inside], subset)
+
+    def nearest(self, lat, lon, k=5, subset=None):
+        """
+        Busca los `k` puntos más cercanos a una coordenada.
+
+        Amplía la búsqueda en anillos de celdas hasta que los k puntos
+        encontrados estén más cerca que el borde del área revisada.
+
+        Args:
+            lat (float): Latitud de consulta.
+            lon (float): Longitud de consulta.
+            k (int): Número de puntos.
+            subset (numpy.ndarray, optional): Máscara booleana de los puntos del
+                índice que se pueden devolver.
+
+        Returns:
+            pandas.Series: Distancia en km por etiqueta de fila, de menor a mayor.
+        """
+        x, y = self._project(lat, lon)
+        # Celdas entre la consulta y la cuadrícula: fuera de ella los primeros
+        # anillos no contienen puntos
+        center_x = int(np.floor(x / INDEX_CELL_KM)) - self.min_x
+        center_y = int(np.floor(y / INDEX_CELL_KM)) - self.min_y
+        outside = max(-center_x, center_x - (self.size_x - 1), -center_y, center_y - (self.size_y - 1), 0)
+        max_rings = outside + max(self.size_x, self.size_y)
+        rings = outside + 1
+        while True:
+            positions = self._points_near(x, y, rings)
+            if subset is not None:
+                positions = positions[subset[positions]]
+            distances = np.hypot(self.x[positions] - x, self.y[positions] - y)
+            # Todo punto a menos de rings * INDEX_CELL_KM ya está entre los revisados
+            enough = len(distances) >= k and np.partition(distances, k - 1)[k - 1] <= rings * INDEX_CELL_KM
+            if enough or rings >= max_rings:
+                break
+            rings *= 2
+        return self._result(positions, distances, None).iloc[:k]
+
+    def subset_mask(self, labels):
+        """Devuelve la máscara de los puntos del índice cuyas etiquetas están en `labels`."""
+        return np.isin(self.labels, np.asarray(labels))
+
+    def coverage_gaps(self, candidates, radius_km=COVERAGE_RADIUS_KM, subset=None):
+        """
+        Busca las zonas con comedores y sin ningún candidato cerca.
+
+        Una zona es una celda del índice. Una zona está cubierta si hay algún
+        candidato en una celda a `radius_km` o menos (medido entre centros de
+        celda).
+
+        Args:
+            candidates (numpy.ndarray): Máscara booleana de los puntos que son
+                candidatos (por ejemplo, potencial alto como CEDECO).
+            radius_km (float): Distancia de cobertura en kilómetros.
+            subset (numpy.ndarray, optional): Máscara de los puntos a considerar.
+
+        Returns:
+            pandas.DataFrame: Una fila por zona sin cobertura con LATITUD y
+            LONGITUD (centro de sus comedores) y 'Cantidad' de comedores, de
+            mayor a menor.
+        """
+        points = np.ones(len(self), dtype=bool) if subset is None else subset
+        candidates = candidates & points
+
+        # Celdas cubiertas: las vecinas (dentro del radio) de cada celda con candidatos
+        rings = int(np.ceil(radius_km / INDEX_CELL_KM))
+        offset_x, offset_y = np.meshgrid(np.arange(-rings, rings + 1), np.arange(-rings, rings + 1))
+        disk = np.hypot(offset_x, offset_y) * INDEX_CELL_KM <= radius_km
+        offset_x, offset_y = offset_x[disk], offset_y[disk]
+
+        # Claves con margen para que las celdas vecinas no tengan índices negativos
+        width = self.size_y + 2 * rings
+        candidate_cells = np.unique((self.cell_x[candidates] + rings) * width + self.cell_y[candidates] + rings)
+        covered = np.unique((candidate_cells[:, None] + (offset_x * width + offset_y)[None, :]).ravel())
+
+        keys = (self.cell_x + rings) * width + self.cell_y + rings
+        uncovered = points & ~np.isin(keys, covered)
+        if not uncovered.any():
+            return pd.DataFrame({LAT_COLUMN: [], LON_COLUMN: [], COUNT_COLUMN: []})
+
+        _, cells, counts = np.unique(keys[uncovered], return_inverse=True, return_counts=True)
+        cells = cells.reshape(-1)
+        gaps = pd.DataFrame({
+            LAT_COLUMN: np.bincount(cells, weights=self.lat[uncovered]) / counts,
+            LON_COLUMN: np.bincount(cells, weights=self.lon[uncovered]) / counts,
+            COUNT_COLUMN: counts,
+        })
+        return gaps.sort_values(COUNT_COLUMN, ascending=False, ignore_index=True)
@@ -0,0 +1,190 @@
+"""
+Módulo para convertir los valores crudos de la hoja CEDECO en un DataFrame tipado.
+
+Toda la conversión se hace por columnas con pandas, sin recorrer las filas en
+Python: asignación de encabezados, detección de columnas numéricas, fechas,
+teléfonos y coordenadas.
+"""
+
+import pandas as pd
+
+DATE_COLUMN = 'FECHA'
+PHONE_COLUMN = 'TELEFONO1'
+LOCATION_COLUMN = 'UBICACION'
+LAT_COLUMN = 'LATITUD'
+LON_COLUMN = 'LONGITUD'
+
+# Columnas de texto que nunca se convierten a número aunque lo parezcan
+TEXT_COLUMNS = {PHONE_COLUMN, LOCATION_COLUMN}
+
+# Columnas calculadas al cargar que no existen en la hoja
+DERIVED_COLUMNS = [LAT_COLUMN, LON_COLUMN]
+
+DATE_FORMATS = ['%d/%m/%Y', '%d/%m/%Y %H:%M:%S', '%Y-%m-%d', '%Y-%m-%d %H:%M:%S']
+
+_COORDS_PATTERN = r'^\s*(-?\d+(?:\.\d+)?)\s*[,;]\s*(-?\d+(?:\.\d+)?)\s*$'
+
+
+def _unique_headers(header):
+    """
+    Limpia los encabezados y desambigua los repetidos.
+
+    Los encabezados repetidos reciben un sufijo '.1', '.2'... igual que en
+    pandas.read_excel.
+    """
+    seen = {}
+    result = []
+    for name in header:
+        name = str(name).strip()
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        result.append(name)
+    return result
+
+
+def header_columns(header):
+    """
+    Devuelve los nombres de columna que resultan de una fila de encabezados.
+
+    Args:
+        header (list): Fila de encabezados tal como viene de la hoja.
+
+    Returns:
+        list: Encabezados limpios, sin repetidos y sin los vacíos.
+    """
+    return [name for name in _unique_headers(header) if name != '']
+
+
+def source_columns(df):
+    """Devuelve las columnas del DataFrame que provienen de la hoja (sin las calculadas)."""
+    return [col for col in df.columns if col not in DERIVED_COLUMNS]
+
+
+def frame_from_values(header, rows):
+    """
+    Construye un DataFrame a partir de la cuadrícula de valores de la hoja.
+
+    Args:
+        header (list): Fila de encabezados.
+        rows (list): Filas de valores (pueden tener distinta longitud).
+
+    Returns:
+        pandas.DataFrame: Datos con los tipos ya convertidos.
+    """
+    header = _unique_headers(header)
+    width = len(header)
+    df = pd.DataFrame(rows, dtype=object)
+    df = df.reindex(columns=range(width)).fillna('')
+    df.columns = header
+
+    # Descartar columnas sin encabezado
+    df = df.loc[:, [name != '' for name in header]]
+    return coerce_types(df)
+
+
+def _coerce_numeric(series):
+    """
+    Convierte a número una columna de texto si todos sus valores no vacíos lo son.
+
+    Las columnas con algún valor no numérico se dejan como texto.
+    """
+    text = series.astype('string').str.strip()
+    empty = text.isna() | (text == '')
+    if empty.all():
+        return series
+
+    numbers = pd.to_numeric(text.where(~empty), errors='coerce')
+    if numbers[~empty].isna().any():
+        return series
+
+    if (numbers.dropna() % 1 == 0).all():
+        return numbers.astype('Int64')
+    return numbers.astype('float64')
+
+
+def _coerce_dates(series):
+    """Convierte la columna de fechas probando los formatos conocidos."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+
+    text = series.astype('string').str.strip()
+    result = pd.Series(pd.NaT, index=series.index, dtype='datetime64[ns]')
+    pending = text.notna() & (text != '')
+    for date_format in DATE_FORMATS:
+        if not pending.any():
+            break
+        parsed = pd.to_datetime(text[pending], format=date_format, errors='coerce')
+        result.loc[parsed.index] = parsed
+        pending &= result.isna()
+
+    # Los valores restantes (formatos no previstos) se interpretan con día primero
+    if pending.any():
+        result.loc[pending] = pd.to_datetime(text[pending], dayfirst=True, errors='coerce', format='mixed')
+    return result
+
+
+def _coerce_phone(series):
+    """Normaliza los teléfonos como texto de dígitos ('' si no hay teléfono)."""
+    if pd.api.types.is_numeric_dtype(series):
+        series = series.astype('Int64')
+    text = series.astype('string').str.replace(r'\.0$', '', regex=True)
+    text = text.str.replace(r'[^\d+]', '', regex=True)
+    return text.fillna('').astype(object)
+
+
+def parse_coordinates(series):
+    """
+    Extrae latitud y longitud de textos con formato 'lat, lon'.
+
+    Args:
+        series (pandas.Series): Columna UBICACION.
+
+    Returns:
+        pandas.DataFrame: Columnas LATITUD y LONGITUD (float, NaN si no son válidas).
+    """
+    coords = series.astype('string').str.extract(_COORDS_PATTERN)
+    coords = coords.astype('float64')
+    coords.columns = [LAT_COLUMN, LON_COLUMN]
+
+    # Descartar coordenadas fuera de rango
+    invalid = (coords[LAT_COLUMN].abs() > 90) | (coords[LON_COLUMN].abs() > 180)
+    coords.loc[invalid] = float('nan')
+    return coords
+
+
+def coerce_types(df):
+    """
+    Convierte los tipos de las columnas del DataFrame de visitas.
+
+    Es idempotente: puede aplicarse a datos ya convertidos (por ejemplo, al
+    agregar filas nuevas a datos de una instantánea).
+
+    Args:
+        df (pandas.DataFrame): Datos con columnas de texto.
+
+    Returns:
+        pandas.DataFrame: Datos con números, fechas, teléfonos y coordenadas convertidos.
+    """
+    df = df.copy()
+
+    for col in df.columns:
+        if col in TEXT_COLUMNS or col == DATE_COLUMN:
+            continue
+        if df[col].dtype == object:
+            df[col] = _coerce_numeric(df[col])
+
+    if DATE_COLUMN in df.columns:
+        df[DATE_COLUMN] = _coerce_dates(df[DATE_COLUMN])
+
+    if PHONE_COLUMN in df.columns:
+        df[PHONE_COLUMN] = _coerce_phone(df[PHONE_COLUMN])
+
+    if LOCATION_COLUMN in df.columns:
+        coords = parse_coordinates(df[LOCATION_COLUMN])
+        df[LAT_COLUMN] = coords[LAT_COLUMN]
+        df[LON_COLUMN] = coords[LON_COLUMN]
+
+    return df
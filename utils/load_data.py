@@ -6,126 +6,703 @@ import streamlit as st
 import pandas as pd
 import gspread
 import json
+import logging
 import os
-from google.oauth2.service_account import Credentials
+import threading
+import time
 import openpyxl
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from utils.snapshot import read_snapshot, write_snapshot
+from utils.sheet_sync import SheetValues, sync_worksheet, full_sync
+from utils.ingest import coerce_types
+from utils.excel_stream import read_excel_streaming
+from utils.schema import apply_schema, FREQUENCY_SUFFIX
+from utils.answers import build_answer_tables, explode_answers, ANSWER_RULES, VALUE_COLUMN
+from utils.filters import FilterIndex
+from utils.cube import AggregateCube, REVISION_ATTR, FILTERS_ATTR, COUNT_COLUMN
+from utils.geo import SpatialIndex
+from utils.text_index import TextIndex
+from utils.years import extract_years
+from utils.sheets_client import get_sheets_client, sheets_transfer, reset_sheets_client
 
-def load_data():
+SHEET_NAME = 'CEDECO'
+EXCEL_FILES = ['CEDECO.xlsx', 'CEDECO 2.xlsx', 'data/CEDECO.xlsx', 'data/CEDECO 2.xlsx']
+DRIVE_FILES_URL = 'https://www.googleapis.com/drive/v3/files/{}'
+
+# Segundos durante los cuales se sirve la caché sin consultar la revisión de la hoja
+REVISION_CHECK_INTERVAL = 30
+
+# 'incremental' descarga solo las visitas nuevas; 'full' descarga siempre toda la hoja
+SYNC_MODE = os.environ.get('CEDECO_SYNC_MODE', 'incremental')
+
+# Tiempo máximo (segundos) de cada fuente: (consulta de revisión, descarga)
+SOURCE_TIMEOUTS = {
+    'Google Sheets': (15, 120),
+    'Excel': (5, 120),
+}
+
+logger = logging.getLogger(__name__)
+
+# Hilos para consultar las fuentes; una fuente que no responde a tiempo sigue
+# ocupando su hilo hasta que termine, pero la carga continúa con la siguiente
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='cedeco-source')
+
+
+# Columnas esperadas en los datos de visitas
+EXPECTED_COLUMNS = [
+    'ID',
+    'FECHA',
+    'NOMBRE_COMEDOR',
+    'NOMBER_GESTORA',
+    'TELEFONO1',
+    'DIRECCION',
+    'COMUNA',
+    'BARRIO',
+    'NODO',
+    'NICHO',
+    'PREFESIONAL_REALIZA_VISITA',
+    'LUGAR_DONDE_FUNCIONA_COMEDOR',
+    'ESPACIO_TALLERES',
+    'ARTICULACION_CON_ORGANIZACIONES',
+    'HISTORIA_COMEDOR',
+    'PARTICIPACION_ACTIVIDADES',
+    'USO_DE_TIC',
+    'QUE_REDES',
+    'HA_TENIDO_DIFICULTADES',
+    'FINANCIACION_ACTIVIDADES',
+    'POBLACION_PRINCIPAL_COMEDOR',
+    'ETAPA_VITAL',
+    'BENEFICIARIOS_SON_MISMOS_QUE_REALIZA_LABORA_SOCIAL',
+    'ACCIONES_PUNTUALES_COMEDOR',
+    'VINCULACION_OTROS_ACTORES',
+    'SEGUIMIENTO_EVALUACION_A_OTRAS_ACTIVIDADES',
+    'INICIATIVA_HUERTAS',
+    'INTERESADO_COMO_CENTRO_DESARROLLO',
+    'NECESIDADES_QUE_SE_APOYARAN',
+    'USER',
+    'NOMBRE',
+    'UBICACION',
+    'Observaciones1',
+    'Observaciones2',
+    'OBSERVACIONES_ALIANZAS_ESTRATEGICAS',
+    'OBSERVACIONES_AREA_FINANCIAMIENTO',
+    'OBSERVACIONES_CAPACITACION_INTEGRAL',
+    'OBSERVACIONES_VISIBILIDAD_RECONOCIMIENTO',
+    'OBSERVACIONES_PROCESOS_PLANIFICACIONES',
+    'RECURSO_HUMANO_CON_EL_QUE_CUENTA',
+    'OBSERVACIONES',
+]
+
+# Columnas que algunas páginas usan si están presentes en la fuente
+OPTIONAL_COLUMNS = [
+    '¿Cuáles?2',
+    'GESTION_HC',
+    'GRUPOS_EN_SITUACION_DE_VULNERABILIDAD',
+    'OTRA_NECESIDAD',
+    'Observaciones3',
+    'PAQUETES_OFFICE',
+    'QUE_DIFICULTADES',
+    'QUE_ESTRATEGIAS_USA',
+    'QUE_OTRA_FINANCIACION',
+]
+
+def is_dashboard_column(name):
+    """Indica si una columna de la fuente es usada por alguna página del dashboard."""
+    return name in EXPECTED_COLUMNS or name in OPTIONAL_COLUMNS or FREQUENCY_SUFFIX in name
+
+
+class DatasetCache:
     """
-    Carga los datos desde Google Sheets o archivo Excel.
+    Caché de datos compartida por todas las sesiones del proceso.
+    
+    Guarda el último DataFrame cargado junto con la revisión de la fuente
+    (versión/fecha de modificación de la hoja o del archivo Excel) y lleva
+    la cuenta de aciertos y fallos. El candado solo serializa los refrescos;
+    los lectores toman la referencia actual de `df` sin esperar.
+    
+    Junto a los datos se guardan las tablas largas de las preguntas de
+    selección múltiple (ver utils.answers), el índice de los filtros globales
+    (ver utils.filters), el cubo de conteos (ver utils.cube), el índice
+    espacial de los comedores (ver utils.geo) y el conteo de palabras de las
+    observaciones (ver utils.text_index) y los años mencionados en las
+    historias (ver utils.years), construidos una vez por carga. El conteo de
+    palabras se actualiza a partir del de la carga anterior.
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.df = None
+        self.answers = {}
+        self.filter_index = None
+        self.cube = None
+        self.spatial_index = None
+        self.text_index = None
+        self.years = None
+        self.revision = None
+        self.source = None
+        self.fetched_at = None
+        self.checked_at = None
+        self.hits = 0
+        self.misses = 0
+        self.full_synced_at = None
+        self.synced_revision = None
+        self.check_from = 0
+        self.last_sync = None
+        self.last_report = None
+        self.background = False
+    
+    def is_fresh(self, revision):
+        """Indica si la caché contiene datos para la revisión dada."""
+        return self.df is not None and revision is not None and revision == self.revision
+    
+    def is_synced(self):
+        """
+        Indica si los datos en caché vienen de una sincronización de su revisión con la hoja.
+        
+        Los datos de Google Sheets leídos de la instantánea local pueden venir
+        de una sincronización incremental anterior al reinicio, por lo que se
+        vuelven a comparar con la hoja aunque la revisión no haya cambiado.
+        """
+        if self.revision is None or not self.revision.startswith('sheets:'):
+            return True
+        return self.synced_revision == self.revision
+    
+    def _index(self, df, revision):
+        """Construye las tablas derivadas de una nueva versión de los datos."""
+        df.attrs[REVISION_ATTR] = revision
+        self.answers = build_answer_tables(df)
+        self.filter_index = FilterIndex(df, revision)
+        self.cube = AggregateCube(df, self.answers, revision)
+        self.spatial_index = SpatialIndex(df, revision)
+        self.text_index = TextIndex(df, revision, previous=self.text_index)
+        self.years = extract_years(df)
+    
+    def store(self, df, revision, source):
+        """Guarda un nuevo DataFrame en la caché."""
+        now = time.time()
+        self._index(df, revision)
+        self.df = df
+        self.revision = revision
+        self.source = source
+        self.fetched_at = now
+        self.checked_at = now
+    
+    def load_snapshot(self):
+        """
+        Carga la instantánea local en la caché si esta aún está vacía.
+        
+        Returns:
+            bool: True si la caché quedó con datos de la instantánea.
+        """
+        df, info = read_snapshot()
+        if df is None:
+            return False
+        df = apply_schema(df)
+        self._index(df, info['revision'])
+        self.df = df
+        self.revision = info['revision']
+        self.source = f"{info['source']} (instantánea)"
+        self.fetched_at = info['written_at']
+        self.checked_at = time.time()
+        # La instantánea pudo guardarse tras una sincronización incremental: se
+        # compara con la hoja completa en el primer refresco
+        self.full_synced_at = None
+        self.synced_revision = None
+        self.check_from = 0
+        return True
+    
+    def stats(self):
+        """
+        Devuelve información sobre el estado de la caché.
+        
+        Returns:
+            dict: Aciertos, fallos, fuente, revisión y antigüedad de los datos.
+        """
+        now = time.time()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'source': self.source,
+            'revision': self.revision,
+            'fetched_at': self.fetched_at,
+            'age_seconds': now - self.fetched_at if self.fetched_at else None,
+            'checked_at': self.checked_at,
+            'last_sync': self.last_sync,
+            'last_report': self.last_report,
+        }
+
+
+_dataset_cache = DatasetCache()
+
+
+def get_cache_stats():
+    """
+    Devuelve las estadísticas de la caché compartida de datos.
     
     Returns:
-        pandas.DataFrame: Dataframe con los datos cargados.
+        dict: Ver DatasetCache.stats().
+    """
+    return _dataset_cache.stats()
+
+
+def get_load_report():
+    """
+    Devuelve el reporte del último intento de carga desde las fuentes.
+    
+    Returns:
+        dict: Estado ('fetched', 'fresh' o 'failed'), fuente usada, duración
+        total y la lista de intentos (fuente, etapa, estado, segundos, error),
+        o None si aún no se ha consultado ninguna fuente.
+    """
+    return _dataset_cache.last_report
+
+
+def get_filter_index(df):
+    """
+    Devuelve el índice de filtros para un DataFrame.
+    
+    Si `df` es el DataFrame entregado por load_data() se usa el índice
+    construido al cargar los datos. Si el refresco ya reemplazó los datos en
+    caché por otra revisión, o para cualquier otro DataFrame, se construye un
+    índice nuevo, de modo que los filtros nunca se aplican sobre filas de otra
+    versión.
+    
+    Args:
+        df (pandas.DataFrame): Datos a filtrar.
+    
+    Returns:
+        FilterIndex: Índice de los filtros de `df`.
+    """
+    index = _dataset_cache.filter_index
+    if index is not None and index.matches(df):
+        return index
+    return FilterIndex(df, df.attrs.get(REVISION_ATTR))
+
+
+def get_spatial_index(df):
+    """
+    Devuelve el índice espacial de los comedores para un DataFrame.
+    
+    Si `df` es el DataFrame entregado por load_data() o un subconjunto suyo, se
+    usa el índice construido al cargar los datos; las consultas se pueden
+    limitar a las filas de `df` con SpatialIndex.subset_mask(). Para cualquier
+    otro DataFrame se construye un índice nuevo.
+    
+    Args:
+        df (pandas.DataFrame): Datos a analizar.
+    
+    Returns:
+        SpatialIndex: Índice con las coordenadas de los comedores.
+    """
+    index = _dataset_cache.spatial_index
+    if index is not None and df.attrs.get(REVISION_ATTR) == index.revision:
+        return index
+    return SpatialIndex(df, df.attrs.get(REVISION_ATTR))
+
+
+def get_text_index(df):
+    """
+    Devuelve el conteo de palabras de las observaciones para un DataFrame.
+    
+    Si `df` es el DataFrame entregado por load_data() o un subconjunto suyo, se
+    usa el índice construido al cargar los datos; las frecuencias de un
+    subconjunto se obtienen con TextIndex.frequencies(columna, df). Para
+    cualquier otro DataFrame se construye un índice nuevo.
+    
+    Args:
+        df (pandas.DataFrame): Datos a analizar.
+    
+    Returns:
+        TextIndex: Índice con el conteo de palabras por visita.
+    """
+    index = _dataset_cache.text_index
+    if index is not None and df.attrs.get(REVISION_ATTR) == index.revision:
+        return index
+    return TextIndex(df, df.attrs.get(REVISION_ATTR))
+
+
+def get_counts(df, column, label='Valor'):
+    """
+    Cuenta las respuestas de una pregunta categórica o de selección múltiple.
+    
+    Si `df` es el DataFrame entregado por load_data() o un subconjunto de los
+    filtros globales, los conteos salen del cubo precalculado (ver utils.cube);
+    para cualquier otro DataFrame se calculan directamente.
+    
+    Args:
+        df (pandas.DataFrame): Datos a analizar.
+        column (str): Pregunta a contar, o nombre de una tabla de
+            utils.answers.ANSWER_RULES.
+        label (str): Nombre de la columna de respuestas en el resultado.
+    
+    Returns:
+        pandas.DataFrame: Columnas `label` y 'Cantidad', de mayor a menor.
+    """
+    counts = None
+    cube = _dataset_cache.cube
+    if cube is not None and cube.matches(df):
+        counts = cube.counts(column, df.attrs.get(FILTERS_ATTR))
+    
+    if counts is None:
+        if column in ANSWER_RULES:
+            counts = get_answer_table(df, column)[VALUE_COLUMN].value_counts()
+        else:
+            counts = df[column].value_counts()
+        counts = counts[counts > 0]
+    
+    counts = counts.reset_index()
+    counts.columns = [label, COUNT_COLUMN]
+    return counts
+
+
+def get_answer_table(df, column):
+    """
+    Devuelve la tabla larga (ID, VALOR) de una pregunta de selección múltiple.
+    
+    Usa las tablas construidas al cargar los datos y conserva solo las filas de
+    `df`, de modo que funciona también con subconjuntos del DataFrame servido
+    por load_data(). Si la columna no está en la caché se separa en el momento.
+    
+    Args:
+        df (pandas.DataFrame): Datos entregados por load_data() o un subconjunto.
+        column (str): Nombre de la tabla en utils.answers.ANSWER_RULES.
+    
+    Returns:
+        pandas.DataFrame: Ver utils.answers.explode_answers.
+    """
+    cached_df = _dataset_cache.df
+    table = _dataset_cache.answers.get(column)
+    if table is None or cached_df is None:
+        return explode_answers(df, column)
+    if df.index.equals(cached_df.index):
+        return table
+    return table[table.index.isin(df.index)]
+
+
+def get_year_table(df):
+    """
+    Devuelve la tabla (COMEDOR, AÑO) de los años mencionados en las historias.
+    
+    Usa la tabla construida al cargar los datos y conserva solo las filas de
+    `df`, igual que get_answer_table(). Si no hay datos en caché los años se
+    extraen en el momento.
+    
+    Args:
+        df (pandas.DataFrame): Datos entregados por load_data() o un subconjunto.
+    
+    Returns:
+        pandas.DataFrame: Ver utils.years.extract_years.
+    """
+    cached_df = _dataset_cache.df
+    table = _dataset_cache.years
+    if table is None or cached_df is None or df.attrs.get(REVISION_ATTR) != _dataset_cache.revision:
+        return extract_years(df)
+    if df.index.equals(cached_df.index):
+        return table
+    return table[table.index.isin(df.index)]
+
+
+def _get_sheet_revision(client, spreadsheet_id):
     """
+    Consulta en Drive la versión y fecha de modificación de la hoja.
+    
+    Es una llamada de metadatos muy ligera comparada con descargar los registros.
     
-    # Intentar cargar datos desde Google Sheets primero
+    Returns:
+        str: Identificador de revisión de la hoja.
+    """
+    response = client.request(
+        'get',
+        DRIVE_FILES_URL.format(spreadsheet_id),
+        params={'fields': 'version,modifiedTime', 'supportsAllDrives': True},
+    )
+    metadata = response.json()
+    return f"{metadata.get('version', '')}:{metadata.get('modifiedTime', '')}"
+
+
+def _fetch_sheet(client, spreadsheet_id, cache, revision):
+    """
+    Descarga la hoja CEDECO, de forma incremental cuando es posible.
+    
+    Los valores se leen directamente con la API de valores (sin abrir el libro
+    ni listar sus hojas). Si la caché ya contiene datos de la misma hoja y
+    SYNC_MODE es 'incremental', solo se descargan las visitas nuevas (ver
+    utils.sheet_sync); la hoja completa solo se descarga si las filas
+    verificadas cambiaron o cada FULL_SYNC_INTERVAL. Si la hoja CEDECO no
+    existe, la API responde con error y se pasa a la siguiente fuente.
+    
+    Args:
+        revision (str): Revisión de la hoja que se va a descargar.
+    
+    Returns:
+        pandas.DataFrame: Datos de la hoja.
+    """
+    sheet = SheetValues(client, spreadsheet_id, SHEET_NAME)
+    same_sheet = cache.revision is not None and cache.revision.startswith(f"sheets:{spreadsheet_id}:")
+    previous_df = cache.df if same_sheet else None
+    
+    if SYNC_MODE == 'incremental':
+        df, report = sync_worksheet(sheet, previous_df, cache.full_synced_at, cache.check_from)
+    else:
+        df, report = full_sync(sheet, previous_df)
+    
+    if report['mode'] == 'full':
+        cache.full_synced_at = time.time()
+    # La próxima sincronización incremental verifica la ventana siguiente
+    cache.check_from = report.get('next_check', 0)
+    cache.synced_revision = revision
+    cache.last_sync = report
+    return df
+
+
+def _find_excel_file():
+    """Devuelve la ruta del primer archivo Excel disponible o None."""
+    for file in EXCEL_FILES:
+        if os.path.exists(file):
+            return file
+    return None
+
+
+def _serve(df):
+    """
+    Entrega una copia superficial del DataFrame cacheado.
+    
+    Las páginas agregan columnas auxiliares al DataFrame recibido; con una copia
+    superficial esas columnas no se filtran a la caché compartida.
+    """
+    return df.copy(deep=False)
+
+
+def _save_snapshot(df, revision, source):
+    """Guarda la instantánea local sin interrumpir la carga si falla la escritura."""
     try:
-        # Verificar si hay credenciales de Streamlit Cloud
-        if 'gcp_service_account' in st.secrets:
-            # Configurar credenciales desde secretos de Streamlit
-            credentials_info = st.secrets["gcp_service_account"]
-            spreadsheet_id = st.secrets["sheets"]["spreadsheet_id"]
-            
-            # Configurar credenciales
-            scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
-            creds = Credentials.from_service_account_info(credentials_info, scopes=scope)
-            client = gspread.authorize(creds)
-            
-            # Abrir la hoja
-            spreadsheet = client.open_by_key(spreadsheet_id)
-            
-            # Obtener hojas disponibles
-            sheet_names = [sheet.title for sheet in spreadsheet.worksheets()]
-            
-            # Cargar la hoja CEDECO
-            if 'CEDECO' in sheet_names:
-                sheet = spreadsheet.worksheet('CEDECO')
-                data = sheet.get_all_records()
-                return pd.DataFrame(data)
+        write_snapshot(df, revision, source)
     except Exception as e:
-        # Silenciosamente pasar al siguiente método si falla
         pass
+
+
+def set_background_refresh(enabled):
+    """
+    Indica si hay un hilo de fondo refrescando los datos (ver utils.refresher).
     
-    # Intentar usar archivo credentials.json para Google Sheets
+    Con el refresco en segundo plano activo, load_data() nunca consulta las
+    fuentes desde el hilo de la petición y solo entrega los datos en caché.
+    """
+    _dataset_cache.background = enabled
+
+
+def _probe_sheets(cache):
+    """
+    Consulta la revisión de Google Sheets.
+    
+    Returns:
+        tuple: (revisión, nombre de la fuente, función que descarga los datos)
+        o None si no hay credenciales.
+    """
+    client, spreadsheet_id = get_sheets_client()
+    if client is None:
+        return None
+    with sheets_transfer():
+        revision = f"sheets:{spreadsheet_id}:{_get_sheet_revision(client, spreadsheet_id)}"
+    
+    def fetch():
+        with sheets_transfer():
+            return _fetch_sheet(client, spreadsheet_id, cache, revision)
+    
+    return revision, 'Google Sheets', fetch
+
+
+def _probe_excel(cache):
+    """
+    Busca el archivo Excel local y calcula su revisión.
+    
+    Returns:
+        tuple: (revisión, nombre de la fuente, función que lee los datos)
+        o None si no hay archivo.
+    """
+    file = _find_excel_file()
+    if file is None:
+        return None
+    revision = f"excel:{file}:{os.path.getmtime(file)}"
+    
+    def fetch():
+        # Cargar datos de Excel por bloques, solo con las columnas que usa el dashboard
+        return coerce_types(read_excel_streaming(file, SHEET_NAME, is_dashboard_column))
+    
+    return revision, file, fetch
+
+
+# Fuentes en orden de prioridad
+SOURCES = [
+    ('Google Sheets', _probe_sheets),
+    ('Excel', _probe_excel),
+]
+
+
+def _timed(func, *args):
+    """Ejecuta una función y devuelve (resultado, segundos que tardó)."""
+    start = time.perf_counter()
     try:
-        if os.path.exists('credentials.json'):
-            # Configurar credenciales
-            scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
-            creds = Credentials.from_service_account_file('credentials.json', scopes=scope)
-            client = gspread.authorize(creds)
-            
-            # Abrir la hoja
-            spreadsheet = client.open_by_key('1n7f_BWmVmdfvE75_HFf2az0DFGQUAMxqca-zEB91X-A')
-            
-            # Obtener hojas disponibles
-            sheet_names = [sheet.title for sheet in spreadsheet.worksheets()]
-            
-            # Cargar la hoja CEDECO
-            if 'CEDECO' in sheet_names:
-                sheet = spreadsheet.worksheet('CEDECO')
-                data = sheet.get_all_records()
-                return pd.DataFrame(data)
+        return func(*args), time.perf_counter() - start
     except Exception as e:
-        # Silenciosamente pasar al siguiente método si falla
-        pass
+        e.seconds = time.perf_counter() - start
+        raise
+
+
+def _wait(future, timeout, waited_since):
+    """
+    Espera el resultado de una tarea lanzada con _timed como máximo `timeout` segundos.
     
-    # Intentar cargar directamente desde archivo Excel
+    Returns:
+        tuple: (estado, resultado, error, segundos) con estado 'ok', 'timeout' o
+        'error'. Si la tarea no terminó, los segundos son los transcurridos desde
+        `waited_since`.
+    """
     try:
-        # Verificar varios nombres posibles de archivo Excel
-        excel_files = ['CEDECO.xlsx', 'CEDECO 2.xlsx', 'data/CEDECO.xlsx', 'data/CEDECO 2.xlsx']
-        
-        for file in excel_files:
-            if os.path.exists(file):
-                # Cargar datos de Excel
-                return pd.read_excel(file)
+        result, seconds = future.result(timeout=max(timeout, 0))
+        return 'ok', result, None, seconds
+    except FutureTimeout:
+        return 'timeout', None, None, time.perf_counter() - waited_since
     except Exception as e:
-        # Silenciosamente pasar al siguiente método si falla
-        pass
+        return 'error', None, e, getattr(e, 'seconds', time.perf_counter() - waited_since)
+
+
+def _new_report():
+    """Crea un reporte de carga vacío."""
+    return {'started_at': time.time(), 'status': None, 'source': None, 'seconds': None, 'attempts': []}
+
+
+def _record_attempt(report, source, stage, status, seconds, error=None):
+    """Agrega al reporte de carga el resultado de una etapa de una fuente."""
+    report['attempts'].append({
+        'source': source,
+        'stage': stage,
+        'status': status,
+        'seconds': seconds,
+        'error': f"{type(error).__name__}: {error}" if error is not None else None,
+    })
+
+
+def _finish_report(cache, report, status, source=None):
+    """Cierra el reporte de carga, lo guarda en la caché y lo registra en el log."""
+    report['status'] = status
+    report['source'] = source
+    report['seconds'] = time.time() - report['started_at']
+    cache.last_report = report
+    
+    level = logging.WARNING if status == 'failed' else logging.INFO
+    attempts = ', '.join(
+        f"{a['source']}/{a['stage']}={a['status']} ({a['seconds']:.2f}s)" for a in report['attempts']
+    )
+    logger.log(level, "Carga de datos: %s desde %s en %.2fs [%s]", status, source, report['seconds'], attempts)
+    return status
+
+
+def refresh_data(force=False):
+    """
+    Refresca la caché compartida desde Google Sheets o archivo Excel.
+    
+    Las revisiones de todas las fuentes se consultan en paralelo, cada una con
+    su tiempo máximo (SOURCE_TIMEOUTS), y se usa la primera fuente disponible en
+    orden de prioridad. Solo se descargan los datos si la revisión cambió o si
+    los datos en caché aún no se sincronizaron con la hoja (ver
+    DatasetCache.is_synced()); si la descarga
+    falla o se excede su tiempo, se pasa a la siguiente fuente. El resultado y
+    la duración de cada intento quedan en el reporte de carga (ver
+    get_load_report()).
+    
+    El nuevo DataFrame se publica reemplazando la referencia en la caché, de
+    modo que los lectores nunca ven datos a medio actualizar.
+    
+    Args:
+        force (bool): Consultar la revisión aunque se haya comprobado hace poco.
+    
+    Returns:
+        str: 'fetched' si se descargaron datos nuevos, 'fresh' si la caché ya
+        estaba al día y 'failed' si ninguna fuente respondió.
+    """
+    cache = _dataset_cache
+    
+    with cache.lock:
+        # No volver a consultar si la revisión se comprobó hace poco
+        if not force and cache.df is not None and time.time() - cache.checked_at < REVISION_CHECK_INTERVAL:
+            return 'fresh'
+        
+        report = _new_report()
+        started = time.perf_counter()
+        probes = {name: _executor.submit(_timed, probe, cache) for name, probe in SOURCES}
+        
+        for name, _ in SOURCES:
+            probe_timeout, fetch_timeout = SOURCE_TIMEOUTS[name]
+            
+            # Las consultas corren en paralelo desde `started`; cada una tiene su plazo
+            status, probe, error, seconds = _wait(probes[name], started + probe_timeout - time.perf_counter(), started)
+            if status == 'ok' and probe is None:
+                status = 'unavailable'
+            _record_attempt(report, name, 'revision', status, seconds, error)
+            if status != 'ok':
+                if name == 'Google Sheets' and error is not None:
+                    # Descartar el cliente compartido si las credenciales dejaron de ser válidas
+                    reset_sheets_client(error)
+                continue
+            
+            revision, source, fetch = probe
+            if cache.is_fresh(revision) and cache.is_synced():
+                cache.checked_at = time.time()
+                return _finish_report(cache, report, 'fresh', source)
+            
+            status, df, error, seconds = _wait(_executor.submit(_timed, fetch), fetch_timeout, time.perf_counter())
+            if status == 'ok' and df is None:
+                status = 'unavailable'
+            _record_attempt(report, name, 'fetch', status, seconds, error)
+            if status != 'ok':
+                if name == 'Google Sheets' and error is not None:
+                    reset_sheets_client(error)
+                continue
+            
+            df = apply_schema(df)
+            cache.misses += 1
+            cache.store(df, revision, source)
+            _save_snapshot(df, revision, source)
+            return _finish_report(cache, report, 'fetched', source)
+        
+        return _finish_report(cache, report, 'failed')
+
+
+def load_data():
+    """
+    Carga los datos desde Google Sheets o archivo Excel.
+    
+    Los datos se guardan en una caché compartida por todas las sesiones y solo
+    se vuelven a descargar cuando cambia la revisión de la fuente. Al iniciar el
+    proceso se leen de la instantánea local; Google Sheets y Excel solo se usan
+    para refrescarla. Si el refresco en segundo plano está activo, las fuentes
+    no se consultan desde aquí salvo que todavía no haya ningún dato.
+    
+    Returns:
+        pandas.DataFrame: Dataframe con los datos cargados.
+    """
+    cache = _dataset_cache
+    
+    # En el arranque en frío, leer la última instantánea local
+    if cache.df is None:
+        with cache.lock:
+            if cache.df is None:
+                cache.load_snapshot()
+    
+    status = None
+    if cache.df is None or not cache.background:
+        status = refresh_data()
+    
+    # Si las fuentes fallan, seguir sirviendo los últimos datos buenos
+    df = cache.df
+    if df is not None:
+        if status != 'fetched':
+            cache.hits += 1
+        return _serve(df)
     
     # Si llegamos aquí, creamos un DataFrame vacío con las columnas esperadas
     # para evitar errores en el resto de la aplicación
-    empty_df = pd.DataFrame({
-        'ID': [],
-        'FECHA': [],
-        'NOMBRE_COMEDOR': [],
-        'NOMBER_GESTORA': [],
-        'TELEFONO1': [],
-        'DIRECCION': [],
-        'COMUNA': [],
-        'BARRIO': [],
-        'NODO': [],
-        'NICHO': [],
-        'PREFESIONAL_REALIZA_VISITA': [],
-        'LUGAR_DONDE_FUNCIONA_COMEDOR': [],
-        'ESPACIO_TALLERES': [],
-        'ARTICULACION_CON_ORGANIZACIONES': [],
-        'HISTORIA_COMEDOR': [],
-        'PARTICIPACION_ACTIVIDADES': [],
-        'USO_DE_TIC': [],
-        'QUE_REDES': [],
-        'HA_TENIDO_DIFICULTADES': [],
-        'FINANCIACION_ACTIVIDADES': [],
-        'POBLACION_PRINCIPAL_COMEDOR': [],
-        'ETAPA_VITAL': [],
-        'BENEFICIARIOS_SON_MISMOS_QUE_REALIZA_LABORA_SOCIAL': [],
-        'ACCIONES_PUNTUALES_COMEDOR': [],
-        'VINCULACION_OTROS_ACTORES': [],
-        'SEGUIMIENTO_EVALUACION_A_OTRAS_ACTIVIDADES': [],
-        'INICIATIVA_HUERTAS': [],
-        'INTERESADO_COMO_CENTRO_DESARROLLO': [],
-        'NECESIDADES_QUE_SE_APOYARAN': [],
-        'USER': [],
-        'NOMBRE': [],
-        'UBICACION': [],
-        'Observaciones1': [],
-        'Observaciones2': [],
-        'OBSERVACIONES_ALIANZAS_ESTRATEGICAS': [],
-        'OBSERVACIONES_AREA_FINANCIAMIENTO': [],
-        'OBSERVACIONES_CAPACITACION_INTEGRAL': [],
-        'OBSERVACIONES_VISIBILIDAD_RECONOCIMIENTO': [],
-        'OBSERVACIONES_PROCESOS_PLANIFICACIONES': [],
-        'RECURSO_HUMANO_CON_EL_QUE_CUENTA': [],
-        'OBSERVACIONES': [],
-    })
+    empty_df = pd.DataFrame({col: [] for col in EXPECTED_COLUMNS})
     
     return empty_df
\ No newline at end of file
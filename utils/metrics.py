@@ -0,0 +1,131 @@
+"""
+Módulo con las métricas de las páginas que también se publican en la API.
+
+Cada función recibe el DataFrame de visitas (completo o filtrado) y devuelve
+los números que muestra la página correspondiente, sin dibujar nada. Las
+páginas de Streamlit y la API JSON (ver utils.api) usan estas mismas funciones,
+de modo que ambas muestran siempre las mismas cifras.
+"""
+
+import numpy as np
+import pandas as pd
+from utils.load_data import get_counts
+
+INTEREST_COLUMN = 'INTERESADO_COMO_CENTRO_DESARROLLO'
+NEEDS_COLUMN = 'NECESIDADES_QUE_SE_APOYARAN'
+NEEDS_TABLE = 'NECESIDADES'
+FUNDING_COLUMN = 'FINANCIACION_ACTIVIDADES'
+
+# Dimensiones de la matriz de evaluación: (columna de puntaje, columna de datos)
+EVALUATION_SCORES = [
+    ('score_infra', 'ESPACIO_TALLERES'),
+    ('score_artic', 'ARTICULACION_CON_ORGANIZACIONES'),
+    ('score_partic', 'PARTICIPACION_ACTIVIDADES'),
+    ('score_tech', 'USO_DE_TIC'),
+    ('score_interes', INTEREST_COLUMN),
+]
+
+
+def interest_summary(df):
+    """
+    Calcula el interés de los comedores en convertirse en CEDECO.
+
+    Args:
+        df (pandas.DataFrame): Datos a analizar.
+
+    Returns:
+        dict: Total de comedores, interesados, porcentaje redondeado y conteo
+        por respuesta (DataFrame con columnas 'Interesado' y 'Cantidad'), o None
+        si falta la columna.
+    """
+    if INTEREST_COLUMN not in df.columns:
+        return None
+    total = len(df)
+    interesados = int((df[INTEREST_COLUMN] == 'SI').sum())
+    return {
+        'total': total,
+        'interesados': interesados,
+        'porcentaje': round((interesados / total) * 100) if total > 0 else 0,
+        'conteos': get_counts(df, INTEREST_COLUMN, 'Interesado'),
+    }
+
+
+def needs_ranking(df):
+    """
+    Ordena las necesidades para la transformación a CEDECO.
+
+    Args:
+        df (pandas.DataFrame): Datos a analizar.
+
+    Returns:
+        pandas.DataFrame: Columnas 'Necesidad' y 'Cantidad', de mayor a menor,
+        o None si falta la columna.
+    """
+    if NEEDS_COLUMN not in df.columns:
+        return None
+    return get_counts(df, NEEDS_TABLE, 'Necesidad')
+
+
+def funding_sources(df):
+    """
+    Cuenta las fuentes de financiación de las actividades.
+
+    Args:
+        df (pandas.DataFrame): Datos a analizar.
+
+    Returns:
+        pandas.DataFrame: Columnas 'Fuente' y 'Cantidad', de mayor a menor, o
+        None si falta la columna.
+    """
+    if FUNDING_COLUMN not in df.columns:
+        return None
+    return get_counts(df, FUNDING_COLUMN, 'Fuente')
+
+
+def create_evaluation_matrix(df):
+    """
+    Crea una matriz de evaluación del potencial de los comedores para ser CEDECO.
+
+    Cada dimensión suma un punto si el comedor la cumple; con 4 o más puntos el
+    potencial es 'Alto', con 2 o 3 'Medio' y con menos 'Bajo'.
+
+    Args:
+        df (pandas.DataFrame): Datos a analizar.
+
+    Returns:
+        pandas.DataFrame: Nombre del comedor, puntaje por dimensión, puntaje
+        total y potencial, o None si no hay datos.
+    """
+    if len(df) == 0:
+        return None
+
+    df_eval = pd.DataFrame(index=df.index)
+    df_eval['NOMBRE_COMEDOR'] = df['NOMBRE_COMEDOR'] if 'NOMBRE_COMEDOR' in df.columns else None
+    for score_col, col in EVALUATION_SCORES:
+        if col not in df.columns:
+            df_eval[score_col] = 0
+        elif col == 'USO_DE_TIC':
+            df_eval[score_col] = (df[col].notna() & (df[col] != '')).astype(int)
+        else:
+            df_eval[score_col] = (df[col] == 'SI').astype(int)
+
+    df_eval['score_total'] = df_eval[[score_col for score_col, _ in EVALUATION_SCORES]].sum(axis=1)
+    df_eval['potencial'] = np.select(
+        [df_eval['score_total'] >= 4, df_eval['score_total'] >= 2], ['Alto', 'Medio'], 'Bajo'
+    )
+    return df_eval
+
+
+def potential_counts(df_eval):
+    """
+    Cuenta los comedores por nivel de potencial de la matriz de evaluación.
+
+    Args:
+        df_eval (pandas.DataFrame): Resultado de create_evaluation_matrix().
+
+    Returns:
+        pandas.DataFrame: Columnas 'Nivel de Potencial' y 'Cantidad'.
+    """
+    counts = df_eval['potencial'].value_counts().reset_index()
+    counts.columns = ['Nivel de Potencial', 'Cantidad']
+    return counts
@@ -0,0 +1,121 @@
+"""
+Módulo para importar las páginas del dashboard solo cuando se visitan.
+
+Las páginas dependen de librerías pesadas (plotly, matplotlib, wordcloud) que
+no hacen falta para mostrar la página de inicio. Cada módulo de página se
+importa la primera vez que se navega a su sección y queda en sys.modules para
+las siguientes ejecuciones del script. Se registra cuánto tardó cada primera
+importación.
+
+Uso desde la línea de comandos, para medir el costo de importar cada página
+por separado (cada una en un proceso nuevo):
+
+    python -m utils.page_loader
+"""
+
+import importlib
+import os
+import subprocess
+import sys
+import threading
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Páginas por sección: (módulo, función). Los módulos se importan al visitar
+# la sección por primera vez (ver load_page())
+PAGES = {
+    "Inicio": ('pages.home', 'show_home_page'),
+    "Información Básica": ('pages.basic_info', 'show_basic_info'),
+    "Infraestructura y Funcionamiento": ('pages.infrastructure', 'show_infrastructure'),
+    "Historia y Participación": ('pages.history', 'show_history_participation'),
+    "Uso de Tecnología y Comunicación": ('pages.technology', 'show_technology'),
+    "Financiación y Dificultades": ('pages.financing', 'show_financing'),
+    "Población Atendida": ('pages.population', 'show_population'),
+    "Actividades Realizadas": ('pages.activities', 'show_activities'),
+    "Potencial como Centro de Desarrollo": ('pages.development', 'show_development_potential'),
+    "Búsqueda en Textos": ('pages.search', 'show_search'),
+}
+
+
+# Módulos que main.py importa siempre; su costo no se atribuye a las páginas
+BASE_MODULES = ['streamlit', 'pandas', 'utils.load_data']
+
+_lock = threading.Lock()
+_import_seconds = {}
+
+
+def load_page(module_name, function_name):
+    """
+    Devuelve la función que muestra una página, importando su módulo si hace falta.
+
+    Args:
+        module_name (str): Módulo de la página, por ejemplo 'pages.history'.
+        function_name (str): Función del módulo que muestra la página.
+
+    Returns:
+        callable: Función de la página.
+    """
+    module = sys.modules.get(module_name)
+    if module is None:
+        with _lock:
+            start = time.perf_counter()
+            module = importlib.import_module(module_name)
+            # Solo se registra la primera importación; las dependencias compartidas
+            # con páginas ya visitadas no vuelven a contarse
+            _import_seconds.setdefault(module_name, time.perf_counter() - start)
+    return getattr(module, function_name)
+
+
+def get_import_stats():
+    """
+    Devuelve el tiempo de la primera importación de cada página en este proceso.
+
+    Returns:
+        dict: Segundos por nombre de módulo.
+    """
+    return dict(_import_seconds)
+
+
+def measure_import_costs(module_names):
+    """
+    Mide el costo de importar cada página en un proceso nuevo.
+
+    En cada proceso se importan primero BASE_MODULES, de modo que la medición
+    es el costo adicional de la página sobre el arranque de main.py. A
+    diferencia de get_import_stats(), cada medición incluye todas las
+    dependencias propias de la página, aunque otras páginas también las usen.
+
+    Args:
+        module_names (list): Módulos de página a medir.
+
+    Returns:
+        dict: Segundos por nombre de módulo.
+    """
+    code = (
+        "import importlib, sys, time\n"
+        f"for name in {BASE_MODULES!r}: importlib.import_module(name)\n"
+        "start = time.perf_counter()\n"
+        "importlib.import_module(sys.argv[1])\n"
+        "print(time.perf_counter() - start)\n"
+    )
+    costs = {}
+    for module_name in module_names:
+        output = subprocess.run(
+            [sys.executable, '-c', code, module_name], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        )
+        costs[module_name] = float(output.stdout.strip().splitlines()[-1])
+    return costs
+
+
+def main():
+    pages_dir = os.path.join(ROOT_DIR, 'pages')
+    module_names = sorted(
+        f"pages.{name[:-3]}" for name in os.listdir(pages_dir) if name.endswith('.py') and name != '__init__.py'
+    )
+    for module_name, seconds in measure_import_costs(module_names).items():
+        print(f"{module_name:<25} {seconds * 1000:>8.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
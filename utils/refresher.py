@@ -0,0 +1,82 @@
+"""
+Módulo con el hilo de fondo que mantiene actualizados los datos en caché.
+
+El hilo se inicia una sola vez por proceso del servidor y refresca los datos
+periódicamente o cuando se solicita, de modo que ningún hilo de petición de
+Streamlit tenga que esperar a Google Sheets o a openpyxl.
+"""
+
+import os
+import threading
+import time
+from utils.load_data import refresh_data, set_background_refresh
+
+# Segundos entre refrescos programados
+REFRESH_INTERVAL = int(os.environ.get('CEDECO_REFRESH_INTERVAL', '60'))
+
+
+class DataRefresher(threading.Thread):
+    """
+    Hilo que refresca la caché compartida de datos.
+
+    Args:
+        interval (int): Segundos entre refrescos programados.
+    """
+
+    def __init__(self, interval=REFRESH_INTERVAL):
+        super().__init__(name='cedeco-data-refresher', daemon=True)
+        self.interval = interval
+        self._wake = threading.Event()
+        self.last_run = None
+        self.last_status = None
+        self.last_duration = None
+        self.last_error = None
+        self.runs = 0
+
+    def request_refresh(self):
+        """Solicita un refresco inmediato sin esperar a que termine."""
+        self._wake.set()
+
+    def run(self):
+        while True:
+            start = time.time()
+            try:
+                self.last_status = refresh_data(force=True)
+                self.last_error = None
+            except Exception as e:
+                self.last_status = 'failed'
+                self.last_error = str(e)
+            self.last_duration = time.time() - start
+            self.last_run = time.time()
+            self.runs += 1
+
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+
+_refresher = None
+_refresher_lock = threading.Lock()
+
+
+def start_refresher(interval=REFRESH_INTERVAL):
+    """
+    Inicia el hilo de refresco si aún no está corriendo en este proceso.
+
+    Args:
+        interval (int): Segundos entre refrescos programados.
+
+    Returns:
+        DataRefresher: El hilo de refresco del proceso.
+    """
+    global _refresher
+    with _refresher_lock:
+        if _refresher is None or not _refresher.is_alive():
+            _refresher = DataRefresher(interval)
+            _refresher.start()
+            set_background_refresh(True)
+    return _refresher
+
+
+def get_refresher():
+    """Devuelve el hilo de refresco del proceso o None si no se ha iniciado."""
+    return _refresher
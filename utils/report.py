@@ -0,0 +1,423 @@
+"""
+Módulo para exportar reportes estáticos del dashboard por grupos de comedores.
+
+Cada reporte contiene todas las secciones del dashboard (gráficos, métricas,
+tablas y conclusiones) para un subconjunto de las visitas elegido con los
+filtros globales, por ejemplo una comuna o un nodo. Las páginas se ejecutan
+sin navegador mediante AppTest de Streamlit, igual que en utils.benchmark, y lo
+que emiten se convierte en un archivo HTML independiente y, opcionalmente, en
+PDF. Así el reporte muestra exactamente lo mismo que el dashboard sin duplicar
+el código de cada página. Como los elementos de AppTest cambian entre versiones
+de Streamlit, la versión está fijada en requirements.txt.
+
+Los reportes se generan en paralelo en un grupo de procesos. Los datos se
+cargan una sola vez antes de repartir el trabajo: cada proceso usa esa misma
+versión (heredada del proceso principal o leída de la instantánea local) con
+sus tablas de respuestas, índice de filtros y cubo de conteos, sin volver a
+consultar Google Sheets ni Excel.
+
+La exportación a PDF requiere los paquetes opcionales `kaleido` (imágenes de
+los gráficos) y `weasyprint` (conversión del HTML).
+
+Uso desde la línea de comandos:
+
+    python -m utils.report --por comuna nodo --formato html pdf --salida reportes
+"""
+
+import argparse
+import base64
+import datetime
+import html
+import os
+import re
+import sys
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+DEFAULT_OUTPUT = 'reportes'
+DEFAULT_FORMATS = ['html']
+
+# Tiempo máximo (segundos) de ejecución de cada sección
+RUN_TIMEOUT = 600
+
+# Filas máximas de cada tabla en el reporte
+TABLE_ROWS = 50
+
+# Archivo de plotly.js compartido por los reportes HTML del directorio
+PLOTLY_JS = 'plotly.min.js'
+
+# Secciones que no dependen de los datos o que solo sirven de forma interactiva,
+# y no se incluyen en los reportes
+SKIPPED_SECTIONS = ['Inicio', 'Búsqueda en Textos']
+
+REPORT_STYLE = """
+    body { font-family: sans-serif; max-width: 1200px; margin: 0 auto; padding: 1rem 2rem; color: #1F2937; }
+    .row { display: flex; gap: 1.5rem; }
+    .row > .col { flex: 1; min-width: 0; }
+    .metric { border: 1px solid #DBEAFE; border-radius: 0.5rem; padding: 0.8rem; margin: 0.5rem 0; }
+    .metric .label { font-size: 0.9rem; color: #6B7280; }
+    .metric .value { font-size: 1.8rem; }
+    .metric .delta { color: #15803D; }
+    .alert { padding: 0.8rem; border-radius: 0.5rem; margin: 0.5rem 0; background-color: #EFF6FF; }
+    .alert.warning { background-color: #FEF3C7; }
+    .alert.error { background-color: #FEE2E2; }
+    table { border-collapse: collapse; font-size: 0.8rem; }
+    th, td { border: 1px solid #E5E7EB; padding: 0.2rem 0.4rem; }
+    img { max-width: 100%; }
+    .figure { page-break-inside: avoid; }
+    section.page { page-break-before: always; }
+"""
+
+
+def _section_script(module_name, function_name, selections):
+    """
+    Script que AppTest ejecuta para mostrar una sección con los filtros dados.
+
+    AppTest ejecuta el código fuente de esta función como un script aparte, por
+    lo que todas las importaciones deben estar dentro de ella.
+    """
+    from utils.load_data import load_data, get_filter_index
+    from utils.filters import apply_filters
+    from utils.page_loader import load_page
+    from utils.wordclouds import collect_shown
+
+    # Las páginas dejan en el estado de la sesión los bytes de las imágenes que muestran
+    collect_shown()
+    df = load_data()
+    df = apply_filters(df, get_filter_index(df), selections)
+    load_page(module_name, function_name)(df)
+
+
+def _slug(text):
+    """Convierte un texto en un nombre de archivo sin acentos ni espacios."""
+    text = unicodedata.normalize('NFKD', str(text)).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^A-Za-z0-9]+', '-', text).strip('-').lower() or 'reporte'
+
+
+def _markdown_html(text):
+    """
+    Convierte el Markdown que usan las páginas en HTML.
+
+    Las páginas emiten sobre todo HTML; del Markdown solo se usan títulos con
+    '#' y texto en negrita o cursiva.
+    """
+    blocks = []
+    for block in re.split(r'\n\s*\n', text.strip()):
+        block = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', block)
+        block = re.sub(r'(?<![\w*])\*(?!\s)(.+?)\*', r'<em>\1</em>', block)
+        heading = re.match(r'\s*(#{1,6})\s+(.*)', block, re.S)
+        if heading:
+            level = len(heading.group(1))
+            blocks.append(f"<h{level}>{heading.group(2)}</h{level}>")
+        elif block.lstrip().startswith('<'):
+            blocks.append(block)
+        else:
+            blocks.append(f"<p>{block}</p>")
+    return '\n'.join(blocks)
+
+
+def _figure_html(proto, static, include_plotlyjs):
+    """Convierte un gráfico de plotly en HTML interactivo o en una imagen PNG."""
+    import plotly.io as pio
+
+    figure = pio.from_json(proto.spec)
+    if static:
+        png = figure.to_image(format='png', width=900, height=500)
+        return f'<img src="data:image/png;base64,{base64.b64encode(png).decode()}">'
+    return pio.to_html(figure, full_html=False, include_plotlyjs='directory' if include_plotlyjs else False)
+
+
+def _image_html(png):
+    """Convierte una imagen PNG en una etiqueta <img> con los datos incluidos."""
+    return f'<img src="data:image/png;base64,{base64.b64encode(png).decode()}">'
+
+
+class _Renderer:
+    """
+    Convierte el árbol de elementos de una ejecución de AppTest en HTML.
+
+    Args:
+        static (bool): Dibujar los gráficos como imágenes (para PDF) en lugar
+            de gráficos interactivos.
+    """
+
+    def __init__(self, static=False):
+        self.static = static
+        self.plotlyjs_included = False
+        self.images = iter(())
+        self.missing_images = 0
+
+    def render_section(self, node, images):
+        """
+        Convierte una sección en HTML.
+
+        Args:
+            node: Raíz del árbol de elementos de la ejecución.
+            images (list): Imágenes PNG que mostró la sección, en orden (ver
+                utils.wordclouds.collect_shown()).
+
+        Returns:
+            str: HTML de la sección.
+        """
+        self.images = iter(images)
+        self.missing_images = 0
+        return self.render(node)
+
+    def render(self, node):
+        return '\n'.join(self._element(child) for child in node.children.values())
+
+    def _element(self, node):
+        from streamlit.testing.v1 import element_tree as et
+
+        kind = getattr(node, 'type', None)
+        if isinstance(node, et.Markdown):
+            return _markdown_html(node.value)
+        if isinstance(node, (et.Title, et.Header, et.Subheader)):
+            return f"<h2>{html.escape(node.value)}</h2>"
+        if isinstance(node, et.Caption):
+            return f"<p><small>{html.escape(node.value)}</small></p>"
+        if isinstance(node, et.Metric):
+            delta = f'<div class="delta">{html.escape(node.delta)}</div>' if node.delta else ''
+            return (
+                f'<div class="metric"><div class="label">{html.escape(node.label)}</div>'
+                f'<div class="value">{html.escape(node.value)}</div>{delta}</div>'
+            )
+        if isinstance(node, (et.Info, et.Success, et.Warning, et.Error)):
+            level = type(node).__name__.lower()
+            return f'<div class="alert {level}">{_markdown_html(node.value)}</div>'
+        if isinstance(node, (et.Dataframe, et.Table)):
+            table = node.value
+            note = f"<p><small>Primeras {TABLE_ROWS} de {len(table)} filas.</small></p>" if len(table) > TABLE_ROWS else ''
+            return table.head(TABLE_ROWS).to_html(index=False, na_rep='') + note
+        if kind == 'plotly_chart':
+            include = not self.static and not self.plotlyjs_included
+            self.plotlyjs_included = self.plotlyjs_included or include
+            return f'<div class="figure">{_figure_html(node.proto, self.static, include)}</div>'
+        if kind == 'imgs':
+            parts = []
+            for _ in node.proto.imgs:
+                png = next(self.images, None)
+                if png is None:
+                    self.missing_images += 1
+                else:
+                    parts.append(_image_html(png))
+            return f'<div class="figure">{"".join(parts)}</div>'
+        if isinstance(node, et.Tab):
+            return f"<h4>{html.escape(node.label)}</h4>\n{self.render(node)}"
+        if isinstance(node, et.Expander):
+            return f"<details open><summary>{html.escape(node.label)}</summary>\n{self.render(node)}</details>"
+        if isinstance(node, et.Column):
+            return f'<div class="col">{self.render(node)}</div>'
+        if kind == 'horizontal':
+            return f'<div class="row">{self.render(node)}</div>'
+        if isinstance(node, et.Block):
+            return self.render(node)
+        # Otros elementos (widgets, spinners) no tienen contenido para el reporte
+        return ''
+
+
+def render_cohort(title, selections, formats, output_dir):
+    """
+    Genera el reporte de un grupo de visitas con todas las secciones.
+
+    Debe ejecutarse en un proceso con los datos ya cargados en la caché (ver
+    _init_worker()).
+
+    Args:
+        title (str): Título del reporte, por ejemplo 'Comuna 15'.
+        selections (dict): Filtros globales del grupo (columna -> valores).
+        formats (list): Formatos a generar: 'html' y/o 'pdf'.
+        output_dir (str): Directorio de salida.
+
+    Returns:
+        dict: Título, archivos generados, visitas del grupo, segundos y errores.
+    """
+    from streamlit.testing.v1 import AppTest
+    from utils.load_data import load_data, get_filter_index
+    from utils.filters import apply_filters
+    from utils.page_loader import PAGES
+    from utils.styles import PAGE_STYLE
+    from utils.wordclouds import SHOWN_WORDCLOUDS_KEY
+
+    start = time.perf_counter()
+    df = load_data()
+    visits = len(apply_filters(df, get_filter_index(df), selections))
+
+    renderers = {fmt: _Renderer(static=(fmt == 'pdf')) for fmt in formats}
+    bodies = {fmt: [] for fmt in formats}
+    errors = []
+    for section, (module_name, function_name) in PAGES.items():
+        if section in SKIPPED_SECTIONS:
+            continue
+        app = AppTest.from_function(
+            _section_script, args=(module_name, function_name, selections), default_timeout=RUN_TIMEOUT
+        )
+        app.run()
+        errors.extend(f"{section}: {exception.value}" for exception in app.exception)
+        images = list(app.session_state[SHOWN_WORDCLOUDS_KEY]) if SHOWN_WORDCLOUDS_KEY in app.session_state else []
+        for fmt, renderer in renderers.items():
+            body = renderer.render_section(app.main, images)
+            bodies[fmt].append(f'<section class="page">\n{body}\n</section>')
+            if renderer.missing_images:
+                errors.append(f"{section}: {renderer.missing_images} imágenes sin datos en el reporte {fmt}")
+
+    created = datetime.datetime.now().strftime('%Y-%m-%d %H:%M')
+    files = []
+    for fmt in formats:
+        document = (
+            '<!DOCTYPE html>\n<html lang="es">\n<head>\n<meta charset="utf-8">\n'
+            f'<title>CEDECO - {html.escape(title)}</title>\n'
+            f'<style>{PAGE_STYLE}{REPORT_STYLE}</style>\n</head>\n<body>\n'
+            f'<div class="main-header">CEDECO - {html.escape(title)}</div>\n'
+            f'<p>{visits} visitas · generado el {created}</p>\n'
+            + '\n'.join(bodies[fmt]) + '\n</body>\n</html>\n'
+        )
+        path = os.path.join(output_dir, f"{_slug(title)}.{fmt}")
+        if fmt == 'pdf':
+            from weasyprint import HTML
+            HTML(string=document).write_pdf(path)
+        else:
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(document)
+        files.append(path)
+
+    return {
+        'title': title,
+        'files': files,
+        'visits': visits,
+        'seconds': round(time.perf_counter() - start, 2),
+        'errors': errors,
+    }
+
+
+def cohorts(dimensions):
+    """
+    Devuelve los grupos de visitas a exportar: uno general y uno por cada valor
+    de las dimensiones pedidas.
+
+    Args:
+        dimensions (list): Columnas de filtro (ver utils.filters.FILTER_COLUMNS).
+
+    Returns:
+        list: Pares (título, filtros).
+    """
+    from utils.load_data import load_data, get_filter_index
+    from utils.filters import FILTER_COLUMNS
+
+    index = get_filter_index(load_data())
+    groups = [('Todos los comedores', {})]
+    for column in dimensions:
+        for value in index.values(column):
+            groups.append((f"{FILTER_COLUMNS[column]} {value}", {column: [value]}))
+    return groups
+
+
+def _init_worker():
+    """Prepara un proceso del grupo para usar los datos ya cargados sin refrescarlos."""
+    from utils.load_data import load_data, set_background_refresh
+    from utils.wordclouds import WORDCLOUD_PROCESSES_ENV
+
+    # Cada proceso ya es parte de un grupo: las nubes de palabras se generan en él
+    os.environ[WORDCLOUD_PROCESSES_ENV] = '0'
+    # Con 'fork' la caché ya viene del proceso principal; si no, se lee de la instantánea
+    set_background_refresh(True)
+    load_data()
+
+
+def export_reports(dimensions, formats=DEFAULT_FORMATS, output_dir=DEFAULT_OUTPUT, processes=None):
+    """
+    Exporta en paralelo un reporte general y uno por cada valor de las dimensiones.
+
+    Args:
+        dimensions (list): Columnas de filtro por las que separar los reportes.
+        formats (list): Formatos a generar: 'html' y/o 'pdf'.
+        output_dir (str): Directorio de salida.
+        processes (int, optional): Número de procesos; por defecto, uno por CPU.
+
+    Returns:
+        list: Resultado de render_cohort() para cada reporte, en el orden de cohorts().
+    """
+    from utils.load_data import load_data, set_background_refresh
+    from utils.wordclouds import WORDCLOUD_PROCESSES_ENV
+
+    # Cada proceso ya es parte de un grupo: las nubes de palabras se generan en él
+    os.environ[WORDCLOUD_PROCESSES_ENV] = '0'
+    if 'pdf' in formats:
+        # Fallar antes de repartir el trabajo si faltan las dependencias opcionales
+        try:
+            import kaleido
+            import weasyprint
+        except ImportError as e:
+            raise RuntimeError("La exportación a PDF requiere los paquetes 'kaleido' y 'weasyprint'") from e
+
+    # Cargar los datos una vez; los procesos del grupo usan esta misma versión
+    load_data()
+    set_background_refresh(True)
+    groups = cohorts(dimensions)
+    os.makedirs(output_dir, exist_ok=True)
+    if 'html' in formats:
+        # plotly.js se escribe una vez y lo comparten todos los reportes HTML
+        from plotly.offline import get_plotlyjs
+        with open(os.path.join(output_dir, PLOTLY_JS), 'w', encoding='utf-8') as file:
+            file.write(get_plotlyjs())
+
+    results = [None] * len(groups)
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker) as pool:
+        futures = {
+            pool.submit(render_cohort, title, selections, formats, output_dir): position
+            for position, (title, selections) in enumerate(groups)
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            results[futures[future]] = result
+            print(f"{result['title']:<40} {result['visits']:>8} visitas {result['seconds']:>8.2f} s", file=sys.stderr)
+
+    _write_index(results, output_dir)
+    return results
+
+
+def _write_index(results, output_dir):
+    """Escribe index.html con enlaces a todos los reportes generados."""
+    items = '\n'.join(
+        f'<li>{html.escape(result["title"])} ({result["visits"]} visitas): '
+        + ' · '.join(
+            f'<a href="{html.escape(os.path.basename(path))}">{os.path.splitext(path)[1][1:].upper()}</a>'
+            for path in result['files']
+        )
+        + '</li>'
+        for result in results
+    )
+    with open(os.path.join(output_dir, 'index.html'), 'w', encoding='utf-8') as file:
+        file.write(
+            '<!DOCTYPE html>\n<html lang="es">\n<head><meta charset="utf-8"><title>Reportes CEDECO</title></head>\n'
+            f'<body>\n<h1>Reportes CEDECO</h1>\n<ul>\n{items}\n</ul>\n</body>\n</html>\n'
+        )
+
+
+def main():
+    from utils.filters import FILTER_COLUMNS
+
+    dimension_names = {label.lower(): column for column, label in FILTER_COLUMNS.items()}
+    parser = argparse.ArgumentParser(description="Exporta reportes estáticos del dashboard CEDECO.")
+    parser.add_argument('--por', nargs='*', default=[], choices=list(dimension_names),
+                        help="Dimensiones por las que generar un reporte por valor.")
+    parser.add_argument('--formato', nargs='+', default=DEFAULT_FORMATS, choices=['html', 'pdf'],
+                        help="Formatos de salida.")
+    parser.add_argument('--salida', default=DEFAULT_OUTPUT, help="Directorio de salida.")
+    parser.add_argument('--procesos', type=int, help="Número de procesos (por defecto, uno por CPU).")
+    args = parser.parse_args()
+
+    # Usar las funciones del módulo importado y no las de __main__: AppTest
+    # reemplaza __main__ en los procesos del grupo al ejecutar cada sección
+    from utils.report import export_reports as export
+
+    results = export([dimension_names[name] for name in args.por], args.formato, args.salida, args.procesos)
+    for result in results:
+        for error in result['errors']:
+            print(f"{result['title']}: {error}", file=sys.stderr)
+    print(f"{len(results)} reportes escritos en {args.salida}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
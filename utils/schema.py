@@ -0,0 +1,92 @@
+"""
+Módulo con el esquema tipado de los datos de visitas.
+
+El esquema se aplica una sola vez al cargar los datos. Las columnas de pocos
+valores distintos se guardan como categorías, de modo que ocupan una fracción
+de la memoria y value_counts/comparaciones trabajan sobre códigos enteros.
+"""
+
+import pandas as pd
+
+# Columnas de respuesta SI/NO
+YES_NO_COLUMNS = [
+    'ESPACIO_TALLERES',
+    'ARTICULACION_CON_ORGANIZACIONES',
+    'HISTORIA_COMEDOR',
+    'PARTICIPACION_ACTIVIDADES',
+    'HA_TENIDO_DIFICULTADES',
+    'BENEFICIARIOS_SON_MISMOS_QUE_REALIZA_LABORA_SOCIAL',
+    'SEGUIMIENTO_EVALUACION_A_OTRAS_ACTIVIDADES',
+    'INICIATIVA_HUERTAS',
+    'INTERESADO_COMO_CENTRO_DESARROLLO',
+]
+
+# Columnas de pocos valores distintos
+CATEGORY_COLUMNS = [
+    'COMUNA',
+    'BARRIO',
+    'NODO',
+    'NICHO',
+    'PREFESIONAL_REALIZA_VISITA',
+    'USER',
+    'LUGAR_DONDE_FUNCIONA_COMEDOR',
+    'POBLACION_PRINCIPAL_COMEDOR',
+    'VINCULACION_OTROS_ACTORES',
+]
+
+# Sufijo de las columnas de frecuencia de actividades, también categóricas
+FREQUENCY_SUFFIX = '_FRECUENCIA'
+
+YES_NO_DTYPE = pd.CategoricalDtype(['SI', 'NO'])
+
+
+def _to_yes_no(series):
+    """
+    Convierte una columna SI/NO a la categoría de dos valores.
+
+    Se normalizan mayúsculas, espacios y tildes ('Sí' → 'SI'); las celdas vacías
+    quedan como nulas. Si la columna tiene otras respuestas, se guarda como
+    categoría general para no perder información.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype) and series.dtype == YES_NO_DTYPE:
+        return series
+
+    text = series.astype('string').str.strip().str.upper().replace({'SÍ': 'SI', '': pd.NA})
+    if text.dropna().isin(YES_NO_DTYPE.categories).all():
+        return text.astype(object).astype(YES_NO_DTYPE)
+    return _to_category(series)
+
+
+def _to_category(series):
+    """Convierte una columna a categoría, unificando como texto los valores mezclados."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    if series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) not in ('string', 'empty'):
+        series = series.where(series.isna(), series.astype(str))
+    return series.astype('category')
+
+
+def apply_schema(df):
+    """
+    Aplica el esquema tipado al DataFrame de visitas.
+
+    Es idempotente, de modo que puede aplicarse de nuevo tras agregar filas
+    (por ejemplo, en la sincronización incremental).
+
+    Args:
+        df (pandas.DataFrame): Datos ya convertidos por utils.ingest.
+
+    Returns:
+        pandas.DataFrame: Datos con categorías en las columnas declaradas.
+    """
+    df = df.copy(deep=False)
+
+    for col in YES_NO_COLUMNS:
+        if col in df.columns:
+            df[col] = _to_yes_no(df[col])
+
+    for col in df.columns:
+        if col in CATEGORY_COLUMNS or FREQUENCY_SUFFIX in col:
+            df[col] = _to_category(df[col])
+
+    return df
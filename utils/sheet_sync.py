@@ -0,0 +1,269 @@
+"""
+Módulo para la sincronización incremental de la hoja CEDECO.
+
+La hoja solo crece a medida que los profesionales registran visitas, por lo que
+en lugar de descargar todos los registros en cada actualización se descargan
+únicamente las filas posteriores a la última sincronizada, usando la columna ID
+para verificar que las filas existentes no se hayan movido. Las ediciones de
+filas ya sincronizadas se detectan comparando el hash de unas pocas filas (las
+últimas sincronizadas y una ventana que recorre la hoja de un refresco a otro)
+con el de los datos anteriores; solo si alguno difiere, o cada
+FULL_SYNC_INTERVAL, se descarga la hoja completa (ver sync_worksheet()).
+"""
+
+import time
+from urllib.parse import quote
+import pandas as pd
+from gspread.urls import SPREADSHEET_VALUES_URL, SPREADSHEET_VALUES_BATCH_URL
+from gspread.utils import rowcol_to_a1
+from utils.ingest import frame_from_values, header_columns, source_columns
+from utils.schema import apply_schema
+
+ID_COLUMN = 'ID'
+
+# Tiempo máximo (segundos) sin descargar la hoja completa mientras la hoja sigue cambiando
+FULL_SYNC_INTERVAL = 6 * 3600
+
+# Filas ya sincronizadas que se verifican en cada sincronización incremental:
+# tantas al final de los datos y tantas en la ventana que recorre la hoja
+CHECK_ROWS = 200
+
+
+class SheetValues:
+    """
+    Acceso directo a los valores de una hoja mediante la API de valores.
+
+    A diferencia de gspread.Worksheet, no necesita descargar los metadatos del
+    libro ni listar sus hojas: cada lectura es una única petición HTTP.
+
+    Args:
+        client (gspread.Client): Cliente autorizado.
+        spreadsheet_id (str): Id del libro de cálculo.
+        title (str): Nombre de la hoja.
+    """
+
+    def __init__(self, client, spreadsheet_id, title):
+        self.client = client
+        self.spreadsheet_id = spreadsheet_id
+        self.title = title
+
+    def _range(self, range_name=None):
+        sheet = "'{}'".format(self.title.replace("'", "''"))
+        return f"{sheet}!{range_name}" if range_name else sheet
+
+    def get_values(self, range_name=None):
+        """Devuelve la cuadrícula de valores del rango (toda la hoja si no se indica)."""
+        url = SPREADSHEET_VALUES_URL % (self.spreadsheet_id, quote(self._range(range_name)))
+        response = self.client.request('get', url)
+        return response.json().get('values', [])
+
+    def batch_get(self, ranges):
+        """Devuelve los valores de varios rangos en una sola petición."""
+        url = SPREADSHEET_VALUES_BATCH_URL % self.spreadsheet_id
+        params = {'ranges': [self._range(r) for r in ranges]}
+        response = self.client.request('get', url, params=params)
+        return [value_range.get('values', []) for value_range in response.json().get('valueRanges', [])]
+
+
+def _column_letter(index):
+    """Convierte un índice de columna (base 1) en su letra A1."""
+    return rowcol_to_a1(1, index).rstrip('0123456789')
+
+
+def _id_strings(values):
+    """Normaliza una secuencia de ID como texto para compararlos."""
+    ids = pd.Series(values, dtype=object).astype('string').str.strip().fillna('')
+    return ids.str.replace(r'\.0$', '', regex=True)
+
+
+def row_hashes(df):
+    """
+    Calcula un hash por fila del DataFrame.
+
+    Args:
+        df (pandas.DataFrame): Datos a resumir.
+
+    Returns:
+        pandas.Series: Hash (uint64) de cada fila, alineado con el índice.
+    """
+    return pd.util.hash_pandas_object(df.astype(str), index=False)
+
+
+def _ids_match(previous_ids, current_ids):
+    """Verifica que las filas sincronizadas sigan en la misma posición de la hoja."""
+    if len(current_ids) < len(previous_ids):
+        return False
+    previous = _id_strings(previous_ids).to_numpy()
+    current = _id_strings(current_ids[:len(previous_ids)]).to_numpy()
+    return bool((previous == current).all())
+
+
+def _align_dtypes(new_df, previous_df):
+    """Convierte las filas nuevas a los tipos de las columnas ya sincronizadas."""
+    for col in new_df.columns:
+        if col not in previous_df.columns:
+            continue
+        previous_dtype = previous_df[col].dtype
+        # Las categorías se reconstruyen al aplicar el esquema sobre todos los datos
+        if isinstance(previous_dtype, pd.CategoricalDtype) or new_df[col].dtype == previous_dtype:
+            continue
+        try:
+            new_df[col] = new_df[col].replace('', pd.NA).astype(previous_dtype)
+        except (TypeError, ValueError):
+            pass
+    return new_df
+
+
+def full_sync(worksheet, previous_df=None):
+    """
+    Descarga la hoja completa y la compara con los datos anteriores.
+
+    Args:
+        worksheet (SheetValues): Hoja CEDECO.
+        previous_df (pandas.DataFrame, optional): Datos sincronizados previamente.
+
+    Returns:
+        tuple: (DataFrame, dict con el resumen de la sincronización).
+    """
+    values = worksheet.get_values()
+    if not values:
+        return pd.DataFrame(), {'mode': 'full', 'new_rows': 0, 'changed_rows': 0}
+
+    df = frame_from_values(values[0], values[1:])
+    report = {'mode': 'full', 'new_rows': len(df), 'changed_rows': 0}
+
+    columns = source_columns(df)
+    if previous_df is not None and ID_COLUMN in df.columns and source_columns(previous_df) == columns:
+        # Comparar hashes fila a fila para saber cuántas filas existentes cambiaron
+        common = min(len(previous_df), len(df))
+        report['changed_rows'] = _changed_rows(previous_df.iloc[:common], df.iloc[:common], columns)
+        report['new_rows'] = len(df) - common
+
+    return df, report
+
+
+def _changed_rows(previous_rows, rows, columns):
+    """
+    Cuenta las filas que difieren entre los datos anteriores y los descargados.
+
+    Los datos anteriores tienen el esquema aplicado, así que las filas
+    descargadas se comparan con el mismo esquema.
+    """
+    old_hashes = row_hashes(apply_schema(previous_rows[columns])).to_numpy()
+    new_hashes = row_hashes(apply_schema(rows[columns])).to_numpy()
+    return int((old_hashes != new_hashes).sum())
+
+
+def _check_ranges(synced, check_from):
+    """
+    Elige las filas ya sincronizadas que se verifican en una sincronización incremental.
+
+    Args:
+        synced (int): Filas ya sincronizadas.
+        check_from (int): Primera fila de la ventana que recorre la hoja.
+
+    Returns:
+        list: Pares (primera fila, fin) de filas de datos (base 0), sin
+        solaparse: las últimas CHECK_ROWS filas y la ventana, que vuelve al
+        inicio al llegar a las últimas filas.
+    """
+    tail_start = max(synced - CHECK_ROWS, 0)
+    if check_from >= tail_start:
+        check_from = 0
+    window = (check_from, min(check_from + CHECK_ROWS, tail_start))
+    ranges = [window] if window[0] < window[1] else []
+    if tail_start < synced:
+        ranges.append((tail_start, synced))
+    return ranges
+
+
+def sync_worksheet(worksheet, previous_df=None, last_full_sync=None, check_from=0):
+    """
+    Sincroniza la hoja CEDECO de forma incremental.
+
+    En una sola petición descarga los encabezados, la columna ID y unas pocas
+    filas ya sincronizadas: las últimas CHECK_ROWS y una ventana de CHECK_ROWS
+    filas desde `check_from`. Si los ID ya sincronizados siguen en el mismo
+    orden y las filas verificadas no cambiaron, descarga únicamente las filas
+    nuevas (si las hay) y las agrega a los datos anteriores. Si los ID o el
+    hash de alguna fila verificada no coinciden, o si pasó FULL_SYNC_INTERVAL
+    desde la última sincronización completa, se descarga la hoja completa y se
+    detectan las filas editadas mediante su hash.
+
+    Una edición fuera de las filas verificadas se detecta cuando la ventana
+    llega a esa fila o en la siguiente sincronización completa. El costo de
+    una sincronización incremental depende de las filas nuevas y de
+    CHECK_ROWS, no del total de filas de la hoja.
+
+    Args:
+        worksheet (SheetValues): Hoja CEDECO.
+        previous_df (pandas.DataFrame, optional): Datos sincronizados previamente.
+        last_full_sync (float, optional): Momento de la última sincronización
+            completa; None si los datos anteriores nunca se compararon con la
+            hoja (por ejemplo, si vienen de la instantánea local).
+        check_from (int): Primera fila de la ventana de verificación; se pasa
+            el 'next_check' del resumen de la sincronización anterior.
+
+    Returns:
+        tuple: (DataFrame, dict con el resumen de la sincronización). En las
+        sincronizaciones incrementales el resumen incluye las filas
+        verificadas ('checked_rows') y el inicio de la próxima ventana
+        ('next_check').
+    """
+    needs_full = (
+        previous_df is None
+        or previous_df.empty
+        or ID_COLUMN not in previous_df.columns
+        or last_full_sync is None
+        or time.time() - last_full_sync > FULL_SYNC_INTERVAL
+    )
+    if needs_full:
+        return full_sync(worksheet, previous_df)
+
+    # Encabezados, columna ID y filas a verificar en una sola petición; la
+    # posición del ID se toma de la sincronización anterior y se verifica con
+    # los encabezados recibidos
+    columns = source_columns(previous_df)
+    id_index = columns.index(ID_COLUMN)
+    id_letter = _column_letter(id_index + 1)
+    synced = len(previous_df)
+    checks = _check_ranges(synced, check_from)
+    # Fila de datos i (base 0) = fila i + 2 de la hoja
+    ranges = ['1:1', f'{id_letter}2:{id_letter}'] + [f'{start + 2}:{end + 1}' for start, end in checks]
+    header_row, id_values, *check_values = worksheet.batch_get(ranges)
+    raw_header = header_row[0] if header_row else []
+    header = header_columns(raw_header)
+    if header != columns or header.index(ID_COLUMN) != id_index:
+        return full_sync(worksheet, previous_df)
+    current_ids = [row[0] if row else '' for row in id_values]
+
+    if not _ids_match(previous_df[ID_COLUMN].tolist(), current_ids):
+        return full_sync(worksheet, previous_df)
+
+    # Filas ya sincronizadas editadas desde la sincronización anterior
+    for (start, end), rows in zip(checks, check_values):
+        previous_rows = previous_df.iloc[start:end]
+        current = _align_dtypes(frame_from_values(raw_header, rows).reindex(range(end - start), fill_value=''),
+                                previous_df)
+        if _changed_rows(previous_rows.reset_index(drop=True), current, columns):
+            return full_sync(worksheet, previous_df)
+
+    total = len(current_ids)
+    report = {
+        'mode': 'delta',
+        'new_rows': total - synced,
+        'changed_rows': 0,
+        'checked_rows': sum(end - start for start, end in checks),
+        'next_check': checks[0][1] if len(checks) > 1 else 0,
+    }
+    if total == synced:
+        # Sin filas nuevas y sin ediciones en las filas verificadas
+        return previous_df, report
+
+    # Descargar solo las filas posteriores a la última sincronizada
+    last_letter = _column_letter(len(raw_header))
+    rows = worksheet.get_values(f'A{synced + 2}:{last_letter}{total + 1}')
+    new_df = _align_dtypes(frame_from_values(raw_header, rows), previous_df)
+
+    df = pd.concat([previous_df, new_df], ignore_index=True)
+    return df, report
@@ -0,0 +1,187 @@
+"""
+Módulo con el cliente de Google Sheets compartido por el proceso.
+
+El cliente se autoriza una sola vez y mantiene abierta su sesión HTTP, de modo
+que las consultas sucesivas reutilizan el token y las conexiones. El token solo
+se renueva cuando está cerca de expirar. También se mide por separado el tiempo
+de autenticación y el de transferencia de datos.
+"""
+
+import datetime
+import os
+import threading
+import time
+from contextlib import contextmanager
+import requests
+import streamlit as st
+import gspread
+from google.auth.exceptions import RefreshError
+from google.auth.transport.requests import Request
+from google.oauth2.service_account import Credentials
+
+SCOPE = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
+DEFAULT_SPREADSHEET_ID = '1n7f_BWmVmdfvE75_HFf2az0DFGQUAMxqca-zEB91X-A'
+
+# Renovar el token cuando le queden menos de estos segundos de vigencia
+TOKEN_REFRESH_MARGIN = 300
+
+# Tiempo máximo (segundos) de espera de cada petición HTTP a Google
+REQUEST_TIMEOUT = float(os.environ.get('CEDECO_REQUEST_TIMEOUT', 30))
+
+
+def _load_credentials():
+    """
+    Obtiene las credenciales de servicio disponibles.
+
+    Returns:
+        tuple: (Credentials, id de la hoja de cálculo) o (None, None) si no hay credenciales.
+    """
+    # Verificar si hay credenciales de Streamlit Cloud
+    try:
+        if 'gcp_service_account' in st.secrets:
+            credentials_info = st.secrets["gcp_service_account"]
+            spreadsheet_id = st.secrets["sheets"]["spreadsheet_id"]
+            return Credentials.from_service_account_info(credentials_info, scopes=SCOPE), spreadsheet_id
+    except Exception as e:
+        # Silenciosamente pasar al siguiente método si falla
+        pass
+
+    # Intentar usar archivo credentials.json para Google Sheets
+    try:
+        if os.path.exists('credentials.json'):
+            return Credentials.from_service_account_file('credentials.json', scopes=SCOPE), DEFAULT_SPREADSHEET_ID
+    except Exception as e:
+        pass
+
+    return None, None
+
+
+class SheetsClientPool:
+    """
+    Cliente de gspread de larga duración compartido por todas las sesiones.
+
+    Lleva métricas separadas de autenticación (creación del cliente e
+    intercambio de token) y de transferencia de datos.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.client = None
+        self.credentials = None
+        self.spreadsheet_id = None
+        # Sesión HTTP sin autorizar para el intercambio de token: la sesión del
+        # cliente agrega el token a sus peticiones y podría renovarlo otra vez
+        self.token_session = requests.Session()
+        self.metrics = {
+            'auth_count': 0,
+            'auth_seconds': None,
+            'auth_total_seconds': 0.0,
+            'transfer_count': 0,
+            'transfer_seconds': None,
+            'transfer_total_seconds': 0.0,
+            'token_expiry': None,
+        }
+
+    def _record_auth(self, seconds):
+        self.metrics['auth_count'] += 1
+        self.metrics['auth_seconds'] = seconds
+        self.metrics['auth_total_seconds'] += seconds
+        self.metrics['token_expiry'] = self.credentials.expiry
+
+    def _token_expiring(self):
+        """Indica si el token no existe o le queda poco tiempo de vigencia."""
+        expiry = self.credentials.expiry
+        if not self.credentials.token or expiry is None:
+            return True
+        margin = datetime.timedelta(seconds=TOKEN_REFRESH_MARGIN)
+        return datetime.datetime.utcnow() >= expiry - margin
+
+    def get(self):
+        """
+        Devuelve el cliente autorizado, creándolo o renovando el token si hace falta.
+
+        Returns:
+            tuple: (cliente gspread, id de la hoja de cálculo) o (None, None) si no hay credenciales.
+        """
+        with self.lock:
+            if self.client is None:
+                start = time.perf_counter()
+                credentials, spreadsheet_id = _load_credentials()
+                if credentials is None:
+                    return None, None
+                self.credentials = credentials
+                self.spreadsheet_id = spreadsheet_id
+                self.client = gspread.authorize(credentials)
+                self.client.set_timeout(REQUEST_TIMEOUT)
+                self.credentials.refresh(Request(self.token_session))
+                self._record_auth(time.perf_counter() - start)
+            elif self._token_expiring():
+                start = time.perf_counter()
+                self.credentials.refresh(Request(self.token_session))
+                self._record_auth(time.perf_counter() - start)
+
+            return self.client, self.spreadsheet_id
+
+    def reset(self):
+        """Descarta el cliente actual para volver a autorizar en el próximo uso."""
+        with self.lock:
+            self.client = None
+            self.credentials = None
+
+    @contextmanager
+    def transfer(self):
+        """Mide el tiempo de una transferencia de datos con la API."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.metrics['transfer_count'] += 1
+            self.metrics['transfer_seconds'] = seconds
+            self.metrics['transfer_total_seconds'] += seconds
+
+    def stats(self):
+        """
+        Devuelve las métricas del cliente.
+
+        Returns:
+            dict: Conteos y tiempos de autenticación y de transferencia.
+        """
+        return dict(self.metrics, connected=self.client is not None)
+
+
+_pool = SheetsClientPool()
+
+
+def get_sheets_client():
+    """
+    Devuelve el cliente compartido de Google Sheets.
+
+    Returns:
+        tuple: (cliente gspread, id de la hoja de cálculo) o (None, None) si no hay credenciales.
+    """
+    return _pool.get()
+
+
+def sheets_transfer():
+    """Contexto que mide el tiempo de transferencia de datos con Google Sheets."""
+    return _pool.transfer()
+
+
+def reset_sheets_client(error=None):
+    """
+    Descarta el cliente compartido si el error indica credenciales inválidas.
+
+    Args:
+        error (Exception, optional): Error producido al usar el cliente. Sin
+            error, el cliente se descarta siempre.
+    """
+    if error is None or isinstance(error, RefreshError):
+        _pool.reset()
+    elif isinstance(error, gspread.exceptions.APIError) and error.response.status_code in (401, 403):
+        _pool.reset()
+
+
+def get_sheets_client_stats():
+    """Devuelve las métricas de autenticación y transferencia del cliente compartido."""
+    return _pool.stats()
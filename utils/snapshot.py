@@ -0,0 +1,111 @@
+"""
+Módulo para guardar y leer instantáneas locales de los datos en formato columnar.
+
+Cada carga exitosa desde Google Sheets o Excel se guarda como un archivo Arrow IPC
+(Feather v2 sin compresión), que se puede leer mediante mapeo de memoria en
+milisegundos al iniciar la aplicación.
+"""
+
+import os
+import tempfile
+import pandas as pd
+import pyarrow as pa
+
+SNAPSHOT_DIR = os.environ.get('CEDECO_SNAPSHOT_DIR', os.path.join('data', 'snapshot'))
+SNAPSHOT_FILE = 'CEDECO.arrow'
+
+
+def get_snapshot_path():
+    """Devuelve la ruta del archivo de instantánea."""
+    return os.path.join(SNAPSHOT_DIR, SNAPSHOT_FILE)
+
+
+def _to_arrow_table(df):
+    """
+    Convierte un DataFrame a tabla Arrow.
+
+    Las columnas de tipo object con valores mezclados (por ejemplo, teléfonos que
+    llegan como números y cadenas vacías desde Google Sheets) se convierten a texto
+    para que Arrow pueda asignarles un tipo único.
+
+    Args:
+        df (pandas.DataFrame): Datos a convertir.
+
+    Returns:
+        pyarrow.Table: Tabla Arrow equivalente.
+    """
+    df = df.copy(deep=False)
+    for col in df.columns:
+        if df[col].dtype == object:
+            inferred = pd.api.types.infer_dtype(df[col], skipna=True)
+            if inferred not in ('string', 'empty'):
+                df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def write_snapshot(df, revision, source):
+    """
+    Guarda el DataFrame como instantánea local de forma atómica.
+
+    Se escribe primero a un archivo temporal en el mismo directorio y luego se
+    renombra, de modo que los lectores nunca ven un archivo a medio escribir.
+
+    Args:
+        df (pandas.DataFrame): Datos a guardar.
+        revision (str): Revisión de la fuente de la que provienen los datos.
+        source (str): Nombre de la fuente (Google Sheets o archivo Excel).
+
+    Returns:
+        str: Ruta de la instantánea escrita.
+    """
+    path = get_snapshot_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    table = _to_arrow_table(df)
+    metadata = dict(table.schema.metadata or {})
+    metadata.update({
+        b'cedeco.revision': str(revision).encode('utf-8'),
+        b'cedeco.source': str(source).encode('utf-8'),
+    })
+    table = table.replace_schema_metadata(metadata)
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return path
+
+
+def read_snapshot():
+    """
+    Lee la instantánea local mediante mapeo de memoria.
+
+    Returns:
+        tuple: (DataFrame, dict con revision, source y written_at) o (None, None)
+        si no existe una instantánea válida.
+    """
+    path = get_snapshot_path()
+    if not os.path.exists(path):
+        return None, None
+
+    try:
+        with pa.memory_map(path, 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+            df = table.to_pandas()
+        metadata = table.schema.metadata or {}
+        info = {
+            'revision': metadata.get(b'cedeco.revision', b'').decode('utf-8') or None,
+            'source': metadata.get(b'cedeco.source', b'').decode('utf-8') or None,
+            'written_at': os.path.getmtime(path),
+        }
+        return df, info
+    except Exception as e:
+        # Una instantánea corrupta se ignora; se regenerará en la próxima carga
+        return None, None
@@ -0,0 +1,40 @@
+"""
+Módulo con los estilos CSS del dashboard.
+
+Los usan main.py en la aplicación de Streamlit y utils.report en los reportes
+estáticos, para que ambos muestren los encabezados y conclusiones igual.
+"""
+
+# Estilos de las clases usadas por las páginas (encabezados, conclusiones)
+PAGE_STYLE = """
+    .main-header {
+        font-size: 2.5rem;
+        color: #1E3A8A;
+        text-align: center;
+        margin-bottom: 1rem;
+    }
+    .section-header {
+        font-size: 1.8rem;
+        color: #2563EB;
+        margin-top: 2rem;
+        margin-bottom: 1rem;
+    }
+    .subsection-header {
+        font-size: 1.4rem;
+        color: #3B82F6;
+        margin-top: 1.5rem;
+        margin-bottom: 0.8rem;
+    }
+    .highlight {
+        background-color: #DBEAFE;
+        padding: 1rem;
+        border-radius: 0.5rem;
+    }
+    .conclusion {
+        background-color: #E0F2FE;
+        padding: 1rem;
+        border-radius: 0.5rem;
+        border-left: 0.3rem solid #0284C7;
+        margin: 1rem 0;
+    }
+"""
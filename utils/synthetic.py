@@ -0,0 +1,304 @@
+"""
+Módulo para generar datos sintéticos de visitas a comedores.
+
+Produce un DataFrame con las mismas columnas y formatos que la hoja CEDECO
+(respuestas de selección múltiple, acciones con letra, columnas de frecuencia,
+coordenadas y observaciones en texto libre), para probar el dashboard con
+volúmenes de 100 a 1.000.000 de visitas. Toda la generación es vectorizada con
+numpy, de modo que incluso el tamaño máximo se genera en segundos.
+
+Uso desde la línea de comandos:
+
+    python -m utils.synthetic 100000 --salida data/CEDECO.xlsx
+"""
+
+import argparse
+import os
+import numpy as np
+import pandas as pd
+import openpyxl
+from utils.load_data import EXPECTED_COLUMNS, OPTIONAL_COLUMNS, SHEET_NAME
+
+MIN_VISITS = 100
+MAX_VISITS = 1_000_000
+
+# Visitas promedio por comedor
+VISITS_PER_COMEDOR = 4
+
+# Proporción de respuestas vacías en las preguntas opcionales
+EMPTY_RATE = 0.1
+
+FREQUENCY_COLUMNS = [
+    'TALLERES_FRECUENCIA',
+    'ACTIVIDADES_RECREATIVAS_FRECUENCIA',
+    'JORNADAS_SALUD_FRECUENCIA',
+    'REUNIONES_COMUNITARIAS_FRECUENCIA',
+]
+FREQUENCIES = ['DIARIA', 'SEMANAL', 'QUINCENAL', 'MENSUAL', 'BIMESTRAL', 'TRIMESTRAL', 'SEMESTRAL', 'ANUAL', 'NUNCA']
+
+# Área aproximada de Cali
+LAT_RANGE = (3.33, 3.50)
+LON_RANGE = (-76.56, -76.47)
+
+COMUNAS = [str(i) for i in range(1, 23)]
+BARRIOS = [
+    'El Retiro', 'Mojica', 'El Vallado', 'Manuela Beltrán', 'Potrero Grande', 'Siloé', 'Terrón Colorado',
+    'Alfonso López', 'El Diamante', 'Los Mangos', 'Charco Azul', 'El Poblado', 'Marroquín', 'Calimío Desepaz',
+    'La Sirena', 'Brisas de Mayo', 'Llano Verde', 'Comuneros', 'Petecuy', 'San Luis',
+]
+NODOS = ['NODO 1', 'NODO 2', 'NODO 3', 'NODO 4', 'NODO 5', 'NODO 6']
+NICHOS = ['NICHO A', 'NICHO B', 'NICHO C']
+PROFESSIONALS = [
+    'NELMY BENITEZ', 'CARLOS RAMIREZ', 'LUZ MARINA OSPINA', 'JULIAN ANDRADE',
+    'DIANA MOSQUERA', 'ANDRES CAICEDO', 'PAOLA RIASCOS', 'JORGE ZAPATA',
+]
+FIRST_NAMES = ['María', 'Luz', 'Ana', 'Rosa', 'Gloria', 'Carmen', 'Marta', 'Nubia', 'Yolanda', 'Esperanza', 'Sandra', 'Blanca']
+LAST_NAMES = ['Rodríguez', 'Mosquera', 'Valencia', 'Caicedo', 'Ortiz', 'Gómez', 'Rentería', 'Angulo', 'Hurtado', 'Sinisterra']
+COMEDOR_WORDS = ['Semillas', 'Esperanza', 'Manos Unidas', 'Pan de Vida', 'Corazón Solidario', 'Nueva Luz', 'Amor y Paz', 'Renacer']
+
+PLACES = [
+    'A. Vivienda de los gestores',
+    'B. Local comercial',
+    'C. Institución o fundación',
+]
+ETHNIC_GROUPS = [
+    'AFRODESCENDIENTE, NEGRO/A, MULATO/A', 'MESTIZA', 'INDÍGENA', 'NINGÚN GRUPO ÉTNICO', 'OTRO',
+]
+LINKING = ['Siempre', 'Casi siempre', 'Algunas veces', 'Nunca']
+
+# Opciones de las preguntas de selección múltiple: (opciones, separador, probabilidad de cada opción)
+MULTI_SELECT = {
+    'USO_DE_TIC': (['Redes sociales', 'Correo electrónico', 'Videollamadas', 'Página web', 'Ninguna'], '; ', 0.4),
+    'QUE_REDES': (['Facebook', 'WhatsApp', 'Instagram', 'TikTok', 'YouTube'], ', ', 0.4),
+    'PAQUETES_OFFICE': (['Word', 'Excel', 'PowerPoint', 'Canva', 'Ninguno'], ', ', 0.35),
+    'QUE_ESTRATEGIAS_USA': (['Voz a voz', 'Carteleras', 'Volantes', 'Redes sociales', 'Perifoneo'], '; ', 0.4),
+    'FINANCIACION_ACTIVIDADES': (['Recursos propios', 'Donaciones', 'Alcaldía', 'Iglesia', 'Empresa privada', 'Otra'], ', ', 0.35),
+    'ETAPA_VITAL': ([
+        'PRIMERA INFANCIA (0-5)', 'INFANCIA (6-11)', 'ADOLESCENTES (12-18)', 'JÓVENES (19-28)',
+        'ADULTOS/AS (29-59)', 'PERSONAS MAYORES (60 Y MÁS)',
+    ], ', ', 0.45),
+    'GRUPOS_EN_SITUACION_DE_VULNERABILIDAD': ([
+        'Consumidores SPA', 'Migrantes', 'Trabajadores informales', 'Habitantes de calle', 'Liderazgo JAC',
+        'Recicladores', 'Jefes de hogar', 'Víctimas del conflicto', 'Personas con discapacidad', 'Otro',
+    ], ', ', 0.25),
+    'NECESIDADES_QUE_SE_APOYARAN': ([
+        'Gestión de ALIANZAS estratégicas', 'Área de FINANCIAMIENTO', 'CAPACITACIÓN integral',
+        'VISIBILIZACIÓN y reconocimiento', 'PLANIFICACIÓN y seguimiento', 'OTRA',
+    ], ', ', 0.4),
+    'RECURSO_HUMANO_CON_EL_QUE_CUENTA': (['VOLUNTARIADO', 'Red SOCIAL', 'Red FAMILIAR', 'COLABORADORES del comedor'], ', ', 0.45),
+    'ACCIONES_PUNTUALES_COMEDOR': ([
+        'A. Talleres formativos', 'B. Actividades recreativas', 'C. Jornadas de salud', 'D. Celebración de fechas especiales',
+        'E. Apoyo escolar', 'F. Huerta comunitaria', 'G. Articulación con instituciones',
+    ], ' ', 0.4),
+}
+
+# Fragmentos para las observaciones en texto libre: (texto antes del año, texto después)
+HISTORY_OPENINGS = [
+    ('El comedor inició en ', ' como una olla comunitaria'),
+    ('Desde ', ' la gestora atiende a las familias del barrio'),
+    ('Comenzó en el año ', ' con el apoyo de la parroquia'),
+    ('Funciona desde ', ' en la casa de la gestora'),
+]
+# Cierres de la historia; los que tienen texto después llevan un segundo año
+HISTORY_CLOSINGS = [
+    (' y hoy atiende a niños y adultos mayores.', None),
+    ('; en ', ' se vinculó al programa de la Alcaldía.'),
+    (' y después de la pandemia amplió la atención.', None),
+    (', con el apoyo de vecinos y voluntarios.', None),
+]
+PARTICIPATION_TEXTS = [
+    'Participa en talleres y jornadas con la comunidad.',
+    'Realiza actividades recreativas para los niños los fines de semana.',
+    'Apoya jornadas de vacunación y brigadas de salud.',
+    'Organiza reuniones con las madres comunitarias cada mes.',
+]
+OBSERVATION_TEXTS = [
+    'Requiere sillas, mesas y menaje de cocina.',
+    'La gestora manifiesta interés en formarse en emprendimiento.',
+    'El espacio es reducido para talleres con más de veinte personas.',
+    'Se recomienda acompañamiento en procesos de planificación.',
+    'Necesita apoyo para visibilizar su labor en el territorio.',
+]
+
+
+def _choice(rng, options, size, empty_rate=0.0):
+    """Elige valores al azar de una lista, dejando vacíos en la proporción indicada."""
+    values = np.asarray(options, dtype=object)[rng.integers(0, len(options), size)]
+    if empty_rate:
+        values[rng.random(size) < empty_rate] = ''
+    return values
+
+
+def _multi_select(rng, options, separator, probability, size, empty_rate=EMPTY_RATE):
+    """
+    Genera respuestas de selección múltiple.
+
+    Cada opción se elige de forma independiente; el conjunto elegido se codifica
+    como máscara de bits y se traduce con una tabla de todas las combinaciones.
+    """
+    mask = np.zeros(size, dtype=np.int64)
+    for bit in range(len(options)):
+        mask |= (rng.random(size) < probability).astype(np.int64) << bit
+
+    combinations = np.array([
+        separator.join(option for bit, option in enumerate(options) if code >> bit & 1)
+        for code in range(2 ** len(options))
+    ], dtype=object)
+    # Sin ninguna opción elegida se toma la primera
+    combinations[0] = options[0]
+
+    values = combinations[mask]
+    values[rng.random(size) < empty_rate] = ''
+    return values
+
+
+def _text(rng, fragments, size):
+    """Elige fragmentos de texto al azar."""
+    return pd.Series(_choice(rng, fragments, size))
+
+
+def generate_visits(n_visits, seed=0):
+    """
+    Genera un DataFrame sintético de visitas con el esquema de la hoja CEDECO.
+
+    Los valores se generan como vendrían de la hoja (texto y números), de modo
+    que pasan por la misma conversión de tipos que los datos reales.
+
+    Args:
+        n_visits (int): Número de visitas (entre MIN_VISITS y MAX_VISITS).
+        seed (int): Semilla del generador aleatorio.
+
+    Returns:
+        pandas.DataFrame: Una fila por visita, con las columnas de la hoja.
+    """
+    if not MIN_VISITS <= n_visits <= MAX_VISITS:
+        raise ValueError(f"n_visits debe estar entre {MIN_VISITS} y {MAX_VISITS}")
+
+    rng = np.random.default_rng(seed)
+    n_comedores = max(1, n_visits // VISITS_PER_COMEDOR)
+
+    # Atributos fijos de cada comedor
+    comedor_names = (
+        pd.Series(_choice(rng, ['Comedor', 'Comedor Comunitario', 'Olla Comunitaria'], n_comedores)) + ' '
+        + _text(rng, COMEDOR_WORDS, n_comedores) + ' ' + pd.Series(np.arange(1, n_comedores + 1)).astype(str)
+    ).to_numpy()
+    gestoras = (_text(rng, FIRST_NAMES, n_comedores) + ' ' + _text(rng, LAST_NAMES, n_comedores)).to_numpy()
+    phones = rng.integers(3_000_000_000, 3_249_999_999, n_comedores).astype(object)
+    phones[rng.random(n_comedores) < EMPTY_RATE] = ''
+    comunas = _choice(rng, COMUNAS, n_comedores)
+    barrios = _choice(rng, BARRIOS, n_comedores)
+    nodos = _choice(rng, NODOS, n_comedores)
+    nichos = _choice(rng, NICHOS, n_comedores)
+    places = _choice(rng, PLACES, n_comedores)
+    founded = rng.integers(1985, 2024, n_comedores)
+    lat = rng.uniform(*LAT_RANGE, n_comedores)
+    lon = rng.uniform(*LON_RANGE, n_comedores)
+    locations = (pd.Series(lat).map('{:.6f}'.format) + ', ' + pd.Series(lon).map('{:.6f}'.format)).to_numpy(dtype=object)
+    locations[rng.random(n_comedores) < EMPTY_RATE] = ''
+
+    # Cada visita corresponde a un comedor
+    comedor = rng.integers(0, n_comedores, n_visits)
+    dates = pd.Timestamp('2025-05-01') + pd.to_timedelta(rng.integers(0, 365, n_visits), unit='D')
+    years = pd.Series(founded[comedor]).astype(str)
+    later = pd.Series(np.minimum(founded[comedor] + rng.integers(1, 10, n_visits), 2025)).astype(str)
+
+    # Historia del comedor con su año de fundación y, a veces, un año posterior
+    opening = rng.integers(0, len(HISTORY_OPENINGS), n_visits)
+    closing = rng.integers(0, len(HISTORY_CLOSINGS), n_visits)
+    opening_before, opening_after = (pd.Series(np.array(part, dtype=object)[opening]) for part in zip(*HISTORY_OPENINGS))
+    closing_before, closing_after = (pd.Series(np.array(part, dtype=object)[closing]) for part in zip(*HISTORY_CLOSINGS))
+    history = (
+        opening_before + years + opening_after + closing_before
+        + (later + closing_after).where(closing_after.notna(), '')
+    )
+
+    data = {
+        'ID': np.arange(1, n_visits + 1),
+        'FECHA': dates.strftime('%d/%m/%Y'),
+        'NOMBRE_COMEDOR': comedor_names[comedor],
+        'NOMBER_GESTORA': gestoras[comedor],
+        'TELEFONO1': phones[comedor],
+        'DIRECCION': ('Calle ' + pd.Series(rng.integers(1, 120, n_visits)).astype(str) + ' # '
+                      + pd.Series(rng.integers(1, 99, n_visits)).astype(str) + '-'
+                      + pd.Series(rng.integers(1, 99, n_visits)).astype(str)).to_numpy(),
+        'COMUNA': comunas[comedor],
+        'BARRIO': barrios[comedor],
+        'NODO': nodos[comedor],
+        'NICHO': nichos[comedor],
+        'PREFESIONAL_REALIZA_VISITA': _choice(rng, PROFESSIONALS, n_visits),
+        'LUGAR_DONDE_FUNCIONA_COMEDOR': places[comedor],
+        'ESPACIO_TALLERES': _choice(rng, ['SI', 'NO'], n_visits),
+        'ARTICULACION_CON_ORGANIZACIONES': _choice(rng, ['SI', 'NO'], n_visits),
+        '¿Cuáles?2': _choice(rng, ['JAC del barrio', 'Parroquia', 'Fundación Carvajal', 'ICBF', 'Secretaría de Bienestar'], n_visits, 0.4),
+        'HISTORIA_COMEDOR': _choice(rng, ['SI', 'NO'], n_visits),
+        'PARTICIPACION_ACTIVIDADES': _choice(rng, ['SI', 'NO'], n_visits),
+        'HA_TENIDO_DIFICULTADES': _choice(rng, ['SI', 'NO'], n_visits, EMPTY_RATE),
+        'QUE_DIFICULTADES': _choice(rng, ['Falta de alimentos', 'Arriendo del espacio', 'Pocos voluntarios', 'Servicios públicos'], n_visits, 0.4),
+        'QUE_OTRA_FINANCIACION': _choice(rng, ['Rifas y bazares', 'Aportes de comerciantes', 'Venta de comidas'], n_visits, 0.6),
+        'POBLACION_PRINCIPAL_COMEDOR': _choice(rng, ETHNIC_GROUPS, n_visits, EMPTY_RATE),
+        'BENEFICIARIOS_SON_MISMOS_QUE_REALIZA_LABORA_SOCIAL': _choice(rng, ['SI', 'NO'], n_visits, EMPTY_RATE),
+        'VINCULACION_OTROS_ACTORES': _choice(rng, LINKING, n_visits),
+        'SEGUIMIENTO_EVALUACION_A_OTRAS_ACTIVIDADES': _choice(rng, ['SI', 'NO'], n_visits),
+        'INICIATIVA_HUERTAS': _choice(rng, ['SI', 'NO'], n_visits),
+        'GESTION_HC': _choice(rng, ['Con la comunidad', 'Con apoyo del Jardín Botánico', 'Con los niños del comedor'], n_visits, 0.5),
+        'INTERESADO_COMO_CENTRO_DESARROLLO': _choice(rng, ['SI', 'NO'], n_visits),
+        'OTRA_NECESIDAD': _choice(rng, ['Emprendimiento para mujeres', 'Dotación de cocina', 'Formación en nutrición'], n_visits, 0.7),
+        'USER': _choice(rng, ['u01', 'u02', 'u03', 'u04'], n_visits),
+        'NOMBRE': _choice(rng, PROFESSIONALS, n_visits),
+        'UBICACION': locations[comedor],
+        'Observaciones1': history.to_numpy(dtype=object),
+        'Observaciones2': _choice(rng, PARTICIPATION_TEXTS, n_visits, EMPTY_RATE),
+        'Observaciones3': _choice(rng, ['Los hijos le ayudan con el computador.', 'Usa el celular para todo.', 'No maneja Excel.'], n_visits, 0.5),
+        'OBSERVACIONES_ALIANZAS_ESTRATEGICAS': _choice(rng, OBSERVATION_TEXTS, n_visits, 0.3),
+        'OBSERVACIONES_AREA_FINANCIAMIENTO': _choice(rng, OBSERVATION_TEXTS, n_visits, 0.3),
+        'OBSERVACIONES_CAPACITACION_INTEGRAL': _choice(rng, OBSERVATION_TEXTS, n_visits, 0.3),
+        'OBSERVACIONES_VISIBILIDAD_RECONOCIMIENTO': _choice(rng, OBSERVATION_TEXTS, n_visits, 0.3),
+        'OBSERVACIONES_PROCESOS_PLANIFICACIONES': _choice(rng, OBSERVATION_TEXTS, n_visits, 0.3),
+        'OBSERVACIONES': _choice(rng, OBSERVATION_TEXTS, n_visits, 0.2),
+    }
+
+    for column, (options, separator, probability) in MULTI_SELECT.items():
+        data[column] = _multi_select(rng, options, separator, probability, n_visits)
+
+    for column in FREQUENCY_COLUMNS:
+        data[column] = _choice(rng, FREQUENCIES, n_visits, EMPTY_RATE)
+
+    columns = EXPECTED_COLUMNS + [col for col in OPTIONAL_COLUMNS if col not in EXPECTED_COLUMNS] + FREQUENCY_COLUMNS
+    return pd.DataFrame({column: data[column] for column in columns})
+
+
+def write_excel(df, path, sheet_name=SHEET_NAME):
+    """
+    Escribe el DataFrame en un libro Excel fila por fila.
+
+    Usa el modo de solo escritura de openpyxl, que no guarda las celdas en
+    memoria, para poder escribir hasta 1.000.000 de filas.
+
+    Args:
+        df (pandas.DataFrame): Datos a escribir.
+        path (str): Ruta del archivo .xlsx.
+        sheet_name (str): Nombre de la hoja.
+    """
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    sheet.append(list(df.columns))
+    for row in df.itertuples(index=False, name=None):
+        sheet.append(row)
+    workbook.save(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera datos sintéticos de visitas CEDECO.")
+    parser.add_argument('visitas', type=int, help=f"Número de visitas ({MIN_VISITS} a {MAX_VISITS}).")
+    parser.add_argument('--salida', default='data/CEDECO.xlsx', help="Archivo .xlsx de salida.")
+    parser.add_argument('--semilla', type=int, default=0, help="Semilla del generador aleatorio.")
+    args = parser.parse_args()
+
+    df = generate_visits(args.visitas, seed=args.semilla)
+    os.makedirs(os.path.dirname(args.salida) or '.', exist_ok=True)
+    write_excel(df, args.salida)
+    print(f"{len(df)} visitas escritas en {args.salida}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,498 @@
+"""
+Módulo con el índice de palabras de los textos libres de las visitas.
+
+Las nubes de palabras, los temas y la búsqueda en los textos libres (historia,
+observaciones, gestión de la huerta, etc.) se calculan a partir de cuántas
+veces aparece cada palabra en cada visita. Este índice guarda ese conteo una
+vez por versión de los datos, de modo que:
+
+- la nube de cualquier subconjunto filtrado es una suma de conteos ya
+  calculados en lugar de volver a unir y separar todos los textos;
+- una búsqueda solo recorre las visitas que contienen las palabras buscadas
+  (índice invertido: palabra -> textos -> visitas).
+
+Las palabras se comparan en minúsculas y sin tildes ('formación' y 'formacion'
+son la misma palabra); en la nube se muestra la forma más frecuente. Se
+excluyen las palabras vacías en español; los números y las palabras de una
+sola letra se indexan para la búsqueda pero no aparecen en las nubes (igual
+que en WordCloud, que solo toma palabras de dos o más caracteres).
+
+Al llegar una nueva versión de los datos, el índice anterior se pasa como
+`previous` y solo se separan en palabras los textos que no existían antes
+(filas nuevas o editadas).
+"""
+
+import html
+import re
+from collections import Counter
+import numpy as np
+import pandas as pd
+
+# Columnas de texto libre indexadas
+TEXT_COLUMNS = [
+    'HISTORIA_COMEDOR',
+    'Observaciones1',
+    'Observaciones2',
+    'Observaciones3',
+    'GESTION_HC',
+    '¿Cuáles?2',
+    'OBSERVACIONES_ALIANZAS_ESTRATEGICAS',
+    'OBSERVACIONES_AREA_FINANCIAMIENTO',
+    'OBSERVACIONES_CAPACITACION_INTEGRAL',
+    'OBSERVACIONES_VISIBILIDAD_RECONOCIMIENTO',
+    'OBSERVACIONES_PROCESOS_PLANIFICACIONES',
+]
+
+# Palabras a excluir (stopwords)
+STOPWORDS = frozenset([
+    'de', 'la', 'el', 'y', 'en', 'a', 'que', 'los', 'del', 'se', 'las', 'por', 'un', 'con',
+    'una', 'para', 'es', 'al', 'lo', 'como', 'más', 'o', 'pero', 'sus', 'le', 'ha', 'me',
+    'si', 'sin', 'sobre', 'este', 'ya', 'entre', 'cuando', 'todo', 'esta', 'ser', 'son',
+    'mi', 'hay', 'porque', 'muy', 'estos', 'estas', 'fue', 'así', 'también', 'desde', 'he',
+])
+
+# Palabras que se muestran como máximo en una nube
+MAX_WORDS = 200
+
+# Palabras: una letra o dígito seguida de letras, dígitos o apóstrofos. WordCloud
+# usa \w[\w']+; aquí se indexan también las de una letra para que las frases
+# buscadas ('huerta y cocina') se puedan comprobar, y se quitan de las nubes
+TOKEN_PATTERN = re.compile(r"\w[\w']*")
+
+# Partes de una consulta: frases entre comillas o palabras sueltas
+QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+# Vocales con tilde, diéresis o acento grave -> vocal sin marca (la ñ se conserva)
+FOLD_TABLE = str.maketrans('áéíóúàèìòùäëïöüâêîôû', 'aeiouaeiouaeiouaeiou')
+
+# Caracteres de contexto a cada lado de la coincidencia en un fragmento
+SNIPPET_CONTEXT = 60
+
+# Columnas del resultado de una búsqueda
+SCORE_COLUMN = 'Puntaje'
+MATCH_COLUMN = 'Columna'
+
+
+def fold_word(word):
+    """
+    Normaliza una palabra para compararla: minúsculas y sin tildes.
+
+    Args:
+        word (str): Palabra.
+
+    Returns:
+        str: Palabra normalizada.
+    """
+    return word.lower().translate(FOLD_TABLE)
+
+
+def _ranges(starts, counts):
+    """Concatena los rangos [start, start + count) en un solo arreglo de posiciones."""
+    return np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+
+
+class _ColumnTokens:
+    """
+    Conteos de palabras de una columna.
+
+    Guarda el código del texto de cada fila, las palabras de cada texto
+    distinto (en formato CSR: `indptr`, `surface_ids`, `counts`) y el índice
+    invertido: las mismas entradas ordenadas por palabra normalizada y las
+    filas ordenadas por texto.
+    """
+
+    def __init__(self, codes, texts, indptr, surface_ids, counts, surface_token_codes):
+        self.codes = codes
+        self.texts = texts
+        self.indptr = indptr
+        self.surface_ids = surface_ids
+        self.counts = counts
+
+        # Palabra -> textos que la contienen (ordenados), sumando las formas
+        # escritas de la misma palabra en un texto
+        n_texts = max(len(texts), 1)
+        entry_keys = surface_token_codes[surface_ids] * n_texts + np.repeat(np.arange(len(texts)), np.diff(indptr))
+        keys, inverse = np.unique(entry_keys, return_inverse=True)
+        self.posting_texts = keys % n_texts
+        self.posting_tf = np.bincount(inverse.reshape(-1), weights=counts, minlength=len(keys)).astype(np.int64)
+        self.posting_tokens, self.posting_starts, self.posting_counts = np.unique(
+            keys // n_texts, return_index=True, return_counts=True
+        )
+
+        # Texto -> filas en las que aparece
+        valid = np.flatnonzero(codes >= 0)
+        self.text_rows = valid[np.argsort(codes[valid], kind='stable')]
+        self.text_row_counts = np.bincount(codes[valid], minlength=len(texts))
+        self.text_row_starts = np.cumsum(self.text_row_counts) - self.text_row_counts
+
+    @property
+    def n_texts(self):
+        return len(self.indptr) - 1
+
+    def postings(self, token_code):
+        """Devuelve los textos que contienen una palabra y cuántas veces la contienen."""
+        slot = np.searchsorted(self.posting_tokens, token_code)
+        if slot >= len(self.posting_tokens) or self.posting_tokens[slot] != token_code:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        start = self.posting_starts[slot]
+        end = start + self.posting_counts[slot]
+        return self.posting_texts[start:end], self.posting_tf[start:end]
+
+    def rows(self, texts, weights):
+        """Expande textos (con un peso cada uno) a las filas en las que aparecen."""
+        counts = self.text_row_counts[texts]
+        rows = self.text_rows[_ranges(self.text_row_starts[texts], counts)]
+        return rows, np.repeat(weights, counts)
+
+
+class _QueryPart:
+    """Palabra o frase de una consulta, con sus palabras normalizadas y su expresión regular."""
+
+    def __init__(self, text):
+        words = [fold_word(word) for word in TOKEN_PATTERN.findall(text)]
+        self.text = text
+        self.words = words
+        # Frases: las palabras en orden, separadas por cualquier cosa que no sea palabra
+        self.pattern = re.compile(r'\b' + r'\W+'.join(re.escape(word) for word in words) + r'\b') if words else None
+
+    @property
+    def is_phrase(self):
+        return len(self.words) > 1
+
+
+def parse_query(query):
+    """
+    Separa una consulta en palabras y frases.
+
+    Las frases se escriben entre comillas dobles, por ejemplo
+    `"olla comunitaria" huerta`.
+
+    Args:
+        query (str): Consulta.
+
+    Returns:
+        list: Partes de la consulta que tienen al menos una palabra.
+    """
+    parts = []
+    for phrase, word in QUERY_PATTERN.findall(query or ''):
+        part = _QueryPart(phrase or word)
+        if part.words:
+            parts.append(part)
+    return parts
+
+
+def snippet(text, query, context=SNIPPET_CONTEXT):
+    """
+    Extrae el fragmento de un texto alrededor de la primera coincidencia de una consulta.
+
+    Args:
+        text (str): Texto original.
+        query (str): Consulta (ver parse_query()).
+        context (int): Caracteres de contexto a cada lado.
+
+    Returns:
+        str: Fragmento en HTML con la coincidencia resaltada con <mark>, o el
+        inicio del texto si no hay coincidencia.
+    """
+    text = str(text)
+    # Normalizar letra por letra para que las posiciones sirvan para el texto original
+    folded = ''.join(char if len(char.lower()) != 1 else char.lower() for char in text).translate(FOLD_TABLE)
+    matches = [match for part in parse_query(query) for match in [part.pattern.search(folded)] if match]
+    if not matches:
+        return html.escape(text[:2 * context]) + ('…' if len(text) > 2 * context else '')
+
+    match = min(matches, key=lambda m: m.start())
+    start = max(match.start() - context, 0)
+    end = min(match.end() + context, len(text))
+    return (
+        ('…' if start > 0 else '')
+        + html.escape(text[start:match.start()])
+        + '<mark>' + html.escape(text[match.start():match.end()]) + '</mark>'
+        + html.escape(text[match.end():end])
+        + ('…' if end < len(text) else '')
+    )
+
+
+class TextIndex:
+    """
+    Conteo de palabras por visita de las columnas de texto libre.
+
+    Cada columna se guarda como el código de su texto en cada fila y, por cada
+    texto distinto, las palabras que contiene con su número de apariciones.
+    Las palabras se identifican por su forma escrita (en minúsculas), y cada
+    forma apunta a su palabra normalizada (ver fold_word()).
+
+    Args:
+        df (pandas.DataFrame): Datos de visitas.
+        revision (str, optional): Revisión de los datos.
+        previous (TextIndex, optional): Índice de la versión anterior; sus
+            textos ya separados en palabras se reutilizan.
+        columns (list, optional): Columnas a indexar (por defecto TEXT_COLUMNS).
+    """
+
+    def __init__(self, df, revision=None, previous=None, columns=None):
+        self.revision = revision
+        self.labels = df.index
+        self.stopwords = frozenset(fold_word(word) for word in STOPWORDS)
+
+        # El vocabulario solo crece, así que se puede continuar el del índice anterior
+        if previous is not None:
+            self.surfaces = list(previous.surfaces)
+            self.surface_ids = dict(previous.surface_ids)
+            self.tokens = list(previous.tokens)
+            self.token_ids = dict(previous.token_ids)
+            self.surface_tokens = list(previous.surface_tokens)
+            self.excluded = set(previous.excluded)
+            known = previous.tokenized
+        else:
+            self.surfaces = []
+            self.surface_ids = {}
+            self.tokens = []
+            self.token_ids = {}
+            self.surface_tokens = []
+            self.excluded = set()
+            known = {}
+
+        # Textos separados en palabras: texto -> (formas, conteos). Solo se
+        # conservan los textos presentes en esta versión
+        self.tokenized = {}
+        self.reused = 0
+        column_entries = {}
+        for column in (TEXT_COLUMNS if columns is None else columns):
+            if column not in df.columns:
+                continue
+            codes, texts = pd.factorize(df[column])
+            indptr = np.zeros(len(texts) + 1, dtype=np.int64)
+            surface_ids = []
+            counts = []
+            for i, text in enumerate(texts):
+                text = str(text)
+                entry = self.tokenized.get(text)
+                if entry is None:
+                    entry = known.get(text)
+                    if entry is None:
+                        entry = self._tokenize(text)
+                    else:
+                        self.reused += 1
+                    self.tokenized[text] = entry
+                surface_ids.append(entry[0])
+                counts.append(entry[1])
+                indptr[i + 1] = indptr[i] + len(entry[0])
+            column_entries[column] = (
+                codes,
+                np.asarray(texts, dtype=object),
+                indptr,
+                np.concatenate(surface_ids) if surface_ids else np.empty(0, dtype=np.int64),
+                np.concatenate(counts) if counts else np.empty(0, dtype=np.int64),
+            )
+
+        self.surface_token_codes = np.asarray(self.surface_tokens, dtype=np.int64)
+        # Formas que no se muestran en las nubes: números y palabras de una letra
+        self.hidden = np.fromiter((word.isdigit() or len(word) < 2 for word in self.surfaces),
+                                  dtype=bool, count=len(self.surfaces))
+        self.columns = {
+            column: _ColumnTokens(*entries, self.surface_token_codes)
+            for column, entries in column_entries.items()
+        }
+
+    def _tokenize(self, text):
+        """Separa un texto en palabras y cuenta cada forma escrita."""
+        surface_ids = []
+        counts = []
+        for word, count in Counter(TOKEN_PATTERN.findall(text.lower())).items():
+            surface_id = self.surface_ids.get(word)
+            if surface_id is None:
+                if word in self.excluded:
+                    continue
+                token = word.translate(FOLD_TABLE)
+                if token in self.stopwords:
+                    self.excluded.add(word)
+                    continue
+                surface_id = self._add_surface(word, token)
+            surface_ids.append(surface_id)
+            counts.append(count)
+        return np.array(surface_ids, dtype=np.int64), np.array(counts, dtype=np.int64)
+
+    def _add_surface(self, word, token):
+        """Agrega una forma escrita (y su palabra normalizada si es nueva) al vocabulario y devuelve su código."""
+        if token not in self.token_ids:
+            self.token_ids[token] = len(self.tokens)
+            self.tokens.append(token)
+        self.surface_ids[word] = len(self.surfaces)
+        self.surfaces.append(word)
+        self.surface_tokens.append(self.token_ids[token])
+        return self.surface_ids[word]
+
+    def _positions(self, df):
+        """Posiciones en el índice de las filas de `df`, o None si son todas."""
+        if df is None or len(df) == len(self.labels):
+            return None
+        positions = self.labels.get_indexer(df.index)
+        return positions[positions >= 0]
+
+    def frequencies(self, column, df=None, max_words=MAX_WORDS):
+        """
+        Suma los conteos de palabras de una columna.
+
+        Args:
+            column (str): Columna de texto.
+            df (pandas.DataFrame, optional): Subconjunto de las filas indexadas
+                (por ejemplo, con los filtros globales aplicados). Por defecto
+                se usan todas las filas.
+            max_words (int): Número máximo de palabras devueltas.
+
+        Returns:
+            dict: Palabra (en su forma más frecuente) -> número de apariciones,
+            de mayor a menor, listo para WordCloud.generate_from_frequencies().
+        """
+        tokens = self.columns.get(column)
+        if tokens is None:
+            return {}
+
+        codes = tokens.codes
+        positions = self._positions(df)
+        if positions is not None:
+            codes = codes[positions]
+        codes = codes[codes >= 0]
+        if len(codes) == 0:
+            return {}
+
+        # Apariciones de cada forma: veces que aparece cada texto por sus conteos
+        text_counts = np.bincount(codes, minlength=tokens.n_texts)
+        weights = np.repeat(text_counts, np.diff(tokens.indptr)) * tokens.counts
+        surface_counts = np.bincount(tokens.surface_ids, weights=weights, minlength=len(self.surface_token_codes))
+        present = np.flatnonzero((surface_counts > 0) & ~self.hidden)
+        if len(present) == 0:
+            return {}
+
+        # Sumar por palabra normalizada y mostrar su forma más frecuente
+        token_codes = self.surface_token_codes[present]
+        totals = np.bincount(token_codes, weights=surface_counts[present])
+        # Los empates se desempatan por la palabra y no por su código, que
+        # depende del orden en que se indexaron los textos
+        names = np.asarray([self.surfaces[i] for i in present], dtype=str)
+        order = np.lexsort((names, -surface_counts[present], token_codes))
+        first = order[np.r_[True, token_codes[order][1:] != token_codes[order][:-1]]]
+        words = present[first]
+        word_totals = totals[token_codes[first]]
+
+        top = np.lexsort((names[first], -word_totals))[:max_words]
+        return {self.surfaces[words[i]]: int(word_totals[i]) for i in top}
+
+    def _part_matches(self, tokens, part):
+        """
+        Busca una palabra o frase en una columna.
+
+        Returns:
+            tuple: Textos de la columna que la contienen y cuántas veces.
+        """
+        codes = [self.token_ids.get(word) for word in part.words if word not in self.stopwords]
+        if not codes or None in codes:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        # Textos con todas las palabras; la frecuencia es la de la palabra menos común
+        texts, tf = tokens.postings(codes[0])
+        for code in codes[1:]:
+            other_texts, other_tf = tokens.postings(code)
+            keep = np.isin(texts, other_texts)
+            texts, tf = texts[keep], tf[keep]
+            tf = np.minimum(tf, other_tf[np.searchsorted(other_texts, texts)])
+
+        # Frases: comprobar el orden de las palabras en el texto de los candidatos
+        if part.is_phrase and len(texts):
+            found = [len(part.pattern.findall(fold_word(str(tokens.texts[text])))) for text in texts]
+            found = np.asarray(found, dtype=np.int64)
+            keep = found > 0
+            texts, tf = texts[keep], found[keep]
+        return texts, tf
+
+    def search(self, query, df=None, columns=None):
+        """
+        Busca visitas por palabras o frases en los textos libres.
+
+        Las palabras se buscan sin distinguir mayúsculas ni tildes; las frases
+        entre comillas deben aparecer con sus palabras en ese orden. Basta con
+        que una visita contenga una de las partes de la consulta, pero las que
+        contienen más partes quedan primero. Dentro de eso se ordenan por
+        TF-IDF: más apariciones y palabras menos comunes suman más puntaje.
+
+        Args:
+            query (str): Consulta, por ejemplo `huerta "olla comunitaria"`.
+            df (pandas.DataFrame, optional): Subconjunto de las filas indexadas
+                en el que buscar.
+            columns (list, optional): Columnas en las que buscar (por defecto
+                todas las indexadas).
+
+        Returns:
+            pandas.DataFrame: Una fila por visita encontrada, indexada por la
+            etiqueta de la fila, con el puntaje y la columna con más
+            coincidencias, de mayor a menor puntaje.
+        """
+        parts = parse_query(query)
+        columns = [column for column in (columns or self.columns) if column in self.columns]
+        empty = pd.DataFrame({SCORE_COLUMN: pd.Series(dtype='float64'), MATCH_COLUMN: pd.Series(dtype=object)})
+        if not parts or not columns:
+            return empty
+
+        n_rows = len(self.labels)
+        allowed = None
+        positions = self._positions(df)
+        if positions is not None:
+            allowed = np.zeros(n_rows, dtype=bool)
+            allowed[positions] = True
+        n_docs = n_rows if allowed is None else int(allowed.sum())
+
+        scores = np.zeros(n_rows)
+        matched_parts = np.zeros(n_rows, dtype=np.int64)
+        # Puntaje por (fila, columna), solo de las filas encontradas
+        match_rows, match_columns, match_weights = [], [], []
+        for part in parts:
+            # Apariciones de la parte: una entrada por fila y columna
+            rows, columns_found, tf = [], [], []
+            for i, column in enumerate(columns):
+                tokens = self.columns[column]
+                texts, text_tf = self._part_matches(tokens, part)
+                if len(texts):
+                    column_rows, row_tf = tokens.rows(texts, text_tf)
+                    rows.append(column_rows)
+                    columns_found.append(np.full(len(column_rows), i))
+                    tf.append(row_tf)
+            if not rows:
+                continue
+            rows, columns_found, tf = np.concatenate(rows), np.concatenate(columns_found), np.concatenate(tf)
+            if allowed is not None:
+                keep = allowed[rows]
+                rows, columns_found, tf = rows[keep], columns_found[keep], tf[keep]
+
+            found = np.bincount(rows, minlength=n_rows) > 0
+            if not found.any():
+                continue
+            weight = (1 + np.log(tf)) * np.log(1 + n_docs / found.sum())
+            scores += np.bincount(rows, weights=weight, minlength=n_rows)
+            matched_parts += found
+            match_rows.append(rows)
+            match_columns.append(columns_found)
+            match_weights.append(weight)
+
+        hits = np.flatnonzero(matched_parts)
+        if len(hits) == 0:
+            return empty
+        order = np.lexsort((hits, -scores[hits], -matched_parts[hits]))
+        hits = hits[order]
+
+        # Columna con más puntaje de cada fila
+        keys = np.concatenate(match_rows) * len(columns) + np.concatenate(match_columns)
+        keys, inverse = np.unique(keys, return_inverse=True)
+        key_weights = np.bincount(inverse.reshape(-1), weights=np.concatenate(match_weights))
+        best = np.lexsort((-key_weights, keys // len(columns)))
+        best = best[np.r_[True, np.diff(keys[best] // len(columns)) != 0]]
+        best_column = np.zeros(n_rows, dtype=np.int64)
+        best_column[keys[best] // len(columns)] = keys[best] % len(columns)
+
+        return pd.DataFrame(
+            {
+                SCORE_COLUMN: np.round(scores[hits], 3),
+                MATCH_COLUMN: np.asarray(columns, dtype=object)[best_column[hits]],
+            },
+            index=self.labels[hits],
+        )
@@ -0,0 +1,210 @@
+"""
+Módulo que genera las nubes de palabras de las páginas como imágenes PNG.
+
+Distribuir las palabras de una nube es lo que más CPU consume en el dashboard,
+por lo que cada imagen se guarda en memoria con una clave que depende de las
+frecuencias de sus palabras (ver utils.text_index): mientras los textos no
+cambien, la imagen no se vuelve a generar.
+
+Las imágenes que faltan se generan en un grupo de procesos, fuera del hilo del
+script de Streamlit. La página pide sus nubes al empezar (request_wordcloud())
+y las espera solo al mostrarlas, de modo que se generan en paralelo con el
+resto de la página.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Tamaño de la imagen en píxeles
+WORDCLOUD_WIDTH = 800
+WORDCLOUD_HEIGHT = 400
+
+# Número máximo de imágenes guardadas en memoria
+WORDCLOUD_CACHE_SIZE = 32
+
+# Procesos para generar las nubes; con 0 se generan en el mismo proceso
+WORDCLOUD_PROCESSES_ENV = 'CEDECO_WORDCLOUD_PROCESSES'
+DEFAULT_WORDCLOUD_PROCESSES = 2
+
+
+def wordcloud_key(frequencies):
+    """
+    Calcula la clave de una nube de palabras a partir de su contenido.
+
+    Args:
+        frequencies (dict): Palabra -> número de apariciones.
+
+    Returns:
+        str: Hash de las palabras y sus frecuencias.
+    """
+    digest = hashlib.sha1()
+    for word, count in sorted(frequencies.items()):
+        digest.update(f"{word}\x00{count}\x00".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def render_wordcloud(frequencies):
+    """
+    Genera una nube de palabras y la devuelve como imagen PNG.
+
+    Se ejecuta en los procesos del grupo, por lo que recibe y devuelve solo
+    datos que se pueden enviar entre procesos.
+
+    Args:
+        frequencies (dict): Palabra -> número de apariciones.
+
+    Returns:
+        bytes: Imagen PNG.
+    """
+    from wordcloud import WordCloud
+
+    wordcloud = WordCloud(width=WORDCLOUD_WIDTH, height=WORDCLOUD_HEIGHT,
+                          background_color='white',
+                          min_font_size=10).generate_from_frequencies(frequencies)
+
+    buffer = io.BytesIO()
+    wordcloud.to_image().save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+class WordcloudCache:
+    """
+    Imágenes PNG de las nubes de palabras por clave de contenido.
+
+    Guarda las imágenes terminadas (descartando las menos usadas cuando se
+    supera `max_size`) y las que se están generando, para que dos ejecuciones
+    del script que piden la misma nube esperen a la misma generación.
+
+    Args:
+        max_size (int): Número máximo de imágenes guardadas.
+    """
+
+    def __init__(self, max_size=WORDCLOUD_CACHE_SIZE):
+        self.lock = threading.Lock()
+        self.max_size = max_size
+        self.images = OrderedDict()
+        self.pending = {}
+        self.pool = None
+
+    def _get_pool(self):
+        """Crea el grupo de procesos la primera vez que se necesita (o None si no se usa)."""
+        if self.pool is None:
+            processes = int(os.environ.get(WORDCLOUD_PROCESSES_ENV, DEFAULT_WORDCLOUD_PROCESSES))
+            if processes <= 0:
+                return None
+            self.pool = ProcessPoolExecutor(max_workers=processes)
+        return self.pool
+
+    def _store(self, key, future):
+        """Guarda la imagen de una generación terminada."""
+        with self.lock:
+            self.pending.pop(key, None)
+            if future.cancelled() or future.exception() is not None:
+                return
+            self.images[key] = future.result()
+            self.images.move_to_end(key)
+            while len(self.images) > self.max_size:
+                self.images.popitem(last=False)
+
+    def request(self, frequencies):
+        """
+        Pide la imagen de una nube de palabras.
+
+        Args:
+            frequencies (dict): Palabra -> número de apariciones.
+
+        Returns:
+            concurrent.futures.Future: Futuro con la imagen PNG; ya está
+            terminado si la imagen estaba guardada.
+        """
+        key = wordcloud_key(frequencies)
+
+        with self.lock:
+            if key in self.images:
+                self.images.move_to_end(key)
+                future = Future()
+                future.set_result(self.images[key])
+                return future
+            if key in self.pending:
+                return self.pending[key]
+
+            future = None
+            try:
+                pool = self._get_pool()
+                if pool is not None:
+                    future = pool.submit(render_wordcloud, dict(frequencies))
+            except Exception as e:
+                # Sin grupo de procesos (por ejemplo, un proceso que terminó): generar aquí
+                logger.warning("No se pudo usar el grupo de procesos de las nubes de palabras: %s", e)
+                self.pool = None
+
+            if future is None:
+                future = Future()
+                try:
+                    future.set_result(render_wordcloud(frequencies))
+                except Exception as e:
+                    future.set_exception(e)
+            self.pending[key] = future
+
+        future.add_done_callback(lambda done: self._store(key, done))
+        return future
+
+
+_wordcloud_cache = WordcloudCache()
+
+# Clave de st.session_state con las imágenes mostradas en la sesión, si se
+# están guardando (ver collect_shown())
+SHOWN_WORDCLOUDS_KEY = 'nubes_mostradas'
+
+
+def request_wordcloud(frequencies):
+    """
+    Pide la imagen PNG de una nube de palabras sin esperar a que se genere.
+
+    Args:
+        frequencies (dict): Palabra -> número de apariciones, por ejemplo de
+            TextIndex.frequencies().
+
+    Returns:
+        concurrent.futures.Future: Futuro con la imagen PNG (bytes).
+    """
+    return _wordcloud_cache.request(frequencies)
+
+
+def collect_shown():
+    """
+    Empieza a guardar las imágenes de las nubes que muestra la sesión actual.
+
+    Las imágenes quedan en st.session_state, por lo que cada sesión de
+    Streamlit tiene su propia lista. Lo usa el exportador de reportes para
+    incluir las nubes sin leerlas de Streamlit (ver utils.report).
+
+    Returns:
+        list: Lista en la que quedan las imágenes PNG, en el orden en que se
+        muestran.
+    """
+    import streamlit as st
+
+    st.session_state[SHOWN_WORDCLOUDS_KEY] = []
+    return st.session_state[SHOWN_WORDCLOUDS_KEY]
+
+
+def mark_shown(png):
+    """
+    Registra una nube mostrada en la sesión, si se están guardando (ver collect_shown()).
+
+    Args:
+        png (bytes): Imagen PNG mostrada.
+    """
+    import streamlit as st
+
+    shown = st.session_state.get(SHOWN_WORDCLOUDS_KEY)
+    if shown is not None:
+        shown.append(png)
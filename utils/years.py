@@ -0,0 +1,118 @@
+"""
+Módulo con los años mencionados en las historias de los comedores.
+
+Al cargar los datos se extraen, por columnas, los años que aparecen en la
+historia de cada visita y se guardan en una tabla (COMEDOR, AÑO) con una fila
+por año mencionado. A partir de esa tabla se calculan la línea de tiempo de
+los años mencionados, el año de fundación estimado de cada comedor (el año más
+antiguo que menciona) y las cohortes de comedores por año de fundación, sin
+volver a recorrer los textos al filtrar.
+"""
+
+import re
+import numpy as np
+import pandas as pd
+
+HISTORY_COLUMN = 'Observaciones1'
+NAME_COLUMN = 'NOMBRE_COMEDOR'
+
+COMEDOR_COLUMN = 'COMEDOR'
+YEAR_COLUMN = 'AÑO'
+
+# Años entre 1990 y 2029
+YEAR_PATTERN = re.compile(r'\b(199[0-9]|20[0-2][0-9])\b')
+
+
+def extract_years(df, column=HISTORY_COLUMN):
+    """
+    Extrae los años mencionados en una columna de texto.
+
+    Cada texto distinto se revisa una sola vez con str.extractall y el
+    resultado se reparte a las filas que lo contienen.
+
+    Args:
+        df (pandas.DataFrame): Datos de visitas.
+        column (str): Columna de texto con la historia.
+
+    Returns:
+        pandas.DataFrame: Columnas COMEDOR y AÑO, una fila por año mencionado
+            en cada visita. El índice es el de la fila de origen en df.
+    """
+    empty = pd.DataFrame({COMEDOR_COLUMN: pd.Series(dtype=object), YEAR_COLUMN: pd.Series(dtype='int64')})
+    if column not in df.columns:
+        return empty
+
+    codes, texts = pd.factorize(df[column])
+    matches = pd.Series(np.asarray(texts, dtype=object), dtype='string').str.extractall(YEAR_PATTERN)
+    if matches.empty:
+        return empty
+
+    # Años de cada texto distinto, en orden
+    match_texts = matches.index.get_level_values(0).to_numpy()
+    match_years = matches[0].astype('int64').to_numpy()
+    counts = np.bincount(match_texts, minlength=len(texts))
+    starts = np.cumsum(counts) - counts
+
+    # Repartir los años de cada texto a sus filas
+    rows = np.flatnonzero(codes >= 0)
+    row_counts = counts[codes[rows]]
+    positions = np.repeat(starts[codes[rows]] - np.cumsum(row_counts) + row_counts, row_counts) + np.arange(row_counts.sum())
+    rows = np.repeat(rows, row_counts)
+
+    names = df[NAME_COLUMN] if NAME_COLUMN in df.columns else pd.Series(df.index, index=df.index)
+    return pd.DataFrame({
+        COMEDOR_COLUMN: names.to_numpy(dtype=object)[rows],
+        YEAR_COLUMN: match_years[positions],
+    }, index=df.index[rows])
+
+
+def year_mentions(years):
+    """
+    Cuenta cuántas veces se menciona cada año.
+
+    Args:
+        years (pandas.DataFrame): Tabla de extract_years().
+
+    Returns:
+        pandas.DataFrame: Columnas 'Año' y 'Frecuencia', ordenadas por año.
+    """
+    counts = years[YEAR_COLUMN].value_counts().sort_index()
+    return pd.DataFrame({'Año': counts.index.astype(str), 'Frecuencia': counts.to_numpy()})
+
+
+def founding_years(years):
+    """
+    Estima el año de fundación de cada comedor.
+
+    Se toma el año más antiguo mencionado en cualquiera de sus visitas.
+
+    Args:
+        years (pandas.DataFrame): Tabla de extract_years().
+
+    Returns:
+        pandas.DataFrame: Columnas 'Comedor' y 'Año de fundación', de la
+        fundación más antigua a la más reciente.
+    """
+    founded = years.dropna(subset=[COMEDOR_COLUMN]).groupby(COMEDOR_COLUMN, sort=False, observed=True)[YEAR_COLUMN].min()
+    founded = founded.sort_values(kind='stable')
+    return pd.DataFrame({'Comedor': founded.index.to_numpy(dtype=object), 'Año de fundación': founded.to_numpy()})
+
+
+def cohort_timeline(founded):
+    """
+    Cuenta los comedores fundados cada año (cohortes) y el total acumulado.
+
+    Args:
+        founded (pandas.DataFrame): Resultado de founding_years().
+
+    Returns:
+        pandas.DataFrame: Columnas 'Año', 'Comedores' (fundados ese año) y
+        'Acumulado', con todos los años entre el primero y el último.
+    """
+    if founded.empty:
+        return pd.DataFrame({'Año': pd.Series(dtype='int64'), 'Comedores': pd.Series(dtype='int64'),
+                             'Acumulado': pd.Series(dtype='int64')})
+    counts = founded['Año de fundación'].value_counts()
+    all_years = np.arange(counts.index.min(), counts.index.max() + 1)
+    counts = counts.reindex(all_years, fill_value=0)
+    return pd.DataFrame({'Año': all_years, 'Comedores': counts.to_numpy(), 'Acumulado': counts.cumsum().to_numpy()})